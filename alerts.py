@@ -0,0 +1,225 @@
+"""
+Search Alerts
+Match newly ingested catalog jobs against users' saved-search alerts and
+queue the hits for email notification.
+
+Only the new jobs are scored, in one vectorized batch against every active
+alert (new jobs x alert profiles), so the work grows with ingestion volume
+rather than with the size of the catalog. Searches only queue their new
+jobs; a background thread in each worker (or the --match cron job) scores
+them, so a search's latency doesn't grow with the number of subscribers.
+
+Usage:
+    python alerts.py --match   # match queued new jobs (with ALERT_MATCHER=off)
+    python alerts.py --send    # email queued matches (e.g. from cron)
+"""
+import argparse
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import database as db
+from utils.tracing import traced
+
+logger = logging.getLogger('jobflow.alerts')
+
+# Default match score a new job needs to trigger an alert
+ALERT_MIN_SCORE = float(os.getenv('ALERT_MIN_SCORE', '70'))
+# Alerts scored per matrix, to bound memory with many subscribers
+ALERT_BATCH_SIZE = int(os.getenv('ALERT_BATCH_SIZE', '500'))
+# Jobs listed in one notification email
+ALERT_JOBS_PER_EMAIL = int(os.getenv('ALERT_JOBS_PER_EMAIL', '10'))
+# 'thread' matches queued jobs in each worker; 'off' leaves it to `alerts.py --match`
+ALERT_MATCHER = os.getenv('ALERT_MATCHER', 'thread')
+# Seconds between queue checks when the matcher isn't woken by a search
+ALERT_POLL_INTERVAL = float(os.getenv('ALERT_POLL_INTERVAL', '60'))
+# Queued jobs taken per matching round
+ALERT_QUEUE_BATCH = int(os.getenv('ALERT_QUEUE_BATCH', '1000'))
+
+
+def queue_new_jobs(catalog_ids, seen_by=None):
+    """
+    Queue new catalog jobs for alert matching; called on the request path.
+
+    Args:
+        catalog_ids: IDs of jobs just added to the catalog
+        seen_by: User whose search brought the jobs in (see process_new_jobs)
+    """
+    if not catalog_ids:
+        return
+    db.queue_alert_jobs(catalog_ids, seen_by)
+    alert_matcher.wake()
+
+
+@traced('alerts.match')
+def process_new_jobs(catalog_ids, seen_by=None):
+    """
+    Score new catalog jobs against every active alert and queue the matches.
+
+    Args:
+        catalog_ids: IDs of jobs just added to the catalog
+        seen_by: User whose search brought the jobs in; their own alerts are
+            skipped since they are looking at these jobs already
+
+    Returns:
+        Number of matches queued
+    """
+    if not catalog_ids:
+        return 0
+    alerts = [a for a in db.get_active_alerts() if a['user_id'] != seen_by]
+    if not alerts:
+        return 0
+
+    import numpy as np
+    from matcher_enhanced import EnhancedJobMatcher
+
+    jobs = db.get_catalog_jobs(catalog_ids)
+    matcher = EnhancedJobMatcher()
+    queued = 0
+
+    for start in range(0, len(alerts), ALERT_BATCH_SIZE):
+        batch = alerts[start:start + ALERT_BATCH_SIZE]
+        contexts = [matcher.build_user_context(alert['profile']) for alert in batch]
+        scores = matcher.score_matrix(contexts, jobs)
+
+        thresholds = np.array([alert['min_score'] for alert in batch])[:, None]
+        alert_rows, job_cols = np.nonzero(scores >= thresholds)
+        matches = [
+            (batch[a]['id'], jobs[j]['catalog_id'], round(float(scores[a, j]), 1))
+            for a, j in zip(alert_rows.tolist(), job_cols.tolist())
+        ]
+        if matches:
+            db.save_alert_matches(matches)
+        queued += len(matches)
+
+    if queued:
+        logger.info(f"Queued {queued} alert matches for {len(catalog_ids)} new jobs",
+                    extra={'jobs': len(catalog_ids)})
+    return queued
+
+
+def match_queued_jobs(limit=ALERT_QUEUE_BATCH):
+    """
+    Take one batch of queued jobs and match it against the alerts.
+
+    Jobs are matched in groups by the user who brought them in. A group
+    that fails goes back on the queue and the other groups are still
+    matched; the first failure is raised afterwards.
+
+    Returns:
+        Number of queued jobs taken
+    """
+    queued = db.claim_alert_jobs(limit)
+    by_user = OrderedDict()
+    for catalog_id, seen_by in queued:
+        by_user.setdefault(seen_by, []).append(catalog_id)
+    error = None
+    for seen_by, catalog_ids in by_user.items():
+        try:
+            process_new_jobs(catalog_ids, seen_by=seen_by)
+        except Exception as e:
+            db.queue_alert_jobs(catalog_ids, seen_by)
+            error = error or e
+    if error is not None:
+        raise error
+    return len(queued)
+
+
+class AlertMatcher:
+    """Matches queued new jobs against the alerts in a background thread."""
+
+    def __init__(self, batch_size=ALERT_QUEUE_BATCH):
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._pid = None
+
+    def start(self):
+        """Start the matcher thread, once per process (so again after a fork)."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, name='alert-matcher', daemon=True).start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                taken = match_queued_jobs(self.batch_size)
+            except Exception:
+                logger.exception("Alert matching failed; the jobs stay queued")
+                taken = 0
+            if taken < self.batch_size:
+                self._wake.wait(ALERT_POLL_INTERVAL)
+
+    def drain(self):
+        """Match queued jobs until none are left. Returns the number taken."""
+        total = 0
+        while True:
+            taken = match_queued_jobs(self.batch_size)
+            total += taken
+            if taken < self.batch_size:
+                return total
+
+
+alert_matcher = AlertMatcher()
+
+
+def start_matcher():
+    """Start this process's background alert matcher, unless ALERT_MATCHER is 'off'."""
+    if ALERT_MATCHER == 'thread':
+        alert_matcher.start()
+
+
+def send_pending_notifications(limit=500):
+    """
+    Email users their queued alert matches, one email per user.
+
+    Emails go to the outbox and are delivered in SMTP batches by the mail
+    sender. The matches listed in an email (the best ALERT_JOBS_PER_EMAIL)
+    are marked as notified once it is queued; the rest stay pending for the
+    next run.
+
+    Returns:
+        Number of emails queued
+    """
+    from email_utils import send_job_alert_email
+
+    by_user = OrderedDict()
+    for match in db.get_pending_alert_matches(limit):
+        by_user.setdefault(match['user_id'], []).append(match)
+
+    queued = 0
+    for matches in by_user.values():
+        recipient = matches[0]
+        listed = matches[:ALERT_JOBS_PER_EMAIL]
+        if send_job_alert_email(recipient['email'], recipient['full_name'], listed):
+            db.mark_alert_matches_notified([m['id'] for m in listed])
+            queued += 1
+        else:
+            logger.warning(f"Alert email to user {recipient['user_id']} not queued; will retry")
+    return queued
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Saved-search alert notifications")
+    parser.add_argument('--match', action='store_true', help="Match queued new jobs against the alerts")
+    parser.add_argument('--send', action='store_true', help="Email queued alert matches")
+    parser.add_argument('--limit', type=int, default=500, help="Matches processed per run")
+    args = parser.parse_args()
+
+    from utils.logging_config import configure_logging
+    configure_logging()
+    db.ensure_database()
+    if args.match:
+        print(f"Matched {alert_matcher.drain()} queued jobs")
+    if args.send:
+        from email_utils import sender
+        print(f"Queued {send_pending_notifications(args.limit)} alert emails")
+        print(f"Processed {sender.drain()} outbox emails")
+    if not (args.match or args.send):
+        parser.print_help()
@@ -0,0 +1,341 @@
+"""
+Synthetic Job Corpus
+Deterministic generator of realistic job records for load and scale testing.
+The same seed always yields the same corpus, so benchmark runs are comparable.
+
+Usage:
+    python -m benchmarks.corpus --count 1000000 --seed 42 --output corpus.jsonl.gz
+    python -m benchmarks.corpus --count 1000 | head
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.text_processor import SKILL_KEYWORDS
+
+ROLES = {
+    'Software Engineer': ['Python', 'Java', 'Go', 'Git', 'Docker', 'SQL', 'Microservices'],
+    'Backend Developer': ['Python', 'Django', 'Node.js', 'PostgreSQL', 'Redis', 'REST API'],
+    'Frontend Developer': ['JavaScript', 'TypeScript', 'React', 'Vue', 'CSS', 'HTML', 'Tailwind'],
+    'Full Stack Developer': ['JavaScript', 'React', 'Node.js', 'Express', 'MongoDB', 'GraphQL'],
+    'Python Developer': ['Python', 'Django', 'Flask', 'FastAPI', 'PostgreSQL', 'Celery'],
+    'Java Developer': ['Java', 'Spring', 'Spring Boot', 'MySQL', 'Microservices', 'Jenkins'],
+    'DevOps Engineer': ['AWS', 'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'CI/CD', 'Linux'],
+    'Data Engineer': ['Python', 'SQL', 'Spark', 'Airflow', 'Hadoop', 'AWS', 'Big Data'],
+    'Data Scientist': ['Python', 'Pandas', 'NumPy', 'Scikit-learn', 'Machine Learning', 'SQL'],
+    'Machine Learning Engineer': ['Python', 'PyTorch', 'TensorFlow', 'Deep Learning', 'Kubernetes'],
+    'Mobile Developer': ['Swift', 'Kotlin', 'Flutter', 'React Native', 'iOS', 'Android'],
+    'QA Engineer': ['Python', 'Jenkins', 'Git', 'Agile', 'Jira'],
+    'Product Designer': ['Figma', 'Adobe XD', 'HTML', 'CSS'],
+    'Site Reliability Engineer': ['Go', 'Kubernetes', 'GCP', 'Linux', 'Bash', 'Terraform'],
+}
+SENIORITY = ['', '', 'Junior ', 'Senior ', 'Lead ', 'Principal ', 'Staff ', 'Mid-level ']
+TITLE_SUFFIXES = ['', '', '', ' (Remote)', ' (m/w/d)', ' - Contract', ' II']
+
+COMPANY_SYLLABLES = ['nova', 'tech', 'data', 'cloud', 'bright', 'path', 'core', 'byte', 'quant',
+                     'lumen', 'orbit', 'forge', 'stack', 'wave', 'zen', 'pixel', 'north', 'hub']
+COMPANY_SUFFIXES = ['', '', ' Inc.', ' LLC', ' Ltd.', ' GmbH', ' Labs', ' Corporation', ' Solutions']
+
+LOCATIONS = ['Remote', 'Worldwide', 'Europe', 'USA', 'Berlin', 'London', 'New York, NY',
+             'Austin, Texas', 'Cairo, Egypt', 'Giza, Egypt', 'Toronto, Canada', 'Remote (Americas)']
+PLATFORMS = {
+    'RemoteOK': 'https://remoteok.com/remote-jobs/{slug}',
+    'Remotive': 'https://remotive.com/remote-jobs/software-dev/{slug}',
+    'Arbeitnow': 'https://www.arbeitnow.com/jobs/companies/{company_slug}/{slug}',
+    'Adzuna': 'https://www.adzuna.com/details/{n}',
+    'Jobicy': 'https://jobicy.com/jobs/{n}-{slug}',
+    'Wuzzuf': 'https://wuzzuf.net/jobs/p/{slug}-cairo-egypt',
+}
+JOB_TYPES = ['Full-time', 'Full-time', 'Full-time', 'Contract', 'Part-time', 'Remote']
+
+EXPERIENCE_PHRASES = [
+    '{low}+ years of professional experience',
+    '{low}-{high} years of experience',
+    'at least {low} years working with {skill}',
+    '{low} to {high} yrs in a similar role',
+    'This is an entry level position, graduates welcome',
+    'Junior candidates are encouraged to apply',
+    'You are a senior engineer who has shipped production systems',
+    'Experience leading a small team is a plus',
+    'Strong communication skills',
+]
+
+SENTENCES = [
+    'You will design, build and maintain services used by thousands of customers.',
+    'We work in small, autonomous teams with a strong culture of code review.',
+    'Hands-on experience with {skill} and {skill2} is required.',
+    'Familiarity with {skill} is a plus.',
+    'You will collaborate with product, design and data teams every day.',
+    'Our stack includes {skill}, {skill2} and a lot of automated testing.',
+    'We value ownership, curiosity and clear written communication.',
+    'The role includes on-call rotation once every six weeks.',
+    'We offer flexible hours, a learning budget and equity.',
+    'You will mentor other engineers and help shape our architecture.',
+    'Knowledge of {skill} in production environments is highly valued.',
+    'Our customers rely on us for reliable, secure and fast products.',
+]
+
+HTML_NOISE = [
+    ('<p>', '</p>'), ('<div>', '</div>'), ('<li>', '</li>'), ('<p><strong>', '</strong></p>'),
+    ('<span style="font-weight: 400;">', '</span>'), ('<p>&nbsp;', '<br/></p>'),
+]
+BOILERPLATE = [
+    'Apply now through our careers page!',
+    'Click here to see all open positions.',
+    'Visit our website for more information.',
+    '[Ref: {ref}]',
+]
+
+
+def slugify(text):
+    return '-'.join(''.join(c if c.isalnum() else ' ' for c in text.lower()).split())
+
+
+class JobCorpusGenerator:
+    """
+    Seeded generator of job records in the scrapers' normalized shape.
+
+    Each record carries a plain-text 'description' and the same text as a
+    board would send it in 'raw_description' (HTML tags, entities and
+    boilerplate). A share of records are duplicates of earlier ones: exact
+    copies, or the same posting syndicated to another platform with small
+    title/company differences.
+    """
+
+    def __init__(self, seed=42, duplicate_rate=0.05, html_rate=0.7, start_date=None):
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.html_rate = html_rate
+        self.start_date = start_date or datetime(2025, 1, 1)
+        self.companies = self._make_companies(random.Random(seed), 5000)
+
+    @staticmethod
+    def _make_companies(rng, count):
+        companies = []
+        for _ in range(count):
+            name = ''.join(rng.sample(COMPANY_SYLLABLES, rng.choice([2, 2, 3]))).title()
+            companies.append(name + rng.choice(COMPANY_SUFFIXES))
+        return companies
+
+    def generate(self, count) -> Iterator[Dict]:
+        """Yield count job records."""
+        rng = random.Random(self.seed)
+        recent = []
+
+        for n in range(count):
+            if recent and rng.random() < self.duplicate_rate:
+                record = self._duplicate(rng, rng.choice(recent), n)
+            else:
+                record = self._new_record(rng, n)
+                recent.append(record)
+                if len(recent) > 1000:
+                    recent.pop(rng.randrange(len(recent)))
+            yield record
+
+    def _new_record(self, rng, n):
+        role = rng.choice(list(ROLES))
+        seniority = rng.choice(SENIORITY)
+        title = f"{seniority}{role}{rng.choice(TITLE_SUFFIXES)}"
+        company = rng.choice(self.companies)
+        platform = rng.choice(list(PLATFORMS))
+
+        role_skills = ROLES[role]
+        skills = rng.sample(role_skills, min(len(role_skills), rng.randint(2, 5)))
+        skills += rng.sample(SKILL_KEYWORDS, rng.randint(0, 3))
+        skills = list(dict.fromkeys(skills))
+
+        description = self._description(rng, title, company, skills)
+        slug = f"{slugify(title)}-{slugify(company)}-{n}"
+
+        return {
+            'id': f"syn-{n}",
+            'title': title,
+            'company': company,
+            'location': rng.choice(LOCATIONS),
+            'description': description,
+            'raw_description': self._add_noise(rng, description),
+            'skills': skills,
+            'platform': platform,
+            'url': PLATFORMS[platform].format(slug=slug, company_slug=slugify(company), n=1000000 + n),
+            'posted_date': (self.start_date - timedelta(minutes=rng.randint(0, 60 * 24 * 60))).isoformat(),
+            'salary': self._salary(rng),
+            'job_type': rng.choice(JOB_TYPES),
+        }
+
+    def _duplicate(self, rng, original, n):
+        record = dict(original)
+        record['id'] = f"syn-{n}"
+        variant = rng.random()
+        if variant < 0.3:
+            return record  # Exact repost
+
+        # Syndicated to another board, with the small edits boards make
+        platform = rng.choice([p for p in PLATFORMS if p != original['platform']])
+        record['platform'] = platform
+        record['url'] = PLATFORMS[platform].format(
+            slug=f"{slugify(record['title'])}-{n}", company_slug=slugify(record['company']), n=1000000 + n
+        )
+        if variant < 0.6:
+            record['title'] = record['title'].replace(' (Remote)', '').replace(' - Contract', '')
+        elif variant < 0.8:
+            record['company'] = record['company'] + rng.choice([' Inc.', ' GmbH', ' Ltd.'])
+        else:
+            record['title'] = record['title'].upper() if rng.random() < 0.5 else record['title'].lower()
+        record['raw_description'] = self._add_noise(rng, record['description'])
+        return record
+
+    def _description(self, rng, title, company, skills):
+        # Skewed lengths: mostly short posts, some very long ones
+        sentence_count = min(60, int(rng.lognormvariate(2.0, 0.6)) + 2)
+        parts = [f"{company} is hiring a {title}."]
+        for _ in range(sentence_count):
+            sentence = rng.choice(SENTENCES)
+            parts.append(sentence.format(skill=rng.choice(skills), skill2=rng.choice(skills)))
+
+        phrase = rng.choice(EXPERIENCE_PHRASES)
+        low = rng.choice([0, 1, 2, 3, 4, 5, 7, 8, 10])
+        parts.insert(rng.randint(1, len(parts)), phrase.format(
+            low=low, high=low + rng.choice([2, 3, 5]), skill=rng.choice(skills)
+        ) + '.')
+        parts.append(f"Requirements: {', '.join(skills)}.")
+        return ' '.join(parts)
+
+    def _add_noise(self, rng, description):
+        if rng.random() >= self.html_rate:
+            return description
+
+        sentences = description.split('. ')
+        html = []
+        for sentence in sentences:
+            open_tag, close_tag = rng.choice(HTML_NOISE)
+            sentence = sentence.replace('&', '&amp;')
+            html.append(f"{open_tag}{sentence}.{close_tag}")
+        if rng.random() < 0.5:
+            html.append('<p>' + rng.choice(BOILERPLATE).format(ref=rng.randint(1000, 9999)) + '</p>')
+        if rng.random() < 0.2:
+            html.append('<script>trackView();</script><style>.x{color:red}</style>')
+        return '\n'.join(html)
+
+    @staticmethod
+    def _salary(rng):
+        if rng.random() < 0.4:
+            return 'Not specified'
+        low = rng.randrange(40, 180, 5)
+        return f"${low}k-${low + rng.randrange(10, 60, 5)}k"
+
+
+def generate_jobs(count, seed=42, **options) -> Iterator[Dict]:
+    """Yield count synthetic job records (see JobCorpusGenerator for options)."""
+    return JobCorpusGenerator(seed=seed, **options).generate(count)
+
+
+def board_listing(record, platform):
+    """
+    Render a corpus record the way a job board API would return it.
+
+    Args:
+        record: Record from generate_jobs
+        platform: 'RemoteOK', 'Remotive', 'Arbeitnow', 'Adzuna' or 'Jobicy'
+    """
+    skills = record['skills']
+    if platform == 'RemoteOK':
+        return {
+            'id': record['id'], 'position': record['title'], 'company': record['company'],
+            'location': record['location'], 'description': record['raw_description'],
+            'tags': [s.lower() for s in skills], 'url': record['url'], 'date': record['posted_date'],
+        }
+    if platform == 'Remotive':
+        return {
+            'id': record['id'], 'title': record['title'], 'company_name': record['company'],
+            'category': 'Software Development', 'job_type': record['job_type'],
+            'description': record['raw_description'], 'url': record['url'],
+            'publication_date': record['posted_date'], 'salary': record['salary'],
+            'candidate_required_location': record['location'],
+        }
+    if platform == 'Arbeitnow':
+        return {
+            'slug': record['id'], 'title': record['title'], 'company_name': record['company'],
+            'description': record['raw_description'], 'tags': skills, 'url': record['url'],
+            'job_types': [record['job_type']], 'location': record['location'],
+            'created_at': record['posted_date'], 'remote': 'Remote' in record['location'],
+        }
+    if platform == 'Adzuna':
+        return {
+            'id': record['id'], 'title': record['title'], 'description': record['description'][:500],
+            'redirect_url': record['url'], 'created': record['posted_date'],
+            'company': {'display_name': record['company']},
+            'location': {'display_name': record['location']},
+            'category': {'label': 'IT Jobs'},
+        }
+    if platform == 'Jobicy':
+        return {
+            'id': record['id'], 'jobTitle': record['title'], 'companyName': record['company'],
+            'jobIndustry': ['Programming'], 'jobGeo': record['location'],
+            'jobDescription': record['raw_description'], 'url': record['url'],
+            'pubDate': record['posted_date'],
+        }
+    raise ValueError(f"Unknown platform: {platform}")
+
+
+def write_jsonl(records, path):
+    """Write records as JSON lines; '-' writes to stdout, '.gz' paths are gzipped."""
+    if path == '-':
+        out = sys.stdout
+    elif str(path).endswith('.gz'):
+        out = gzip.open(path, 'wt', encoding='utf-8')
+    else:
+        out = open(path, 'w', encoding='utf-8')
+
+    count = 0
+    try:
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write('\n')
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return count
+
+
+def read_jsonl(path) -> Iterator[Dict]:
+    """Stream records back from a corpus file."""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic job corpus")
+    parser.add_argument('--count', type=int, default=10000, help="Number of records")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05, help="Share of duplicate postings")
+    parser.add_argument('--html-rate', type=float, default=0.7, help="Share of descriptions with HTML noise")
+    parser.add_argument('--output', default='-', help="JSONL path ('.gz' to compress, '-' for stdout)")
+    args = parser.parse_args(argv)
+
+    records = generate_jobs(
+        args.count, seed=args.seed, duplicate_rate=args.duplicate_rate, html_rate=args.html_rate
+    )
+    try:
+        written = write_jsonl(records, args.output)
+    except BrokenPipeError:
+        return 0
+    if args.output != '-':
+        print(f"Wrote {written} records to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
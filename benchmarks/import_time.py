@@ -0,0 +1,124 @@
+"""
+Import-Time Benchmark
+Measures how long a fresh interpreter takes to import the app (what every
+gunicorn worker pays on boot and restart), and how long warmup() takes on
+top, using `python -X importtime` in clean subprocesses.
+
+Usage:
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --module routes.jobs --top 20 --output imports.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+warmup_s = None
+if {warmup!r}:
+    from server import warmup
+    warmup()
+    warmup_s = time.perf_counter() - imported
+print(json.dumps({{'import_s': imported - started, 'warmup_s': warmup_s}}))
+"""
+
+
+def run_once(module, warmup, workdir):
+    """Import module in a fresh interpreter; returns timings and per-module import costs."""
+    env = dict(os.environ)
+    env.update(LOG_LEVEL='WARNING', LOG_FILE='', DATABASE_PATH=os.path.join(workdir, 'import.db'))
+    script = _SCRIPT.format(root=str(PROJECT_ROOT), module=module, warmup=warmup)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = {
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cumulative_us) / 1000,
+                'depth': len(indent) // 2,
+            }
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app import time in fresh interpreters")
+    parser.add_argument('--module', default='server', help="Module to import (default: server)")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="Heaviest imports to list")
+    parser.add_argument('--no-warmup', action='store_true', help="Skip timing server.warmup()")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='jobflow-import-')
+    import_times, warmup_times, last_modules = [], [], {}
+    for _ in range(args.runs):
+        timings, last_modules = run_once(args.module, not args.no_warmup, workdir)
+        import_times.append(timings['import_s'] * 1000)
+        if timings['warmup_s'] is not None:
+            warmup_times.append(timings['warmup_s'] * 1000)
+
+    # Heaviest third-party/app packages imported directly by project code
+    project_modules = {p.stem for p in PROJECT_ROOT.glob('*.py')} | {
+        p.name for p in PROJECT_ROOT.iterdir() if (p / '__init__.py').exists()
+    }
+    heaviest = sorted(
+        ((name, info) for name, info in last_modules.items()
+         if info['depth'] <= 2 or name.split('.')[0] in project_modules),
+        key=lambda item: item[1]['cumulative_ms'], reverse=True,
+    )[:args.top]
+
+    report = {
+        'module': args.module,
+        'runs': args.runs,
+        'import_ms': {
+            'median': round(statistics.median(import_times), 1),
+            'min': round(min(import_times), 1),
+            'max': round(max(import_times), 1),
+        },
+        'warmup_ms': {
+            'median': round(statistics.median(warmup_times), 1),
+        } if warmup_times else None,
+        'heaviest_imports': [
+            {'module': name, 'cumulative_ms': round(info['cumulative_ms'], 1), 'self_ms': round(info['self_ms'], 1)}
+            for name, info in heaviest
+        ],
+    }
+
+    print(f"import {args.module}: median {report['import_ms']['median']} ms "
+          f"(min {report['import_ms']['min']}, max {report['import_ms']['max']}, {args.runs} runs)")
+    if report['warmup_ms']:
+        print(f"warmup(): median {report['warmup_ms']['median']} ms")
+    print(f"\n{'module':<50}{'cumulative ms':>16}{'self ms':>10}")
+    for entry in report['heaviest_imports']:
+        print(f"{entry['module']:<50}{entry['cumulative_ms']:>16.1f}{entry['self_ms']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
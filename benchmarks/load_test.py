@@ -0,0 +1,428 @@
+"""
+HTTP Load Test
+Boots server:app under gunicorn against the stub job boards and drives a
+weighted mix of API calls, reporting throughput, latency histograms and error
+rates per endpoint. Use it to size worker counts and to check performance
+changes against the real traffic mix.
+
+Usage:
+    python -m benchmarks.load_test --workers 4 --concurrency 16 --duration 60
+    python -m benchmarks.load_test --mix login=1,form=1,searches=4,saved=4 --output load.json
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --duration 30
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.corpus import generate_jobs
+from benchmarks.stub_server import StubBoardServer
+
+# Share of requests per operation, roughly what production sees: most
+# traffic is dashboard reads, recommendations are the expensive minority
+DEFAULT_MIX = {
+    'login': 1,
+    'form': 2,
+    'cv': 1,
+    'searches': 3,
+    'saved': 3,
+}
+ENDPOINTS = {
+    'login': ('POST', '/api/auth/login'),
+    'form': ('POST', '/api/recommend/form'),
+    'cv': ('POST', '/api/recommend/cv'),
+    'searches': ('GET', '/api/user/searches'),
+    'saved': ('GET', '/api/user/saved-jobs'),
+}
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+PASSWORD = 'loadtest-password'
+
+
+def parse_mix(text):
+    """Parse 'login=1,form=2' into a weights dict."""
+    mix = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown operation: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# ============= REQUEST PAYLOADS =============
+
+def build_cv_pdf(record):
+    """Render a one-page CV PDF for a corpus record."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    buffer = BytesIO()
+    story = [
+        Paragraph("Alex Morgan", styles['Title']),
+        Paragraph(f"{record['title']}", styles['Heading2']),
+        Paragraph("alex.morgan@example.com | +1 555 0100 | Remote", styles['Normal']),
+        Spacer(1, 12),
+        Paragraph("Summary", styles['Heading3']),
+        Paragraph(f"{record['title']} with 5 years of experience. {record['description'][:600]}", styles['Normal']),
+        Spacer(1, 12),
+        Paragraph("Skills", styles['Heading3']),
+        Paragraph(', '.join(record['skills']), styles['Normal']),
+        Spacer(1, 12),
+        Paragraph("Experience", styles['Heading3']),
+        Paragraph(f"{record['company']} - {record['title']} (2020 - Present)", styles['Normal']),
+    ]
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+
+class PayloadFactory:
+    """Seeded form profiles and CV files drawn from the synthetic corpus."""
+
+    def __init__(self, seed=42, variety=50):
+        self.records = list(generate_jobs(variety, seed=seed, duplicate_rate=0.0))
+        self.cv_files = [build_cv_pdf(record) for record in self.records[:10]]
+
+    def form(self, rng):
+        record = rng.choice(self.records)
+        return {
+            'job_title': record['title'],
+            'skills': record['skills'],
+            'experience': f"{rng.randint(0, 10)} years",
+            'location': '',
+        }
+
+    def cv(self, rng):
+        return rng.choice(self.cv_files)
+
+
+# ============= SERVER =============
+
+class GunicornServer:
+    """server:app under gunicorn, pointed at a stub board server and a throwaway database."""
+
+    def __init__(self, stub, workers=2, threads=1, worker_class='sync', timeout=120, preload=False):
+        self.stub = stub
+        self.workers = workers
+        self.threads = threads
+        self.worker_class = worker_class
+        self.timeout = timeout
+        self.preload = preload
+        self.port = free_port()
+        self.workdir = tempfile.mkdtemp(prefix='jobflow-load-')
+        self.process = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, ready_timeout=60):
+        env = dict(os.environ)
+        env.update(self.stub.env())
+        env['DATABASE_PATH'] = os.path.join(self.workdir, 'load.db')
+        env['METRICS_DIR'] = os.path.join(self.workdir, 'metrics')
+        env.setdefault('SECRET_KEY', 'load-test-secret')
+
+        # Run from the temp dir so logs/ and temp_uploads/ stay out of the repo
+        command = [
+            sys.executable, '-m', 'gunicorn',
+            '--bind', f"127.0.0.1:{self.port}",
+            '--workers', str(self.workers),
+            '--threads', str(self.threads),
+            '--worker-class', self.worker_class,
+            '--timeout', str(self.timeout),
+            '--pythonpath', str(PROJECT_ROOT),
+            '--config', str(PROJECT_ROOT / 'gunicorn.conf.py'),
+            '--log-level', 'warning',
+            'server:app',
+        ]
+        if self.preload:
+            command.insert(-1, '--preload')
+        self.process = subprocess.Popen(
+            command, cwd=self.workdir, env=env,
+            stdout=subprocess.DEVNULL, stderr=open(os.path.join(self.workdir, 'gunicorn.log'), 'w'),
+        )
+
+        deadline = time.monotonic() + ready_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited early, see {self.workdir}/gunicorn.log")
+            try:
+                requests.get(f"{self.base_url}/api/auth/me", timeout=1)
+                return self
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("gunicorn did not become ready in time")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# ============= LOAD =============
+
+class LoadRecorder:
+    """Thread-safe per-endpoint latency and status collection."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, operation, seconds, status, ok):
+        with self.lock:
+            self.latencies[operation].append(seconds)
+            self.statuses[operation][str(status)] += 1
+            if not ok:
+                self.errors[operation] += 1
+
+    def report(self, elapsed):
+        report = {}
+        for operation, samples in sorted(self.latencies.items()):
+            ms = np.asarray(samples, dtype=np.float64) * 1000
+            counts = np.histogram(ms, bins=[0] + LATENCY_BUCKETS_MS + [np.inf])[0]
+            labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            method, path = ENDPOINTS[operation]
+            report[operation] = {
+                'endpoint': f"{method} {path}",
+                'requests': int(ms.size),
+                'throughput_per_s': round(ms.size / elapsed, 2) if elapsed > 0 else None,
+                'error_rate': round(self.errors[operation] / ms.size, 4),
+                'statuses': dict(self.statuses[operation]),
+                'mean_ms': round(float(ms.mean()), 2),
+                'p50_ms': round(float(np.percentile(ms, 50)), 2),
+                'p95_ms': round(float(np.percentile(ms, 95)), 2),
+                'p99_ms': round(float(np.percentile(ms, 99)), 2),
+                'max_ms': round(float(ms.max()), 2),
+                'histogram': {label: int(c) for label, c in zip(labels, counts)},
+            }
+        return report
+
+
+class VirtualUser:
+    """One signed-up account with its own cookie session."""
+
+    def __init__(self, base_url, email, payloads, seed):
+        self.base_url = base_url
+        self.email = email
+        self.payloads = payloads
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+
+    def signup(self):
+        response = self.session.post(f"{self.base_url}/api/auth/signup", json={
+            'email': self.email, 'password': PASSWORD, 'full_name': 'Load Test',
+        }, timeout=30)
+        if response.status_code != 200:
+            # Left over from an earlier run against the same --url
+            self.login()
+
+    def login(self):
+        return self.session.post(f"{self.base_url}/api/auth/login", json={
+            'email': self.email, 'password': PASSWORD,
+        }, timeout=30)
+
+    def call(self, operation, timeout):
+        url = self.base_url + ENDPOINTS[operation][1]
+        if operation == 'login':
+            return self.login()
+        if operation == 'form':
+            return self.session.post(url, json=self.payloads.form(self.rng), timeout=timeout)
+        if operation == 'cv':
+            files = {'file': ('resume.pdf', self.payloads.cv(self.rng), 'application/pdf')}
+            return self.session.post(url, files=files, timeout=timeout)
+        return self.session.get(url, timeout=timeout)
+
+
+def run_load(base_url, mix, concurrency, duration=None, total_requests=None, seed=42, timeout=120):
+    """
+    Drive the mix against a running server.
+
+    Args:
+        base_url: Server root URL
+        mix: Operation name -> weight
+        concurrency: Simultaneous virtual users
+        duration: Seconds to run (ignored when total_requests is given)
+        total_requests: Stop after this many requests in total
+        seed: Seed for operation choice and payloads
+
+    Returns:
+        Report dict with per-endpoint results and overall totals
+    """
+    payloads = PayloadFactory(seed=seed)
+    run_id = f"{int(time.time())}{random.Random(seed).randrange(1000)}"
+    users = [
+        VirtualUser(base_url, f"load-{run_id}-{n}@example.com", payloads, seed + n)
+        for n in range(concurrency)
+    ]
+    for user in users:
+        user.signup()
+
+    operations = list(mix)
+    weights = [mix[op] for op in operations]
+    recorder = LoadRecorder()
+    remaining = [total_requests]
+    remaining_lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = None if total_requests else start + (duration or 30)
+
+    def take_turn():
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        with remaining_lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def drive(user):
+        while take_turn():
+            operation = user.rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = user.call(operation, timeout)
+                status = response.status_code
+                ok = 200 <= status < 400
+                if ok and response.headers.get('Content-Type', '').startswith('application/json'):
+                    ok = response.json().get('status') != 'error'
+            except (requests.RequestException, ValueError) as e:
+                status, ok = type(e).__name__, False
+            recorder.record(operation, time.perf_counter() - started, status, ok)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(drive, users))
+
+    elapsed = time.perf_counter() - start
+    endpoints = recorder.report(elapsed)
+    total = sum(r['requests'] for r in endpoints.values())
+    errors = sum(recorder.errors.values())
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'total': {
+            'requests': total,
+            'throughput_per_s': round(total / elapsed, 2) if elapsed > 0 else None,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+        },
+        'endpoints': endpoints,
+    }
+
+
+def print_report(report):
+    print(f"{'endpoint':<30}{'reqs':>8}{'req/s':>10}{'err %':>8}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    print("-" * 89)
+    for r in report['endpoints'].values():
+        print(f"{r['endpoint']:<30}{r['requests']:>8}{r['throughput_per_s'] or 0:>10.2f}"
+              f"{r['error_rate'] * 100:>8.1f}{r['p50_ms']:>11.1f}{r['p95_ms']:>11.1f}{r['p99_ms']:>11.1f}")
+    total = report['total']
+    print("-" * 89)
+    print(f"{'total':<30}{total['requests']:>8}{total['throughput_per_s'] or 0:>10.2f}{total['error_rate'] * 100:>8.1f}")
+
+    for operation, r in report['endpoints'].items():
+        peak = max(r['histogram'].values()) or 1
+        print(f"\n{r['endpoint']} latency histogram")
+        for label, count in r['histogram'].items():
+            if count:
+                print(f"  {label:>10} {count:>7} {'#' * max(1, int(40 * count / peak))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the JobFlow API under gunicorn with stubbed job boards")
+    parser.add_argument('--url', help="Target an already running server instead of booting one")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers")
+    parser.add_argument('--threads', type=int, default=1, help="gunicorn threads per worker")
+    parser.add_argument('--worker-class', default='sync', help="gunicorn worker class")
+    parser.add_argument('--preload', action='store_true', help="Load and warm the app in the gunicorn master before forking")
+    parser.add_argument('--concurrency', type=int, default=8, help="Simultaneous virtual users")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to run")
+    parser.add_argument('--requests', type=int, help="Stop after this many requests instead of --duration")
+    parser.add_argument('--mix', default=','.join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="Operation weights (login, form, cv, searches, saved)")
+    parser.add_argument('--listings', type=int, default=None, help="Listings per stubbed feed (default: as recorded)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument('--output', help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    load_args = dict(
+        mix=mix, concurrency=args.concurrency, duration=args.duration,
+        total_requests=args.requests, seed=args.seed, timeout=args.timeout,
+    )
+
+    if args.url:
+        report = run_load(args.url.rstrip('/'), **load_args)
+    else:
+        with StubBoardServer(listings=args.listings) as stub:
+            with GunicornServer(stub, args.workers, args.threads, args.worker_class, preload=args.preload) as server:
+                print(f"gunicorn on {server.base_url} ({args.workers} workers x {args.threads} threads)", file=sys.stderr)
+                report = run_load(server.base_url, **load_args)
+
+    report['meta'] = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'url': args.url,
+        'workers': None if args.url else args.workers,
+        'threads': None if args.url else args.threads,
+        'worker_class': None if args.url else args.worker_class,
+        'preload': None if args.url else args.preload,
+        'concurrency': args.concurrency,
+        'mix': mix,
+        'listings': args.listings,
+        'seed': args.seed,
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
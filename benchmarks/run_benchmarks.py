@@ -0,0 +1,261 @@
+"""
+Scraper and Matcher Benchmarks
+Times the ingestion and matching pipeline offline, against recorded job board
+fixtures served by the local stub server and a seeded synthetic corpus, and
+reports throughput and p50/p95/p99 latencies per stage and catalog size.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 100,1000 --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.corpus import generate_jobs
+from benchmarks.stub_server import StubBoardServer
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+CASES = [
+    'scrape_jobs',
+    'clean_description',
+    'extract_skills_from_text',
+    'match_jobs_basic',
+    'match_jobs_enhanced',
+    'save_job_results',
+]
+DEFAULT_SEED = 42
+BENCH_QUERY = "Python Developer"
+BENCH_PROFILE = {
+    'job_title': 'Python Developer',
+    'skills': ['Python', 'Django', 'PostgreSQL', 'AWS', 'Docker'],
+    'experience': '3 years',
+}
+
+
+def summarize(samples, items):
+    """
+    Latency percentiles (ms) and throughput for a list of durations.
+
+    Args:
+        samples: Durations in seconds
+        items: Items processed across all samples
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    total = float(samples.sum())
+    return {
+        'samples': int(samples.size),
+        'items': int(items),
+        'total_s': round(total, 4),
+        'throughput_per_s': round(items / total, 1) if total > 0 else None,
+        'p50_ms': round(float(np.percentile(samples, 50)) * 1000, 3),
+        'p95_ms': round(float(np.percentile(samples, 95)) * 1000, 3),
+        'p99_ms': round(float(np.percentile(samples, 99)) * 1000, 3),
+    }
+
+
+def time_calls(fn, repeat):
+    """Run fn repeat times and return the durations."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_each(fn, items):
+    """Run fn once per item and return the per-item durations."""
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# ============= INPUT DATA =============
+
+def raw_descriptions(size, seed=DEFAULT_SEED):
+    """size raw HTML descriptions from the synthetic corpus."""
+    return [record['raw_description'] for record in generate_jobs(size, seed=seed)]
+
+
+def normalized_jobs(size, seed=DEFAULT_SEED):
+    """size normalized jobs from the synthetic corpus, as the scrapers return them."""
+    jobs = []
+    for n, record in enumerate(generate_jobs(size, seed=seed)):
+        job = dict(record)
+        job.pop('raw_description')
+        job['id'] = n + 1
+        jobs.append(job)
+    return jobs
+
+
+# ============= CASES =============
+
+def bench_scrape_jobs(size, repeat, server, seed):
+    from scraper_production import scrape_jobs
+
+    server.set_listings(size)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            scrape_jobs(BENCH_QUERY, "", max_jobs=size)
+
+    return summarize(time_calls(run, repeat), size * repeat)
+
+
+def bench_clean_description(size, repeat, server, seed):
+    from utils.text_processor import clean_description
+
+    return summarize(time_each(clean_description, raw_descriptions(size, seed)), size)
+
+
+def bench_extract_skills_from_text(size, repeat, server, seed):
+    from utils.text_processor import extract_skills_from_text
+
+    return summarize(time_each(extract_skills_from_text, raw_descriptions(size, seed)), size)
+
+
+def bench_match_jobs_basic(size, repeat, server, seed):
+    from matcher import match_jobs
+
+    jobs = normalized_jobs(size, seed)
+    return summarize(time_calls(lambda: match_jobs(BENCH_PROFILE, jobs, top_k=20), repeat), size * repeat)
+
+
+def bench_match_jobs_enhanced(size, repeat, server, seed):
+    from matcher_enhanced import match_jobs
+    from utils.job_features import attach_job_features
+
+    jobs = normalized_jobs(size, seed)
+    # Features are computed at ingestion, not per request
+    attach_job_features(jobs)
+    return summarize(time_calls(lambda: match_jobs(BENCH_PROFILE, jobs, top_k=20), repeat), size * repeat)
+
+
+def bench_save_job_results(size, repeat, server, seed):
+    import database as db
+
+    jobs = normalized_jobs(size, seed)
+    for job in jobs:
+        job['match_score'] = 50.0
+
+    search_ids = iter(range(1, repeat + 1))
+    return summarize(time_calls(lambda: db.save_job_results(next(search_ids), jobs), repeat), size * repeat)
+
+
+# ============= REPORTING =============
+
+def compare(results, baseline, tolerance):
+    """Return (key, metric, baseline, current) for every p50/p95 regression."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if previous.get(metric) and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append((key, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def print_table(results):
+    print(f"{'case':<28}{'size':>8}{'items/s':>14}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    print("-" * 86)
+    for key, r in results.items():
+        case, size = key.rsplit('@', 1)
+        print(f"{case:<28}{size:>8}{r['throughput_per_s'] or 0:>14,.1f}{r['p50_ms']:>12.3f}{r['p95_ms']:>12.3f}{r['p99_ms']:>12.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scraping, text processing, matching and DB writes offline")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated job counts (default: 100,1000,10000,100000)")
+    parser.add_argument('--cases', default=','.join(CASES), help="Comma-separated cases to run")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetitions for whole-batch cases")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Synthetic corpus seed")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare against a previous --output file")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown vs baseline before failing (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    cases = [c for c in args.cases.split(',') if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    output_path = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    # Keep scraper logs out of the timings and the repo's logs/ folder
+    workdir = tempfile.mkdtemp(prefix='jobflow-bench-')
+    os.chdir(workdir)
+    logging.disable(logging.INFO)
+
+    import database as db
+    db.DATABASE_PATH = Path(workdir) / 'bench.db'
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.init_database()
+
+    results = {}
+    with StubBoardServer() as server:
+        os.environ.update(server.env())
+        server.apply()
+
+        for case in cases:
+            bench = globals()[f"bench_{case}"]
+            for size in sizes:
+                print(f"Running {case} @ {size}...", file=sys.stderr)
+                results[f"{case}@{size}"] = bench(size, args.repeat, server, args.seed)
+
+    print_table(results)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for key, metric, before, after in regressions:
+                print(f"  {key} {metric}: {before:.3f} -> {after:.3f}")
+            return 1
+        print("\nNo regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
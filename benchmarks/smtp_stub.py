@@ -0,0 +1,208 @@
+"""
+SMTP Stub Server
+Minimal local SMTP server that accepts and records every message, so email
+delivery can be exercised and timed without a real mail account. It counts
+connections and logins, which is what batched delivery saves.
+
+Usage:
+    python -m benchmarks.smtp_stub --port 8025
+    SMTP_SERVER=127.0.0.1 SMTP_PORT=8025 SMTP_USERNAME=stub SMTP_PASSWORD=stub \
+        SMTP_STARTTLS=false python email_utils.py --send
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """One SMTP session: EHLO, AUTH, then any number of MAIL/RCPT/DATA transactions."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+    def readline(self):
+        line = self.rfile.readline()
+        return line.decode('utf-8', 'replace').rstrip('\r\n') if line else None
+
+    def handle(self):
+        server = self.server
+        server.record('connections')
+        if server.latency:
+            time.sleep(server.latency)  # connection setup / greeting delay
+        self.reply("220 stub ESMTP ready")
+        sender, recipients = None, []
+
+        while True:
+            line = self.readline()
+            if line is None:
+                return
+            command, _, argument = line.partition(' ')
+            command = command.upper()
+
+            if command == 'EHLO':
+                self.wfile.write(b"250-stub\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif command == 'HELO':
+                self.reply("250 stub")
+            elif command == 'AUTH':
+                mechanism, _, initial = argument.partition(' ')
+                if mechanism.upper() == 'LOGIN':
+                    if not initial:
+                        self.reply("334 VXNlcm5hbWU6")
+                        self.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.readline()
+                elif not initial:
+                    self.reply("334 ")
+                    self.readline()
+                if server.latency:
+                    time.sleep(server.latency)  # credential check
+                server.record('logins')
+                self.reply("235 Authentication successful")
+            elif command == 'MAIL':
+                sender, recipients = argument.split(':', 1)[-1].strip(), []
+                self.reply("250 OK")
+            elif command == 'RCPT':
+                recipient = argument.split(':', 1)[-1].strip().strip('<>')
+                if recipient in server.reject:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(recipient)
+                    self.reply("250 OK")
+            elif command == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.readline()
+                    if data is None or data == '.':
+                        break
+                    lines.append(data[1:] if data.startswith('..') else data)
+                if server.fail_next:
+                    server.fail_next -= 1
+                    self.reply("451 Temporary failure, try again later")
+                else:
+                    server.deliver(sender, recipients, '\n'.join(lines))
+                    self.reply("250 OK: queued")
+                sender, recipients = None, []
+            elif command == 'RSET':
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif command == 'NOOP':
+                self.reply("250 OK")
+            elif command == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, latency=0.0):
+        super().__init__(address, _SMTPHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.messages = []
+        self.counts = {'connections': 0, 'logins': 0}
+        self.reject = set()
+        self.fail_next = 0
+
+    def record(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def deliver(self, sender, recipients, data):
+        with self.lock:
+            self.messages.append({'from': sender, 'to': recipients, 'data': data})
+
+
+class StubSMTPServer:
+    """Local SMTP server standing in for the mail provider."""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+            latency: Seconds added to connection setup and to login, to
+                mimic the round trips of a remote provider
+        """
+        self.smtpd = _SMTPServer((host, port), latency)
+        self.thread = None
+
+    @property
+    def messages(self):
+        """Accepted messages as dicts of from, to (list) and data (raw message)."""
+        return self.smtpd.messages
+
+    @property
+    def connections(self):
+        return self.smtpd.counts['connections']
+
+    @property
+    def logins(self):
+        return self.smtpd.counts['logins']
+
+    def reject(self, *recipients):
+        """Refuse these recipients permanently (550)."""
+        self.smtpd.reject.update(recipients)
+
+    def fail_next(self, count=1):
+        """Answer the next count messages with a temporary failure (451)."""
+        self.smtpd.fail_next = count
+
+    def env(self):
+        """Environment variables that point email_utils at this server."""
+        host, port = self.smtpd.server_address[:2]
+        return {
+            'SMTP_SERVER': host,
+            'SMTP_PORT': str(port),
+            'SMTP_USERNAME': 'stub',
+            'SMTP_PASSWORD': 'stub',
+            'SMTP_STARTTLS': 'false',
+        }
+
+    def apply(self):
+        """Point an already-imported email_utils at this server."""
+        import email_utils
+
+        env = self.env()
+        email_utils.SMTP_SERVER = env['SMTP_SERVER']
+        email_utils.SMTP_PORT = int(env['SMTP_PORT'])
+        email_utils.SMTP_USERNAME = env['SMTP_USERNAME']
+        email_utils.SMTP_PASSWORD = env['SMTP_PASSWORD']
+        email_utils.SMTP_STARTTLS = False
+
+    def start(self):
+        self.thread = threading.Thread(target=self.smtpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.smtpd.shutdown()
+        self.smtpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SMTP stub that records messages")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to connect and login")
+    args = parser.parse_args()
+
+    stub = StubSMTPServer(args.host, args.port, args.latency).start()
+    print(f"SMTP stub listening on {args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"{len(stub.messages)} messages, {stub.connections} connections, {stub.logins} logins")
+    except KeyboardInterrupt:
+        stub.stop()
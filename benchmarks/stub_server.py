@@ -0,0 +1,245 @@
+"""
+Job Board Stub Server
+Serves recorded job board responses from benchmarks/fixtures on localhost, so
+the scrapers can be exercised and timed without touching the live APIs.
+Feeds larger than the recordings are padded with synthetic corpus listings.
+
+Usage:
+    python -m benchmarks.stub_server --port 8765 --listings 1000
+"""
+import argparse
+import copy
+import gzip
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+from benchmarks.corpus import board_listing, generate_jobs, slugify
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name):
+    """Load a JSON fixture by file name."""
+    with open(FIXTURES_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _scaled(listings, count, platform):
+    """
+    Recorded listings first, then synthetic corpus listings until there are
+    count of them. Each board gets its own corpus seed so feeds don't overlap.
+    """
+    result = copy.deepcopy(listings[:count])
+    extra = count - len(result)
+    if extra > 0:
+        seed = sum(map(ord, platform))
+        for record in generate_jobs(extra, seed=seed, duplicate_rate=0.0):
+            if platform == 'Wuzzuf':
+                slug = record['url'].rsplit('/', 1)[-1]
+                result.append({
+                    'slug': slug, 'title': record['title'], 'company': record['company'],
+                    'company_slug': slugify(record['company']),
+                })
+            else:
+                result.append(board_listing(record, platform))
+    return result
+
+
+def build_responses(listings=None):
+    """
+    Render the body served for every stubbed endpoint.
+
+    Args:
+        listings: Listings per feed; None serves the fixtures as recorded.
+            Adzuna and Jobicy pages are capped at 50, like the real APIs.
+
+    Returns:
+        Dict of path prefix -> (content type, body bytes)
+    """
+    def count(recorded, cap=None):
+        n = len(recorded) if listings is None else listings
+        return min(n, cap) if cap else n
+
+    remoteok = load_fixture('remoteok.json')
+    meta, remoteok_jobs = remoteok[0], remoteok[1:]
+    remoteok_body = [meta] + _scaled(remoteok_jobs, count(remoteok_jobs), 'RemoteOK')
+
+    remotive = load_fixture('remotive.json')
+    remotive['jobs'] = _scaled(remotive['jobs'], count(remotive['jobs']), 'Remotive')
+    remotive['job-count'] = len(remotive['jobs'])
+
+    arbeitnow = load_fixture('arbeitnow.json')
+    arbeitnow['data'] = _scaled(arbeitnow['data'], count(arbeitnow['data']), 'Arbeitnow')
+
+    adzuna = load_fixture('adzuna.json')
+    adzuna['results'] = _scaled(adzuna['results'], count(adzuna['results'], 50), 'Adzuna')
+    adzuna['count'] = len(adzuna['results'])
+
+    jobicy = load_fixture('jobicy.json')
+    jobicy['jobs'] = _scaled(jobicy['jobs'], count(jobicy['jobs'], 50), 'Jobicy')
+    jobicy['jobCount'] = len(jobicy['jobs'])
+
+    cards = load_fixture('wuzzuf_cards.json')
+    card_template = (FIXTURES_DIR / 'wuzzuf_card.html').read_text(encoding='utf-8')
+    page_template = (FIXTURES_DIR / 'wuzzuf.html').read_text(encoding='utf-8')
+    rendered_cards = ''.join(
+        card_template.format(**{k: escape(str(v)) for k, v in card.items()})
+        for card in _scaled(cards, count(cards), 'Wuzzuf')
+    )
+
+    def as_json(data):
+        return ('application/json', json.dumps(data).encode('utf-8'))
+
+    return {
+        '/remoteok/api': as_json(remoteok_body),
+        '/remotive/api/remote-jobs': as_json(remotive),
+        '/arbeitnow/api/job-board-api': as_json(arbeitnow),
+        '/adzuna/': as_json(adzuna),
+        '/jobicy/api/v2/remote-jobs': as_json(jobicy),
+        '/wuzzuf/search/jobs/': ('text/html; charset=utf-8', page_template.replace('<!--CARDS-->', rendered_cards).encode('utf-8')),
+    }
+
+
+@lru_cache(maxsize=32)
+def _gzipped(body):
+    return gzip.compress(body, compresslevel=6)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Serve the prepared responses; unknown paths get a 404."""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        responses = self.server.responses
+
+        # Wuzzuf pages after the first are empty so pagination stops
+        if parsed.path.startswith('/wuzzuf/') and 'start=0' not in parsed.query:
+            content_type, body = 'text/html; charset=utf-8', b'<html><body></body></html>'
+        else:
+            match = next((p for p in responses if parsed.path.startswith(p)), None)
+            if match is None:
+                self.send_error(404)
+                return
+            content_type, body = responses[match]
+
+        # Validators and compression, like the real feeds' CDNs
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        encoding = None
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            encoding = 'gzip'
+            body = _gzipped(body)
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('ETag', etag)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+
+class StubBoardServer:
+    """Local HTTP server standing in for every job board the scrapers call."""
+
+    def __init__(self, host='127.0.0.1', port=0, listings=None):
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.responses = build_responses(listings)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_listings(self, listings):
+        """Change how many listings each feed returns."""
+        self.httpd.responses = build_responses(listings)
+
+    def env(self):
+        """Environment variables that point the scrapers at this server."""
+        base = self.base_url
+        return {
+            'REMOTEOK_API_URL': f"{base}/remoteok/api",
+            'REMOTIVE_API_URL': f"{base}/remotive/api/remote-jobs",
+            'ARBEITNOW_API_URL': f"{base}/arbeitnow/api/job-board-api",
+            'ADZUNA_API_URL': f"{base}/adzuna",
+            'JOBICY_API_URL': f"{base}/jobicy/api/v2/remote-jobs",
+            'WUZZUF_SEARCH_URL': f"{base}/wuzzuf/search/jobs/",
+            'ADZUNA_APP_ID': 'stub',
+            'ADZUNA_APP_KEY': 'stub',
+            'SCRAPER_PLATFORM_DELAY': '0',
+        }
+
+    def apply(self):
+        """Point already-imported scraper classes at this server."""
+        from scraper_production import ProductionJobScraper
+        from fetchers.adzuna import AdzunaFetcher
+        from fetchers.jobicy import JobicyFetcher
+        from fetchers.wuzzuf import WuzzufFetcher
+        import os
+        import scraper_production
+
+        env = self.env()
+        os.environ.update({k: env[k] for k in ('ADZUNA_APP_ID', 'ADZUNA_APP_KEY')})
+        ProductionJobScraper.REMOTEOK_URL = env['REMOTEOK_API_URL']
+        ProductionJobScraper.REMOTIVE_URL = env['REMOTIVE_API_URL']
+        ProductionJobScraper.ARBEITNOW_URL = env['ARBEITNOW_API_URL']
+        AdzunaFetcher.BASE_URL = env['ADZUNA_API_URL']
+        JobicyFetcher.BASE_URL = env['JOBICY_API_URL']
+        WuzzufFetcher.BASE_URL = env['WUZZUF_SEARCH_URL']
+        scraper_production.PLATFORM_DELAY = 0.0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded job board fixtures locally")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--listings', type=int, default=None, help="Listings per feed (default: as recorded)")
+    args = parser.parse_args()
+
+    server = StubBoardServer(args.host, args.port, args.listings)
+    print(f"Stub job boards on {server.base_url}")
+    for key, value in server.env().items():
+        print(f"  {key}={value}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
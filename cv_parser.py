@@ -1,7 +1,46 @@
-import re
+import hashlib
+import io
+import logging
+import multiprocessing
+import multiprocessing.connection
 import os
-from PyPDF2 import PdfReader
-import docx
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from utils.cv_analysis import get_analyzer
+from utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger('jobflow.cv')
+
+SUPPORTED_FORMATS = ('.pdf', '.docx')
+
+# Bump when extraction or parsing changes so cached results are recomputed
+PARSER_VERSION = 3
+
+# Extraction budgets, so a huge or pathological upload can't pin a worker
+MAX_PDF_PAGES = int(os.getenv('CV_MAX_PAGES', '20'))
+MAX_TEXT_CHARS = int(os.getenv('CV_MAX_TEXT_CHARS', '100000'))
+EXTRACT_TIMEOUT = float(os.getenv('CV_EXTRACT_TIMEOUT', '5'))
+# Extraction runs in a worker process, which is terminated (and replaced)
+# if it overruns EXTRACT_TIMEOUT by this much (a single page or the PDF's structure can
+# take arbitrarily long, and only the page loop checks the time budget)
+EXTRACT_KILL_GRACE = float(os.getenv('CV_EXTRACT_KILL_GRACE', '2'))
+# With stop_early, PDF reading stops once a title and this many skills have been seen
+SIGNAL_SKILLS = int(os.getenv('CV_SIGNAL_SKILLS', '10'))
+
+# Parsed CVs kept in memory per process; the database cache is shared by all workers
+MEMORY_CACHE_SIZE = int(os.getenv('CV_CACHE_SIZE', '256'))
+# Database cache eviction: entries expire after CV_CACHE_TTL_DAYS, and only
+# the newest CV_CACHE_MAX_ROWS are kept (parse results hold contact details)
+DB_CACHE_TTL = float(os.getenv('CV_CACHE_TTL_DAYS', '7')) * 86400
+DB_CACHE_MAX_ROWS = int(os.getenv('CV_CACHE_MAX_ROWS', '10000'))
+
+# Batch parsing (recruiters uploading candidate lists); also the number of
+# extraction processes per web worker
+BATCH_MAX_FILES = int(os.getenv('CV_BATCH_MAX_FILES', '50'))
+BATCH_WORKERS = max(1, int(os.getenv('CV_BATCH_WORKERS', str(min(4, os.cpu_count() or 1)))))
 
 class CVParser:
     def __init__(self):
@@ -29,27 +68,90 @@ class CVParser:
             "system administrator", "network engineer", "cyber security analyst"
         ]
 
-    def extract_text_from_pdf(self, file_path):
-        """Extract text from a PDF file."""
-        text = ""
+    def iter_pdf_pages(self, source, max_pages=MAX_PDF_PAGES, deadline=None):
+        """
+        Yield the text of each PDF page lazily, in order.
+        
+        Stops after max_pages pages, or before starting a page once the
+        time.monotonic() deadline has passed.
+        """
+        from PyPDF2 import PdfReader
+        
+        reader = PdfReader(source)
+        for number, page in enumerate(reader.pages):
+            if max_pages is not None and number >= max_pages:
+                return
+            if deadline is not None and time.monotonic() > deadline:
+                logger.debug(f"PDF extraction stopped by time budget after {number} pages")
+                return
+            yield page.extract_text() or ''
+
+    def extract_text_from_pdf(self, source, max_pages=MAX_PDF_PAGES, max_chars=MAX_TEXT_CHARS,
+                              timeout=EXTRACT_TIMEOUT, stop_early=False):
+        """
+        Extract text from a PDF file path or binary file object.
+        
+        The time budget is only checked between pages; parse_cv() and
+        parse_cv_batch() also bound it from outside by running extraction
+        in a worker process.
+        
+        Args:
+            source: Path or binary file object
+            max_pages: Page budget (None for all pages)
+            max_chars: Text budget; extraction stops once it is reached
+            timeout: Wall-clock budget in seconds, checked between pages
+            stop_early: Stop once the pages read name a job title and
+                SIGNAL_SKILLS skills. The text is then partial: experience
+                dates, sections and skills on later pages are missing, so
+                only use it when title and skills are all that's needed.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        pages = []
+        size = 0
+        skills_seen = set()
+        title_seen = False
         try:
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+            for page_text in self.iter_pdf_pages(source, max_pages, deadline):
+                pages.append(page_text + "\n")
+                size += len(page_text) + 1
+                if max_chars and size >= max_chars:
+                    break
+                if stop_early:
+                    # Only the new page is scanned; the final parse sees all the text
+                    skills_seen.update(self.extract_skills(page_text))
+                    title_seen = title_seen or self.extract_job_title(page_text) != "Unknown"
+                    if title_seen and len(skills_seen) >= SIGNAL_SKILLS:
+                        break
         except Exception as e:
-            print(f"Error reading PDF: {e}")
-        return text
+            logger.warning(f"Error reading PDF: {e}", extra={'error_class': type(e).__name__})
+        text = ''.join(pages)
+        return text[:max_chars] if max_chars else text
 
-    def extract_text_from_docx(self, file_path):
-        """Extract text from a DOCX file."""
-        text = ""
+    def extract_text_from_docx(self, source, max_chars=MAX_TEXT_CHARS):
+        """Extract text from a DOCX file path or binary file object."""
+        import docx
+        
+        paragraphs = []
+        size = 0
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(source)
             for para in doc.paragraphs:
-                text += para.text + "\n"
+                paragraphs.append(para.text + "\n")
+                size += len(para.text) + 1
+                if max_chars and size >= max_chars:
+                    break
         except Exception as e:
-            print(f"Error reading DOCX: {e}")
-        return text
+            logger.warning(f"Error reading DOCX: {e}", extra={'error_class': type(e).__name__})
+        text = ''.join(paragraphs)
+        return text[:max_chars] if max_chars else text
+
+    def extract_text(self, source, ext):
+        """Extract text from a file path or binary file object in the given format."""
+        if ext == '.pdf':
+            return self.extract_text_from_pdf(source)
+        if ext == '.docx':
+            return self.extract_text_from_docx(source)
+        raise ValueError(f"Unsupported file format: {ext}")
 
     def extract_email(self, text):
         """Extract email address from text."""
@@ -64,51 +166,332 @@ class CVParser:
         match = re.search(phone_pattern, text)
         return match.group(0) if match else None
 
+    @property
+    def analyzer(self):
+        """Compiled skill and title matcher for this parser's vocabulary."""
+        return get_analyzer(tuple(self.skills_db), tuple(self.job_titles_db))
+
     def extract_skills(self, text):
         """Extract skills from text based on the skills database."""
-        found_skills = set()
-        text_lower = text.lower()
-        
-        for skill in self.skills_db:
-            # Use word boundary check to avoid partial matches (e.g., "java" in "javascript")
-            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                found_skills.add(skill)
-                
-        return list(found_skills)
+        return self.analyzer.find_skills(text)
 
     def extract_job_title(self, text):
         """Attempt to extract the candidate's current or desired job title."""
-        text_lower = text.lower()
-        for title in self.job_titles_db:
-            if title in text_lower:
-                return title.title() # Return capitalized
-        return "Unknown"
+        title = self.analyzer.find_title(text)
+        return title.title() if title else "Unknown" # Return capitalized
 
-    def parse(self, file_path):
-        """Main method to parse a CV file."""
-        ext = os.path.splitext(file_path)[1].lower()
-        text = ""
-        
-        if ext == '.pdf':
-            text = self.extract_text_from_pdf(file_path)
-        elif ext == '.docx':
-            text = self.extract_text_from_docx(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
-            
+    def parse_text(self, text):
+        """Parse already extracted CV text."""
         if not text:
             return {
                 "error": "Could not extract text from file"
             }
 
+        analysis = self.analyzer.analyze(text)
         return {
             "email": self.extract_email(text),
             "phone": self.extract_phone(text),
-            "skills": self.extract_skills(text),
-            "job_title": self.extract_job_title(text),
+            "skills": analysis["skills"],
+            "job_title": analysis["job_title"].title() if analysis["job_title"] else "Unknown",
+            "experience": analysis["years_experience"],
+            "sections": analysis["sections"],
             "raw_text": text[:1000] + "..." # Preview
         }
 
+    def parse(self, file_path):
+        """Main method to parse a CV file."""
+        ext = os.path.splitext(file_path)[1].lower()
+        return self.parse_text(self.extract_text(file_path, ext))
+
+    def parse_bytes(self, data, filename):
+        """Parse an uploaded CV held in memory; the format comes from the filename."""
+        ext = os.path.splitext(filename)[1].lower()
+        return self.parse_text(self.extract_text(io.BytesIO(data), ext))
+
+# ============= CACHED AND BATCH PARSING =============
+
+_memory_cache = OrderedDict()
+_pool = None
+
+def content_hash(data):
+    """Cache key for a file's bytes under the current parser version."""
+    digest = hashlib.sha256(f"cv-parser-v{PARSER_VERSION}:".encode('ascii'))
+    digest.update(data)
+    return digest.hexdigest()
+
+def _file_format(filename):
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format: {ext or 'none'}")
+    return ext
+
+def _remember(key, parsed_data):
+    _memory_cache[key] = parsed_data
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+def _cache_get(key):
+    parsed_data = _memory_cache.get(key)
+    if parsed_data is None:
+        import database as db
+        cached = db.get_cached_cv(key, max_age=DB_CACHE_TTL)
+        if cached is None:
+            CACHE_REQUESTS.inc(cache='cv', result='miss')
+            return None
+        parsed_data = cached['parsed_data']
+    _remember(key, parsed_data)
+    CACHE_REQUESTS.inc(cache='cv', result='hit')
+    return dict(parsed_data)
+
+def _cache_put(key, parsed_data):
+    # Failed extractions are not cached; the upload may be retried after a parser fix
+    if "error" in parsed_data:
+        return
+    # The text preview is CV content; only the fresh parse returns it
+    parsed_data = {k: v for k, v in parsed_data.items() if k != "raw_text"}
+    import database as db
+    db.save_cached_cv(key, parsed_data, max_age=DB_CACHE_TTL, max_rows=DB_CACHE_MAX_ROWS)
+    _remember(key, parsed_data)
+
+def _extract_and_parse(data, ext):
+    """Extract and parse one file; runs in batch worker processes."""
+    parser = CVParser()
+    text = parser.extract_text(io.BytesIO(data), ext)
+    return text, parser.parse_text(text)
+
+def parse_cv(data, filename):
+    """
+    Parse an uploaded CV from memory, reusing the result for identical files.
+    
+    Args:
+        data: File contents
+        filename: Original filename (for the format)
+        
+    Returns:
+        (parsed_data, cached) - parsed_data has an "error" key if no text
+        could be extracted; cached results have no "raw_text" preview
+        
+    Raises:
+        ValueError: Unsupported file format
+    """
+    ext = _file_format(filename)
+    key = content_hash(data)
+    parsed_data = _cache_get(key)
+    if parsed_data is not None:
+        return parsed_data, True
+    
+    _, parsed_data = _extract_bounded([(data, ext)])[0]
+    _cache_put(key, parsed_data)
+    return parsed_data, False
+
+def _extraction_worker(conn):
+    """Extraction process: run (function, bytes, format) tasks until the pipe closes."""
+    while True:
+        try:
+            function, data, ext = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = (True, function(data, ext))
+        except Exception as e:
+            result = (False, e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # The result or the exception didn't pickle
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+class _ExtractionProcess:
+    """A long-lived extraction process, fed one file at a time through a pipe."""
+    
+    def __init__(self):
+        # Spawned rather than forked: the web worker runs threads (logging,
+        # metrics) whose locks a forked child could inherit held
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_extraction_worker, args=(child_conn,),
+                                       name='cv-extract', daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.index = None
+        self.deadline = None
+    
+    def submit(self, index, data, ext):
+        self.index = index
+        self.deadline = time.monotonic() + EXTRACT_TIMEOUT + EXTRACT_KILL_GRACE
+        self.conn.send((_extract_and_parse, data, ext))
+    
+    def kill(self):
+        self.process.terminate()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+class _ExtractionPool:
+    """
+    Up to BATCH_WORKERS extraction processes, shared by the request threads
+    of one web worker. Processes start on demand and are reused; one that
+    overruns its budget is terminated and replaced on the next demand.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self.pid = os.getpid()
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.started = 0
+    
+    def acquire(self, timeout):
+        """An idle process, a new one while under size, or None after waiting timeout seconds."""
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker.process.is_alive():
+                return worker
+            self.discard(worker)
+        with self.lock:
+            start = self.started < self.size
+            if start:
+                self.started += 1
+        if start:
+            try:
+                return _ExtractionProcess()
+            except BaseException:
+                with self.lock:
+                    self.started -= 1
+                raise
+        try:
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def release(self, worker):
+        self.idle.put(worker)
+    
+    def discard(self, worker):
+        worker.kill()
+        with self.lock:
+            self.started -= 1
+
+def _get_pool():
+    """This web worker's extraction processes; a forked worker starts its own."""
+    global _pool
+    if _pool is None or _pool.pid != os.getpid():
+        _pool = _ExtractionPool(BATCH_WORKERS)
+    return _pool
+
+def _extract_bounded(items):
+    """
+    Extract and parse (bytes, format) items in the extraction processes, under the time budget.
+    
+    Returns one (text, parsed_data) per item, in order. A file gets
+    EXTRACT_TIMEOUT + EXTRACT_KILL_GRACE once a process takes it; a file
+    still being read after that gets an error result and its process is
+    terminated. Files wait for a free process at most until the batch's
+    budget runs out.
+    
+    Raises:
+        Exception: The first error an extraction raised, once all items are done
+    """
+    pool = _get_pool()
+    # Files queue for BATCH_WORKERS processes, so the budget grows in rounds
+    rounds = -(-len(items) // BATCH_WORKERS)
+    budget_end = time.monotonic() + (EXTRACT_TIMEOUT + EXTRACT_KILL_GRACE) * rounds
+    results = [None] * len(items)  # (succeeded, (text, parsed_data) or exception)
+    queued = deque(range(len(items)))
+    running = []
+    
+    try:
+        while queued or running:
+            while queued and len(running) < BATCH_WORKERS:
+                worker = pool.acquire(0 if running else max(0.0, budget_end - time.monotonic()))
+                if worker is None:
+                    break
+                index = queued.popleft()
+                running.append(worker)
+                worker.submit(index, *items[index])
+            if not running:
+                logger.warning(f"No CV extraction process came free for {len(queued)} file(s)")
+                for index in queued:
+                    results[index] = (True, ('', {"error": "The file took too long to read"}))
+                break
+            
+            timeout = max(0.0, min(worker.deadline for worker in running) - time.monotonic())
+            ready = multiprocessing.connection.wait([worker.conn for worker in running], timeout)
+            for worker in list(running):
+                if worker.conn in ready:
+                    running.remove(worker)
+                    try:
+                        results[worker.index] = worker.conn.recv()
+                    except (EOFError, OSError):
+                        logger.warning("CV extraction process exited while reading a file")
+                        results[worker.index] = (True, ('', {"error": "The file could not be read"}))
+                        pool.discard(worker)
+                    else:
+                        pool.release(worker)
+                elif time.monotonic() >= worker.deadline:
+                    running.remove(worker)
+                    logger.warning("CV extraction exceeded its time budget; its process is terminated")
+                    results[worker.index] = (True, ('', {"error": "The file took too long to read"}))
+                    pool.discard(worker)
+    except BaseException:
+        for worker in running:
+            pool.discard(worker)
+        raise
+    
+    for succeeded, value in results:
+        if not succeeded:
+            raise value
+    return [value for _, value in results]
+
+def parse_cv_batch(files):
+    """
+    Parse many CVs, extracting the uncached ones in parallel worker processes.
+    
+    Identical files in one batch are parsed once.
+    
+    Args:
+        files: List of (filename, bytes)
+        
+    Returns:
+        One result per file, in order: {"filename", "status": "success",
+        "cached", "parsed_data"} or {"filename", "status": "error", "message"}
+    """
+    results = [None] * len(files)
+    pending = OrderedDict()  # content hash -> (format, bytes, positions)
+    
+    for position, (filename, data) in enumerate(files):
+        try:
+            ext = _file_format(filename)
+        except ValueError as e:
+            results[position] = {"filename": filename, "status": "error", "message": str(e)}
+            continue
+        
+        key = content_hash(data)
+        if key in pending:
+            pending[key][2].append(position)
+            continue
+        parsed_data = _cache_get(key)
+        if parsed_data is not None:
+            results[position] = {"filename": filename, "status": "success", "cached": True, "parsed_data": parsed_data}
+            continue
+        pending[key] = (ext, data, [position])
+    
+    outputs = _extract_bounded([(data, ext) for ext, data, _ in pending.values()]) if pending else []
+    
+    for (key, (_, _, positions)), (_, parsed_data) in zip(pending.items(), outputs):
+        _cache_put(key, parsed_data)
+        for position in positions:
+            filename = files[position][0]
+            if "error" in parsed_data:
+                results[position] = {"filename": filename, "status": "error", "message": parsed_data["error"]}
+            else:
+                results[position] = {"filename": filename, "status": "success", "cached": False, "parsed_data": dict(parsed_data)}
+    
+    return results
+
 # Usage example
 if __name__ == "__main__":
     parser = CVParser()
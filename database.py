@@ -1,9 +1,24 @@
+import os
+import logging
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
+from utils.job_features import attach_job_features
+from utils.job_index import job_index_terms
+from utils.metrics import DB_QUERY_SECONDS
 
-DATABASE_PATH = Path(__file__).parent / "jobs.db"
+logger = logging.getLogger('jobflow.db')
+_initialized = False
+
+DATABASE_PATH = Path(os.getenv('DATABASE_PATH', Path(__file__).parent / "jobs.db"))
+
+# Columns added after the first release; init_database adds them to older databases
+ADDED_COLUMNS = {
+    'searches': [('match_profile', 'TEXT')],
+    'job_results': [('catalog_job_id', 'INTEGER')],
+    'job_catalog': [('dedup_signature', 'BLOB')],
+}
 
 def get_db_connection():
     """Create and return a database connection."""
@@ -11,6 +26,10 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row  # Return rows as dictionaries
     return conn
 
+def timed_query(func):
+    """Record the function's latency under its name in the DB query metrics."""
+    return DB_QUERY_SECONDS.time(operation=func.__name__)(func)
+
 def init_database():
     """Initialize the database with schema."""
     conn = get_db_connection()
@@ -21,12 +40,29 @@ def init_database():
         schema = f.read()
     
     conn.executescript(schema)
+    _add_missing_columns(conn)
     conn.commit()
     conn.close()
-    print("✓ Database initialized successfully")
+    logger.info("✓ Database initialized successfully")
+
+def ensure_database():
+    """Initialize the database once per process, on first use rather than at import."""
+    global _initialized
+    if not _initialized:
+        init_database()
+        _initialized = True
+
+def _add_missing_columns(conn):
+    """Bring tables created by an older schema up to date."""
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {info[1] for info in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        for column, declaration in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
 
 # ============= USER OPERATIONS =============
 
+@timed_query
 def create_user(email, password_hash, full_name=None):
     """Create a new user."""
     conn = get_db_connection()
@@ -42,6 +78,7 @@ def create_user(email, password_hash, full_name=None):
     finally:
         conn.close()
 
+@timed_query
 def get_user_by_email(email):
     """Get user by email."""
     conn = get_db_connection()
@@ -49,6 +86,7 @@ def get_user_by_email(email):
     conn.close()
     return dict(user) if user else None
 
+@timed_query
 def update_last_login(user_id):
     """Update user's last login timestamp."""
     conn = get_db_connection()
@@ -63,18 +101,75 @@ def update_last_login(user_id):
 
 # ============= SEARCH OPERATIONS =============
 
-def save_search(user_id, search_type, query_data, keywords):
-    """Save a search query."""
+@timed_query
+def save_search(user_id, search_type, query_data, keywords, match_profile=None):
+    """Save a search query (and the profile its jobs were matched against)."""
     conn = get_db_connection()
     cursor = conn.execute(
-        "INSERT INTO searches (user_id, search_type, query_data, keywords) VALUES (?, ?, ?, ?)",
-        (user_id, search_type, json.dumps(query_data), keywords)
+        "INSERT INTO searches (user_id, search_type, query_data, keywords, match_profile) VALUES (?, ?, ?, ?, ?)",
+        (user_id, search_type, json.dumps(query_data), keywords,
+         json.dumps(match_profile) if match_profile is not None else None)
     )
     conn.commit()
     search_id = cursor.lastrowid
     conn.close()
     return search_id
 
+@timed_query
+def get_search(search_id):
+    """Get a search by ID, with query_data and match_profile decoded."""
+    conn = get_db_connection()
+    row = conn.execute("SELECT * FROM searches WHERE id = ?", (search_id,)).fetchone()
+    conn.close()
+    
+    if not row:
+        return None
+    search = dict(row)
+    search['query_data'] = json.loads(search['query_data']) if search['query_data'] else None
+    search['match_profile'] = json.loads(search['match_profile']) if search['match_profile'] else None
+    return search
+
+@timed_query
+def save_search_candidates(search_id, jobs, components):
+    """
+    Store every job scored for a search with its score components.
+    
+    Args:
+        search_id: Search the jobs were scored for
+        jobs: Scored jobs; each must have a catalog_id
+        components: Score component arrays aligned with jobs
+    """
+    conn = get_db_connection()
+    conn.executemany(
+        """INSERT OR REPLACE INTO search_candidates
+           (search_id, catalog_job_id, skill_match, text_similarity, experience_match, title_match)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [
+            (
+                search_id,
+                job['catalog_id'],
+                float(components['skill_match'][i]),
+                float(components['text_similarity'][i]),
+                float(components['experience_match'][i]),
+                bool(components['title_match'][i])
+            )
+            for i, job in enumerate(jobs) if job.get('catalog_id') is not None
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+@timed_query
+def get_search_candidates(search_id):
+    """Get the jobs scored for a search: catalog job IDs with their score components."""
+    conn = get_db_connection()
+    rows = conn.execute(
+        "SELECT * FROM search_candidates WHERE search_id = ?", (search_id,)
+    ).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+@timed_query
 def get_user_searches(user_id, limit=10):
     """Get user's recent searches."""
     conn = get_db_connection()
@@ -87,6 +182,7 @@ def get_user_searches(user_id, limit=10):
 
 # ============= JOB RESULTS =============
 
+@timed_query
 def save_job_results(search_id, jobs):
     """Save job results for a search."""
     conn = get_db_connection()
@@ -94,8 +190,8 @@ def save_job_results(search_id, jobs):
     for job in jobs:
         conn.execute(
             """INSERT INTO job_results 
-               (search_id, job_title, company, location, description, skills, match_score, platform, url)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+               (search_id, job_title, company, location, description, skills, match_score, platform, url, catalog_job_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (
                 search_id,
                 job.get('title'),
@@ -105,13 +201,15 @@ def save_job_results(search_id, jobs):
                 json.dumps(job.get('skills', [])),
                 job.get('match_score', 0),
                 job.get('platform'),
-                job.get('url')
+                job.get('url'),
+                job.get('catalog_id')
             )
         )
     
     conn.commit()
     conn.close()
 
+@timed_query
 def get_search_results(search_id):
     """Get job results for a specific search."""
     conn = get_db_connection()
@@ -130,8 +228,425 @@ def get_search_results(search_id):
     
     return jobs
 
+# ============= JOB CATALOG =============
+
+@timed_query
+def save_catalog_jobs(jobs):
+    """
+    Store scraped jobs, with their precomputed features, in the job catalog.
+    
+    Jobs already in the catalog (same fingerprint) are refreshed rather than
+    duplicated, and near-duplicates of a stored job (the same posting from
+    another board) resolve to the stored job. Each job dict gets its catalog
+    row ID as job['catalog_id'].
+    
+    Returns:
+        List of catalog IDs that were newly inserted
+    """
+    # numpy is only needed once jobs are stored, not at import
+    from utils.dedup import band_keys, job_sketch
+    
+    # Scrapers normally attach features already; this covers the fallback ones
+    attach_job_features(jobs)
+    
+    conn = get_db_connection()
+    new_ids = []
+    now = datetime.now()
+    
+    for job in jobs:
+        features = job['features']
+        fingerprint = features['fingerprint']
+        
+        row = conn.execute(
+            "SELECT id, dedup_signature FROM job_catalog WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+        sketch = job_sketch(job) if row is None or row['dedup_signature'] is None else None
+        
+        if row is None:
+            duplicate_id = _find_catalog_duplicate(conn, sketch)
+            if duplicate_id is not None:
+                # Same posting seen on another board: keep the stored copy
+                conn.execute("UPDATE job_catalog SET last_seen_at = ? WHERE id = ?", (now, duplicate_id))
+                job['catalog_id'] = duplicate_id
+                continue
+        
+        if row:
+            catalog_id = row['id']
+            conn.execute(
+                "UPDATE job_catalog SET description = ?, skills = ?, features = ?, last_seen_at = ? WHERE id = ?",
+                (job.get('description'), json.dumps(job.get('skills', [])), json.dumps(features), now, catalog_id)
+            )
+            conn.execute("DELETE FROM job_catalog_terms WHERE job_id = ?", (catalog_id,))
+        else:
+            cursor = conn.execute(
+                """INSERT INTO job_catalog
+                   (fingerprint, job_title, company, location, description, skills, platform, url,
+                    posted_date, salary, job_type, features, first_seen_at, last_seen_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    fingerprint,
+                    job.get('title'),
+                    job.get('company'),
+                    job.get('location'),
+                    job.get('description'),
+                    json.dumps(job.get('skills', [])),
+                    job.get('platform'),
+                    job.get('url'),
+                    job.get('posted_date'),
+                    job.get('salary'),
+                    job.get('job_type'),
+                    json.dumps(features),
+                    now,
+                    now
+                )
+            )
+            catalog_id = cursor.lastrowid
+            new_ids.append(catalog_id)
+        
+        # Keep the inverted index in step with the stored features
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_catalog_terms (term, job_id) VALUES (?, ?)",
+            [(term, catalog_id) for term in job_index_terms(features)]
+        )
+        
+        # New jobs, and jobs stored before near-duplicate detection, get a signature
+        if sketch is not None:
+            conn.execute(
+                "UPDATE job_catalog SET dedup_signature = ? WHERE id = ?",
+                (sketch.signature.tobytes(), catalog_id)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_catalog_bands (band, job_id) VALUES (?, ?)",
+                [(band, catalog_id) for band in band_keys(sketch.signature)]
+            )
+        
+        job['catalog_id'] = catalog_id
+    
+    conn.commit()
+    conn.close()
+    return new_ids
+
+def _find_catalog_duplicate(conn, sketch):
+    """ID of a stored near-duplicate of a job, looked up by its LSH bands."""
+    from utils.dedup import band_keys, is_near_duplicate, stored_sketch
+    
+    keys = band_keys(sketch.signature)
+    placeholders = ', '.join('?' for _ in keys)
+    rows = conn.execute(
+        f"""SELECT DISTINCT c.id, c.job_title, c.company, c.dedup_signature
+            FROM job_catalog_bands b
+            JOIN job_catalog c ON c.id = b.job_id
+            WHERE b.band IN ({placeholders})""",
+        keys
+    ).fetchall()
+    for row in rows:
+        if is_near_duplicate(sketch, stored_sketch(row['job_title'], row['company'], row['dedup_signature'])):
+            return row['id']
+    return None
+
+# job_catalog columns a catalog job dict carries; the fingerprint, dedup
+# signature and timestamps are bookkeeping and stay in the database
+CATALOG_JOB_COLUMNS = (
+    'id, job_title, company, location, description, skills, platform, url, '
+    'posted_date, salary, job_type, features'
+)
+
+def _catalog_row_to_job(row):
+    """Convert a job_catalog row into the job dict shape the scrapers produce."""
+    job = dict(row)
+    job['catalog_id'] = job.pop('id')
+    job['title'] = job.pop('job_title')
+    job['skills'] = json.loads(job['skills']) if job['skills'] else []
+    job['features'] = json.loads(job['features']) if job['features'] else None
+    return job
+
+@timed_query
+def get_catalog_jobs(job_ids=None, limit=None):
+    """Get catalog jobs by ID, or the most recently seen ones."""
+    conn = get_db_connection()
+    if job_ids is not None:
+        job_ids = list(job_ids)
+        rows = []
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows.extend(conn.execute(
+                f"SELECT {CATALOG_JOB_COLUMNS} FROM job_catalog WHERE id IN ({placeholders})", chunk
+            ).fetchall())
+    else:
+        rows = conn.execute(
+            f"SELECT {CATALOG_JOB_COLUMNS} FROM job_catalog ORDER BY last_seen_at DESC LIMIT ?",
+            (limit if limit is not None else -1,)
+        ).fetchall()
+    conn.close()
+    
+    return [_catalog_row_to_job(r) for r in rows]
+
+@timed_query
+def get_catalog_candidate_ids(terms, budget=500):
+    """
+    Catalog job IDs sharing at least one index term with the query.
+    
+    Jobs matching more terms come first, then the most recently seen.
+    """
+    terms = list(terms)
+    if not terms:
+        return []
+    
+    conn = get_db_connection()
+    placeholders = ', '.join('?' for _ in terms)
+    rows = conn.execute(
+        f"""SELECT t.job_id, COUNT(*) AS hits
+            FROM job_catalog_terms t
+            JOIN job_catalog c ON c.id = t.job_id
+            WHERE t.term IN ({placeholders})
+            GROUP BY t.job_id
+            ORDER BY hits DESC, c.last_seen_at DESC
+            LIMIT ?""",
+        terms + [budget]
+    ).fetchall()
+    conn.close()
+    
+    return [r['job_id'] for r in rows]
+
+# ============= CV PARSE CACHE =============
+
+@timed_query
+def get_cached_cv(content_hash, max_age=None):
+    """Get a cached CV parse result by content hash, if cached within max_age seconds."""
+    oldest = datetime.now() - timedelta(seconds=max_age) if max_age else datetime.min
+    conn = get_db_connection()
+    row = conn.execute(
+        "SELECT parsed_data FROM cv_parse_cache WHERE content_hash = ? AND created_at >= ?",
+        (content_hash, oldest)
+    ).fetchone()
+    conn.close()
+    
+    if not row:
+        return None
+    return {'parsed_data': json.loads(row['parsed_data'])}
+
+@timed_query
+def save_cached_cv(content_hash, parsed_data, max_age=None, max_rows=None):
+    """
+    Store a CV's parse result under its content hash. Callers leave the
+    CV's text out of parsed_data.
+    
+    Entries older than max_age seconds, and the oldest beyond max_rows
+    entries, are removed.
+    """
+    now = datetime.now()
+    conn = get_db_connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO cv_parse_cache (content_hash, parsed_data, created_at) VALUES (?, ?, ?)",
+        (content_hash, json.dumps(parsed_data), now)
+    )
+    if max_age:
+        conn.execute("DELETE FROM cv_parse_cache WHERE created_at < ?", (now - timedelta(seconds=max_age),))
+    if max_rows:
+        conn.execute(
+            """DELETE FROM cv_parse_cache WHERE content_hash IN (
+                   SELECT content_hash FROM cv_parse_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+               )""",
+            (max_rows,)
+        )
+    conn.commit()
+    conn.close()
+
+# ============= FEED CACHE =============
+
+@timed_query
+def get_feed_validators(feed_key):
+    """Get the ETag and Last-Modified of a feed's last response."""
+    conn = get_db_connection()
+    row = conn.execute(
+        "SELECT etag, last_modified FROM feed_cache WHERE feed_key = ?", (feed_key,)
+    ).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+@timed_query
+def get_feed_body(feed_key):
+    """Get the compressed body of a feed's last response."""
+    conn = get_db_connection()
+    row = conn.execute("SELECT body FROM feed_cache WHERE feed_key = ?", (feed_key,)).fetchone()
+    conn.close()
+    return row['body'] if row else None
+
+@timed_query
+def save_feed_cache(feed_key, url, etag, last_modified, body):
+    """Store a feed response's validators and compressed body."""
+    conn = get_db_connection()
+    conn.execute(
+        """INSERT OR REPLACE INTO feed_cache (feed_key, url, etag, last_modified, body, fetched_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (feed_key, url, etag, last_modified, body, datetime.now())
+    )
+    conn.commit()
+    conn.close()
+
+# ============= SEARCH ALERTS =============
+
+def _alert_row_to_dict(row):
+    alert = dict(row)
+    alert['profile'] = json.loads(alert['profile'])
+    alert['active'] = bool(alert['active'])
+    return alert
+
+@timed_query
+def save_alert(user_id, search_id, profile, min_score):
+    """Create an alert for a search, or reactivate and update an existing one."""
+    conn = get_db_connection()
+    conn.execute(
+        """INSERT INTO search_alerts (user_id, search_id, profile, min_score, active)
+           VALUES (?, ?, ?, ?, 1)
+           ON CONFLICT(search_id) DO UPDATE SET profile = excluded.profile,
+               min_score = excluded.min_score, active = 1""",
+        (user_id, search_id, json.dumps(profile), min_score)
+    )
+    conn.commit()
+    row = conn.execute("SELECT * FROM search_alerts WHERE search_id = ?", (search_id,)).fetchone()
+    conn.close()
+    return _alert_row_to_dict(row)
+
+@timed_query
+def deactivate_alert(user_id, search_id):
+    """Turn off a user's alert for a search."""
+    conn = get_db_connection()
+    cursor = conn.execute(
+        "UPDATE search_alerts SET active = 0 WHERE user_id = ? AND search_id = ?",
+        (user_id, search_id)
+    )
+    conn.commit()
+    conn.close()
+    return cursor.rowcount > 0
+
+@timed_query
+def get_user_alerts(user_id):
+    """Get a user's alerts with their match counts."""
+    conn = get_db_connection()
+    rows = conn.execute(
+        """SELECT a.*, COUNT(m.id) AS match_count
+           FROM search_alerts a
+           LEFT JOIN alert_matches m ON m.alert_id = a.id
+           WHERE a.user_id = ?
+           GROUP BY a.id
+           ORDER BY a.created_at DESC""",
+        (user_id,)
+    ).fetchall()
+    conn.close()
+    return [_alert_row_to_dict(r) for r in rows]
+
+@timed_query
+def get_active_alerts():
+    """Get every active alert."""
+    conn = get_db_connection()
+    rows = conn.execute("SELECT * FROM search_alerts WHERE active = 1 ORDER BY id").fetchall()
+    conn.close()
+    return [_alert_row_to_dict(r) for r in rows]
+
+@timed_query
+def queue_alert_jobs(catalog_ids, seen_by=None):
+    """Queue new catalog jobs to be matched against the alerts."""
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO alert_job_queue (catalog_job_id, seen_by) VALUES (?, ?)",
+        [(catalog_id, seen_by) for catalog_id in catalog_ids]
+    )
+    conn.commit()
+    conn.close()
+
+@timed_query
+def claim_alert_jobs(limit=1000):
+    """
+    Take queued jobs off the alert job queue, oldest first.
+    
+    The rows are deleted in the same write transaction, so concurrent
+    matchers (one per worker process) never get the same job.
+    
+    Returns:
+        List of (catalog_job_id, seen_by)
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            "SELECT id, catalog_job_id, seen_by FROM alert_job_queue ORDER BY id LIMIT ?", (limit,)
+        ).fetchall()
+        conn.executemany("DELETE FROM alert_job_queue WHERE id = ?", [(row['id'],) for row in rows])
+        conn.commit()
+    finally:
+        conn.close()
+    return [(row['catalog_job_id'], row['seen_by']) for row in rows]
+
+@timed_query
+def save_alert_matches(matches):
+    """
+    Queue alert matches for notification.
+    
+    Args:
+        matches: List of (alert_id, catalog_job_id, match_score)
+    """
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT OR IGNORE INTO alert_matches (alert_id, catalog_job_id, match_score) VALUES (?, ?, ?)",
+        matches
+    )
+    conn.commit()
+    conn.close()
+
+@timed_query
+def get_alert_matches(user_id, alert_id, limit=50):
+    """Get an alert's matched jobs, best first."""
+    conn = get_db_connection()
+    rows = conn.execute(
+        """SELECT m.id, m.match_score, m.created_at, m.notified_at, c.id AS catalog_job_id,
+                  c.job_title, c.company, c.location, c.platform, c.url
+           FROM alert_matches m
+           JOIN search_alerts a ON a.id = m.alert_id
+           JOIN job_catalog c ON c.id = m.catalog_job_id
+           WHERE m.alert_id = ? AND a.user_id = ?
+           ORDER BY m.created_at DESC, m.match_score DESC
+           LIMIT ?""",
+        (alert_id, user_id, limit)
+    ).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+@timed_query
+def get_pending_alert_matches(limit=500):
+    """Get matches not yet notified, with the recipient and job details."""
+    conn = get_db_connection()
+    rows = conn.execute(
+        """SELECT m.id, m.alert_id, m.match_score, u.id AS user_id, u.email, u.full_name,
+                  c.job_title, c.company, c.location, c.platform, c.url
+           FROM alert_matches m
+           JOIN search_alerts a ON a.id = m.alert_id
+           JOIN users u ON u.id = a.user_id
+           JOIN job_catalog c ON c.id = m.catalog_job_id
+           WHERE m.notified_at IS NULL AND a.active = 1
+           ORDER BY u.id, m.match_score DESC
+           LIMIT ?""",
+        (limit,)
+    ).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+@timed_query
+def mark_alert_matches_notified(match_ids):
+    """Record that alert matches have been sent to the user."""
+    conn = get_db_connection()
+    conn.executemany(
+        "UPDATE alert_matches SET notified_at = ? WHERE id = ?",
+        [(datetime.now(), match_id) for match_id in match_ids]
+    )
+    conn.commit()
+    conn.close()
+
 # ============= SAVED JOBS =============
 
+@timed_query
 def save_job(user_id, job_result_id, notes=None):
     """Bookmark a job."""
     conn = get_db_connection()
@@ -147,6 +662,7 @@ def save_job(user_id, job_result_id, notes=None):
     finally:
         conn.close()
 
+@timed_query
 def get_saved_jobs(user_id):
     """Get user's saved jobs."""
     conn = get_db_connection()
@@ -168,6 +684,7 @@ def get_saved_jobs(user_id):
     
     return jobs
 
+@timed_query
 def unsave_job(user_id, saved_job_id):
     """Remove a saved job."""
     conn = get_db_connection()
@@ -180,6 +697,7 @@ def unsave_job(user_id, saved_job_id):
 
 # ============= USER PROFILE =============
 
+@timed_query
 def get_user_by_id(user_id):
     """Get user by ID."""
     conn = get_db_connection()
@@ -187,6 +705,7 @@ def get_user_by_id(user_id):
     conn.close()
     return dict(user) if user else None
 
+@timed_query
 def update_user_profile(user_id, full_name=None, email=None):
     """Update user profile information."""
     conn = get_db_connection()
@@ -204,6 +723,7 @@ def update_user_profile(user_id, full_name=None, email=None):
     conn.close()
     return True
 
+@timed_query
 def update_user_password(user_id, new_password_hash):
     """Update user password."""
     conn = get_db_connection()
@@ -211,6 +731,7 @@ def update_user_password(user_id, new_password_hash):
     conn.commit()
     conn.close()
 
+@timed_query
 def update_profile_photo(user_id, photo_filename):
     """Update user profile photo."""
     conn = get_db_connection()
@@ -224,6 +745,7 @@ def update_profile_photo(user_id, photo_filename):
 import secrets
 from datetime import timedelta
 
+@timed_query
 def create_reset_token(email):
     """Create a password reset token for a user."""
     user = get_user_by_email(email)
@@ -243,6 +765,7 @@ def create_reset_token(email):
     
     return token
 
+@timed_query
 def verify_reset_token(token):
     """Verify a password reset token and return user_id if valid."""
     conn = get_db_connection()
@@ -255,6 +778,7 @@ def verify_reset_token(token):
     
     return dict(result)['user_id'] if result else None
 
+@timed_query
 def mark_token_used(token):
     """Mark a reset token as used."""
     conn = get_db_connection()
@@ -262,6 +786,118 @@ def mark_token_used(token):
     conn.commit()
     conn.close()
 
+# ============= EMAIL OUTBOX =============
+
+@timed_query
+def enqueue_email(to_email, message, kind=None):
+    """
+    Queue an email for background delivery.
+    
+    Args:
+        to_email: Recipient email address
+        message: Complete MIME message as a string
+        kind: Email type, for monitoring ('password_reset', 'job_alert', ...)
+    
+    Returns:
+        Outbox ID
+    """
+    conn = get_db_connection()
+    cursor = conn.execute(
+        "INSERT INTO email_outbox (kind, to_email, message, next_attempt_at) VALUES (?, ?, ?, ?)",
+        (kind, to_email, message, datetime.now())
+    )
+    conn.commit()
+    outbox_id = cursor.lastrowid
+    conn.close()
+    return outbox_id
+
+@timed_query
+def claim_outbox_emails(worker, limit=50, stale_after=600):
+    """
+    Claim due emails for delivery by one sender.
+    
+    Claiming happens in a write transaction, so concurrent senders (one per
+    worker process) never get the same email. Emails left in 'sending' by a
+    sender that died are reclaimed after stale_after seconds.
+    
+    Args:
+        worker: Sender identifier stored on the claimed rows
+        limit: Maximum emails to claim
+        stale_after: Seconds after which another sender's claim expires
+    
+    Returns:
+        List of outbox rows (id, kind, to_email, message, attempts)
+    """
+    now = datetime.now()
+    conn = get_db_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        ids = [row['id'] for row in conn.execute(
+            """SELECT id FROM email_outbox
+               WHERE (status = 'pending' AND next_attempt_at <= ?)
+                  OR (status = 'sending' AND claimed_at < ?)
+               ORDER BY id LIMIT ?""",
+            (now, now - timedelta(seconds=stale_after), limit)
+        ).fetchall()]
+        conn.executemany(
+            """UPDATE email_outbox SET status = 'sending', claimed_by = ?, claimed_at = ?,
+                      attempts = attempts + 1
+               WHERE id = ?""",
+            [(worker, now, outbox_id) for outbox_id in ids]
+        )
+        conn.commit()
+        rows = conn.execute(
+            f"""SELECT id, kind, to_email, message, attempts FROM email_outbox
+                WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id""",
+            ids
+        ).fetchall() if ids else []
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+@timed_query
+def mark_email_sent(outbox_id):
+    """Mark a queued email as delivered and drop its message body."""
+    conn = get_db_connection()
+    conn.execute(
+        "UPDATE email_outbox SET status = 'sent', sent_at = ?, message = '', last_error = NULL WHERE id = ?",
+        (datetime.now(), outbox_id)
+    )
+    conn.commit()
+    conn.close()
+
+@timed_query
+def mark_email_failed(outbox_id, error, retry_at=None):
+    """
+    Record a failed delivery attempt.
+    
+    Args:
+        outbox_id: Outbox ID
+        error: Error message from the attempt
+        retry_at: When to try again; None gives up on the email
+    """
+    conn = get_db_connection()
+    if retry_at is None:
+        conn.execute(
+            "UPDATE email_outbox SET status = 'failed', last_error = ? WHERE id = ?",
+            (error, outbox_id)
+        )
+    else:
+        conn.execute(
+            "UPDATE email_outbox SET status = 'pending', last_error = ?, next_attempt_at = ? WHERE id = ?",
+            (error, retry_at, outbox_id)
+        )
+    conn.commit()
+    conn.close()
+
+@timed_query
+def get_outbox_stats():
+    """Count queued emails by status."""
+    conn = get_db_connection()
+    rows = conn.execute("SELECT status, COUNT(*) AS count FROM email_outbox GROUP BY status").fetchall()
+    conn.close()
+    return {row['status']: row['count'] for row in rows}
+
 # Initialize database on import
 if __name__ == "__main__":
     init_database()
@@ -1,20 +1,266 @@
+"""
+Email Utilities
+Transactional and alert emails, sent through a persistent outbox.
+
+The send_* functions render a message and queue it in the email_outbox
+table, returning immediately. A MailSender thread in each process delivers
+the queue in batches, each over one SMTP connection that is authenticated
+once, and retries failed emails with exponential backoff. The app starts
+the sender on its first request; scripts call sender.drain(). Without SMTP
+credentials, delivery is simulated on the console.
+
+Usage:
+    python email_utils.py --send    # deliver queued email (e.g. from cron)
+    python email_utils.py --stats   # count queued email by status
+"""
+import argparse
+import logging
+import os
 import smtplib
+import socket
+import threading
+from datetime import datetime, timedelta
+from html import escape
+from email import message_from_string
+from email.header import decode_header, make_header
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import os
 from dotenv import load_dotenv
 
+import database as db
+from utils.metrics import EMAILS_SENT
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger('jobflow.email')
+
 # Email configuration
 SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
 SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
 SMTP_USERNAME = os.getenv('SMTP_USERNAME', '')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'true').lower() in ('1', 'true', 'yes')
+SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', '30'))
 FROM_EMAIL = os.getenv('FROM_EMAIL', 'noreply@neuronix.ai')
 FROM_NAME = os.getenv('FROM_NAME', 'Neuronix AI JobFlow')
 
+# Outbox delivery
+# 'thread' delivers from a background thread in each app process; 'off'
+# leaves the queue to `python email_utils.py --send`
+MAIL_SENDER = os.getenv('MAIL_SENDER', 'thread')
+# Emails sent over one SMTP connection
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', '50'))
+# Delivery attempts before an email is marked failed
+MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', '5'))
+# Seconds before the first retry; doubles with each attempt up to MAIL_RETRY_MAX
+MAIL_RETRY_BASE = float(os.getenv('MAIL_RETRY_BASE', '30'))
+MAIL_RETRY_MAX = float(os.getenv('MAIL_RETRY_MAX', '3600'))
+# Seconds between outbox checks when the sender isn't woken by a new email
+MAIL_POLL_INTERVAL = float(os.getenv('MAIL_POLL_INTERVAL', '10'))
+# Seconds after which an email claimed by a dead sender is claimed again
+MAIL_CLAIM_TIMEOUT = float(os.getenv('MAIL_CLAIM_TIMEOUT', '600'))
+
+
+# ============= OUTBOX =============
+
+def smtp_configured():
+    return bool(SMTP_USERNAME and SMTP_PASSWORD)
+
+
+def build_message(to_email, subject, html_body, text_body=None):
+    """Multipart message with an optional plain text version before the HTML."""
+    message = MIMEMultipart('alternative')
+    message['Subject'] = subject
+    message['From'] = f"{FROM_NAME} <{FROM_EMAIL}>"
+    message['To'] = to_email
+    
+    if text_body:
+        message.attach(MIMEText(text_body, 'plain'))
+    message.attach(MIMEText(html_body, 'html'))
+    return message
+
+
+def queue_email(to_email, subject, html_body, text_body=None, kind=None):
+    """
+    Queue an email in the outbox and wake this process's sender, if running.
+    
+    Returns:
+        bool: True if the email was queued, False otherwise
+    """
+    try:
+        message = build_message(to_email, subject, html_body, text_body)
+        db.enqueue_email(to_email, message.as_string(), kind)
+    except Exception as e:
+        logger.exception(f"Failed to queue {kind or 'email'} email: {str(e)}")
+        return False
+    sender.wake()
+    return True
+
+
+class ConsoleConnection:
+    """Stands in for an SMTP connection when no SMTP server is configured."""
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        message = message_from_string(msg)
+        text = next((part.get_payload(decode=True).decode('utf-8', 'replace')
+                     for part in message.walk() if part.get_content_type() == 'text/plain'), None)
+        print("\n" + "="*80)
+        print("📧 EMAIL SIMULATION (No SMTP configured)")
+        print("="*80)
+        print(f"To: {', '.join(to_addrs)}")
+        print(f"Subject: {make_header(decode_header(message['Subject']))}")
+        if text:
+            print(text)
+        print("="*80 + "\n")
+        return {}
+
+    def quit(self):
+        pass
+
+
+def open_connection():
+    """
+    Open an SMTP connection and log in.
+    
+    Returns:
+        smtplib.SMTP, or a ConsoleConnection when SMTP is not configured
+    """
+    if not smtp_configured():
+        return ConsoleConnection()
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+    try:
+        if SMTP_STARTTLS:
+            server.starttls()
+        server.login(SMTP_USERNAME, SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _close(server):
+    try:
+        server.quit()
+    except Exception:
+        pass
+
+
+class MailSender:
+    """
+    Delivers the email outbox in batches.
+    
+    Each batch goes out over one SMTP connection, so the connect, STARTTLS
+    and login round trips are paid once per batch rather than per email. A
+    server that can't be reached fails the rest of the batch at once; an
+    email the server refuses is retried alone, and a dropped connection is
+    reopened for the next email.
+    """
+
+    def __init__(self, batch_size=MAIL_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._pid = None
+
+    @property
+    def worker(self):
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        """Start the sender thread, once per process (so again after a fork)."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, name='mail-sender', daemon=True).start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                claimed = self.deliver_batch()
+            except Exception:
+                logger.exception("Mail sender batch failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                self._wake.wait(MAIL_POLL_INTERVAL)
+
+    def deliver_batch(self):
+        """
+        Claim and deliver one batch of due emails.
+        
+        Returns:
+            Number of emails claimed (delivered or rescheduled)
+        """
+        emails = db.claim_outbox_emails(self.worker, self.batch_size, stale_after=MAIL_CLAIM_TIMEOUT)
+        server = None
+        try:
+            for index, queued in enumerate(emails):
+                if server is None:
+                    try:
+                        server = open_connection()
+                    except Exception as e:
+                        for pending in emails[index:]:
+                            self._failed(pending, e)
+                        break
+                try:
+                    server.sendmail(FROM_EMAIL, [queued['to_email']], queued['message'])
+                except smtplib.SMTPRecipientsRefused as e:
+                    self._failed(queued, e, permanent=True)
+                except smtplib.SMTPResponseException as e:
+                    # The server answered (and sendmail reset the transaction),
+                    # so the connection is still usable
+                    self._failed(queued, e)
+                except Exception as e:
+                    self._failed(queued, e)
+                    _close(server)
+                    server = None
+                else:
+                    db.mark_email_sent(queued['id'])
+                    EMAILS_SENT.inc(kind=queued['kind'] or 'other', result='sent')
+        finally:
+            if server is not None:
+                _close(server)
+        if emails:
+            logger.info(f"Mail batch: {len(emails)} emails", extra={'emails': len(emails)})
+        return len(emails)
+
+    def _failed(self, queued, error, permanent=False):
+        kind = queued['kind'] or 'other'
+        if permanent or queued['attempts'] >= MAIL_MAX_ATTEMPTS:
+            db.mark_email_failed(queued['id'], str(error))
+            EMAILS_SENT.inc(kind=kind, result='failed')
+            logger.error(f"Giving up on {kind} email {queued['id']} after {queued['attempts']} attempts: {error}")
+        else:
+            delay = min(MAIL_RETRY_BASE * 2 ** (queued['attempts'] - 1), MAIL_RETRY_MAX)
+            db.mark_email_failed(queued['id'], str(error), retry_at=datetime.now() + timedelta(seconds=delay))
+            EMAILS_SENT.inc(kind=kind, result='retry')
+            logger.warning(f"{kind} email {queued['id']} failed, retrying in {delay:.0f}s: {error}")
+
+    def drain(self):
+        """Deliver batches until nothing is due. Returns the number of emails claimed."""
+        total = 0
+        while True:
+            claimed = self.deliver_batch()
+            total += claimed
+            if claimed < self.batch_size:
+                return total
+
+
+sender = MailSender()
+
+
+def start_sender():
+    """Start this process's background sender, unless MAIL_SENDER is 'off'."""
+    if MAIL_SENDER == 'thread':
+        sender.start()
+
+
+# ============= EMAILS =============
+
 def send_password_reset_email(to_email, reset_token, user_name=None):
     """
     Send password reset email with token link.
@@ -25,7 +271,7 @@ def send_password_reset_email(to_email, reset_token, user_name=None):
         user_name: Optional user name for personalization
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if the email was queued, False otherwise
     """
     
     # Create reset link (in production, use your actual domain)
@@ -145,42 +391,7 @@ def send_password_reset_email(to_email, reset_token, user_name=None):
     Empowering the Future with AI
     """
     
-    try:
-        # Create message
-        message = MIMEMultipart('alternative')
-        message['Subject'] = subject
-        message['From'] = f"{FROM_NAME} <{FROM_EMAIL}>"
-        message['To'] = to_email
-        
-        # Attach both plain text and HTML versions
-        part1 = MIMEText(text_body, 'plain')
-        part2 = MIMEText(html_body, 'html')
-        message.attach(part1)
-        message.attach(part2)
-        
-        # Send email
-        if SMTP_USERNAME and SMTP_PASSWORD:
-            # Use configured SMTP server
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USERNAME, SMTP_PASSWORD)
-                server.send_message(message)
-            print(f"✓ Password reset email sent to {to_email}")
-            return True
-        else:
-            # No SMTP configured - print to console for development
-            print("\n" + "="*80)
-            print("📧 EMAIL SIMULATION (No SMTP configured)")
-            print("="*80)
-            print(f"To: {to_email}")
-            print(f"Subject: {subject}")
-            print(f"\nReset Link: {reset_link}")
-            print("="*80 + "\n")
-            return True
-            
-    except Exception as e:
-        print(f"✗ Failed to send email: {str(e)}")
-        return False
+    return queue_email(to_email, subject, html_body, text_body, kind='password_reset')
 
 def send_welcome_email(to_email, user_name):
     """
@@ -191,7 +402,7 @@ def send_welcome_email(to_email, user_name):
         user_name: User's name
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if the email was queued, False otherwise
     """
     subject = "Welcome to Neuronix AI JobFlow! 🎉"
     
@@ -278,26 +489,123 @@ def send_welcome_email(to_email, user_name):
     </html>
     """
     
-    try:
-        message = MIMEMultipart('alternative')
-        message['Subject'] = subject
-        message['From'] = f"{FROM_NAME} <{FROM_EMAIL}>"
-        message['To'] = to_email
-        
-        part = MIMEText(html_body, 'html')
-        message.attach(part)
-        
-        if SMTP_USERNAME and SMTP_PASSWORD:
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USERNAME, SMTP_PASSWORD)
-                server.send_message(message)
-            print(f"✓ Welcome email sent to {to_email}")
-            return True
-        else:
-            print(f"📧 Welcome email simulated for {to_email}")
-            return True
-            
-    except Exception as e:
-        print(f"✗ Failed to send welcome email: {str(e)}")
-        return False
+    return queue_email(to_email, subject, html_body, kind='welcome')
+
+def send_job_alert_email(to_email, user_name, matches):
+    """
+    Send a saved-search alert listing newly found matching jobs.
+    
+    Args:
+        to_email: Recipient email address
+        user_name: Optional user name for personalization
+        matches: Matched jobs (job_title, company, location, url, match_score)
+    
+    Returns:
+        bool: True if the email was queued, False otherwise
+    """
+    count = len(matches)
+    subject = f"{count} new job{'s' if count != 1 else ''} matching your saved search - Neuronix AI JobFlow"
+    
+    greeting = f"Hello {user_name}," if user_name else "Hello,"
+    
+    job_items = "".join(
+        f"""
+                <div class="job">
+                    <strong><a href="{escape(job.get('url') or '#')}">{escape(job.get('job_title') or 'Untitled')}</a></strong>
+                    <span class="score">{job.get('match_score', 0):.0f}% match</span><br>
+                    {escape(job.get('company') or '')} &middot; {escape(job.get('location') or '')}
+                </div>"""
+        for job in matches
+    )
+    
+    html_body = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{
+                font-family: Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+            }}
+            .container {{
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+            }}
+            .header {{
+                background: linear-gradient(to right, #6366f1, #8b5cf6);
+                color: white;
+                padding: 30px;
+                text-align: center;
+                border-radius: 8px 8px 0 0;
+            }}
+            .content {{
+                background: #f9fafb;
+                padding: 30px;
+                border-radius: 0 0 8px 8px;
+            }}
+            .job {{
+                background: white;
+                padding: 15px;
+                margin: 10px 0;
+                border-radius: 6px;
+                border-left: 4px solid #6366f1;
+            }}
+            .score {{
+                float: right;
+                color: #6366f1;
+                font-weight: bold;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🔔 New Jobs For You</h1>
+            </div>
+            <div class="content">
+                <p>{escape(greeting)}</p>
+                
+                <p>We found new jobs matching one of your saved searches:</p>
+                {job_items}
+                
+                <p>Manage your alerts from your search history at <a href="http://localhost:5000/src/history.html">Neuronix AI JobFlow</a>.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    text_lines = "\n".join(
+        f"    - {job.get('job_title')} at {job.get('company')} ({job.get('match_score', 0):.0f}% match): {job.get('url')}"
+        for job in matches
+    )
+    text_body = f"""
+    {greeting}
+    
+    We found new jobs matching one of your saved searches:
+    
+{text_lines}
+    
+    © 2025 Neuronix AI Solutions
+    """
+    
+    return queue_email(to_email, subject, html_body, text_body, kind='job_alert')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Email outbox")
+    parser.add_argument('--send', action='store_true', help="Deliver queued email now")
+    parser.add_argument('--stats', action='store_true', help="Count queued email by status")
+    args = parser.parse_args()
+
+    from utils.logging_config import configure_logging
+    configure_logging()
+    db.ensure_database()
+    if args.send:
+        print(f"Processed {sender.drain()} queued emails")
+    if args.stats:
+        print(db.get_outbox_stats())
+    if not (args.send or args.stats):
+        parser.print_help()
@@ -2,14 +2,17 @@
 Adzuna Job API Integration
 Official API for fetching real job listings from Adzuna.
 """
+import logging
 import requests
 import os
 from typing import List, Dict, Optional
 
+logger = logging.getLogger('jobflow.fetchers')
+
 class AdzunaFetcher:
     """Fetches job listings from Adzuna API"""
     
-    BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+    BASE_URL = os.getenv('ADZUNA_API_URL', "https://api.adzuna.com/v1/api/jobs")
     
     def __init__(self, app_id: Optional[str] = None, app_key: Optional[str] = None):
         """
@@ -77,10 +80,10 @@ class AdzunaFetcher:
             return jobs
             
         except requests.exceptions.RequestException as e:
-            print(f"Adzuna API Error: {e}")
+            logger.warning(f"Adzuna API Error: {e}", extra={'platform': 'Adzuna', 'error_class': type(e).__name__})
             return []
         except Exception as e:
-            print(f"Error processing Adzuna results: {e}")
+            logger.warning(f"Error processing Adzuna results: {e}", extra={'platform': 'Adzuna', 'error_class': type(e).__name__})
             return []
     
     def _transform_job(self, raw_job: Dict) -> Dict:
@@ -180,5 +183,5 @@ def fetch_jobs(query: str, location: str = "us", max_results: int = 20) -> List[
         jobs = fetcher.search_jobs(query, location, results_per_page=max_results)
         return jobs
     except Exception as e:
-        print(f"Error fetching jobs: {e}")
+        logger.warning(f"Error fetching jobs: {e}", extra={'platform': 'Adzuna', 'error_class': type(e).__name__})
         return []
@@ -0,0 +1,283 @@
+"""
+Conditional Feed Fetching
+GET JSON job board feeds with the validators (ETag / Last-Modified) of the
+last response, so refreshing a feed that hasn't changed costs a 304 with no
+body and no parsing: the parsed feed from the previous fetch is reused.
+
+Validators and the compressed body are stored per endpoint in the
+feed_cache table, so they survive restarts and are shared by workers; the
+body is only read back after a 304. Parsed feeds are also kept in memory
+per process. Responses are requested with compression (gzip/deflate, and
+brotli when the brotli package is installed). Callers must not modify the
+returned data, which is shared.
+
+stream_json_items() is the streaming variant for large feeds: it yields
+the listings of the feed as they are parsed from the body.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from fetchers.json_stream import iter_json_items
+from utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger('jobflow.fetchers')
+
+# Parsed feeds kept in memory per process
+FEED_CACHE_SIZE = int(os.getenv('FEED_CACHE_SIZE', '32'))
+# Bytes read from the network per step when streaming a feed
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class CachedFeed(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    data: Any
+
+
+_memory_cache = OrderedDict()
+
+
+def feed_key(url: str, params: Optional[Dict] = None) -> str:
+    """Cache key for an endpoint and its query parameters."""
+    query = json.dumps(sorted((params or {}).items()), default=str)
+    return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+
+def _remember(key, feed):
+    _memory_cache[key] = feed
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > FEED_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+def _stored_validators(key) -> Optional[Dict]:
+    import database as db
+    try:
+        return db.get_feed_validators(key)
+    except Exception as e:
+        # The cache must never fail a fetch
+        logger.debug(f"Feed cache unavailable: {e}")
+        return None
+
+
+def _stored_body(key) -> Optional[bytes]:
+    """The stored compressed body, read only once the server has answered 304."""
+    import database as db
+    try:
+        return db.get_feed_body(key)
+    except Exception as e:
+        logger.debug(f"Feed cache unavailable: {e}")
+        return None
+
+
+def _store_feed(key, url, feed, compressed_body):
+    import database as db
+    try:
+        db.save_feed_cache(key, url, feed.etag, feed.last_modified, compressed_body)
+    except Exception as e:
+        logger.debug(f"Feed cache not saved: {e}")
+
+
+def _request_headers(headers, validators):
+    """Compression, the caller's headers and the cached response's validators."""
+    request_headers = {'Accept-Encoding': ACCEPT_ENCODING, **(headers or {})}
+    if validators is not None:
+        if validators['etag']:
+            request_headers['If-None-Match'] = validators['etag']
+        if validators['last_modified']:
+            request_headers['If-Modified-Since'] = validators['last_modified']
+    return request_headers
+
+
+def fetch_json(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+               timeout: float = 15, feed: str = 'feed') -> Any:
+    """
+    GET a JSON feed, revalidating the previous response if there is one.
+
+    Args:
+        url: Feed endpoint
+        params: Query parameters (part of the cache key)
+        headers: Extra request headers
+        timeout: Request timeout in seconds
+        feed: Name for logs and metrics
+
+    Returns:
+        Parsed JSON, from the response or, on 304 Not Modified, from the cache
+
+    Raises:
+        requests.RequestException: The request failed or returned an error status
+    """
+    key = feed_key(url, params)
+    cached = _memory_cache.get(key)
+    parsed = cached is not None
+    if cached is None:
+        # Only the validators: the body is read after a 304, not on every refresh
+        stored = _stored_validators(key)
+        if stored is not None:
+            cached = CachedFeed(stored['etag'], stored['last_modified'], None)
+
+    validators = cached._asdict() if cached is not None else None
+    response = requests.get(url, params=params, headers=_request_headers(headers, validators), timeout=timeout)
+
+    if response.status_code == 304 and cached is not None:
+        if not parsed:
+            # First revalidation in this process: parse the stored body once
+            body = _stored_body(key)
+            if body is not None:
+                cached = cached._replace(data=json.loads(zlib.decompress(body)))
+                parsed = True
+        if parsed:
+            _remember(key, cached)
+            CACHE_REQUESTS.inc(cache='feed', result='hit')
+            logger.debug(f"{feed} feed not modified")
+            return cached.data
+        # The stored body went away since its validators were read
+        response = requests.get(url, params=params, headers=_request_headers(headers, None), timeout=timeout)
+
+    response.raise_for_status()
+    data = response.json()
+    CACHE_REQUESTS.inc(cache='feed', result='miss')
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        fresh = CachedFeed(etag, last_modified, data)
+        _remember(key, fresh)
+        _store_feed(key, url, fresh, zlib.compress(response.content))
+    return data
+
+
+def stream_json_items(url: str, path: Sequence[str] = (), params: Optional[Dict] = None,
+                      headers: Optional[Dict] = None, timeout: float = 15,
+                      feed: str = 'feed') -> Iterator[Any]:
+    """
+    GET a JSON feed and iterate the items of one array in it as they arrive.
+
+    The request is made (and revalidated) when this is called; items are
+    parsed lazily, so a caller that stops early never parses the rest. A
+    304 streams the stored body the same way. After an early stop on a
+    fresh response, the rest of the body is downloaded (not parsed) in the
+    background so its validators can be stored for the next refresh.
+
+    Args:
+        url: Feed endpoint
+        path: Object keys leading to the array; () for a top-level array
+        params, headers, timeout, feed: As for fetch_json()
+
+    Returns:
+        Iterator over the array's items; close it (or use contextlib.closing)
+        when not reading it to the end, so the connection is released
+
+    Raises:
+        requests.RequestException: The request failed or returned an error status
+    """
+    key = feed_key(url, params)
+    validators = _stored_validators(key)
+    response = requests.get(url, params=params, headers=_request_headers(headers, validators),
+                            timeout=timeout, stream=True)
+
+    if response.status_code == 304 and validators is not None:
+        response.close()
+        body = _stored_body(key)
+        if body is not None:
+            CACHE_REQUESTS.inc(cache='feed', result='hit')
+            logger.debug(f"{feed} feed not modified")
+            return iter_json_items(_decompressed(body), path)
+        # The stored body went away since its validators were read
+        response = requests.get(url, params=params, headers=_request_headers(headers, None),
+                                timeout=timeout, stream=True)
+
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+    CACHE_REQUESTS.inc(cache='feed', result='miss')
+    return _ResponseItems(_stream_response(key, url, response, path), response)
+
+
+class _ResponseItems:
+    """
+    Items of a fresh response. Closing (or dropping) the iterator closes the
+    response even if it was never iterated, which a generator can't do: one
+    that never started never runs its cleanup.
+    """
+
+    def __init__(self, items, response):
+        self._items = items
+        self._response = response
+        self._started = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._started = True
+        return next(self._items)
+
+    def close(self):
+        self._items.close()
+        if not self._started:
+            self._response.close()
+
+    def __del__(self):
+        self.close()
+
+
+def _decompressed(body, chunk_size=STREAM_CHUNK_SIZE):
+    decompressor = zlib.decompressobj()
+    for start in range(0, len(body), chunk_size):
+        yield decompressor.decompress(body[start:start + chunk_size])
+    yield decompressor.flush()
+
+
+def _stream_response(key, url, response, path):
+    """Items of a fresh response, keeping a compressed copy of the body for the cache."""
+    feed = CachedFeed(response.headers.get('ETag'), response.headers.get('Last-Modified'), None)
+    cacheable = bool(feed.etag or feed.last_modified)
+    compressor = zlib.compressobj()
+    compressed = []
+    body = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+
+    def tee():
+        for chunk in body:
+            if cacheable:
+                compressed.append(compressor.compress(chunk))
+            yield chunk
+
+    def finish():
+        try:
+            for _ in tee():
+                pass
+            compressed.append(compressor.flush())
+            _store_feed(key, url, feed, b''.join(compressed))
+        except Exception as e:
+            logger.debug(f"Feed body not cached: {e}")
+        finally:
+            response.close()
+
+    try:
+        yield from iter_json_items(tee(), path)
+    except GeneratorExit:
+        if not cacheable:
+            response.close()
+        else:
+            # Stopped early: finish the download off the request path
+            threading.Thread(target=finish, name='feed-download', daemon=True).start()
+        raise
+    except BaseException:
+        response.close()
+        raise
+    if cacheable:
+        finish()
+    else:
+        response.close()
@@ -0,0 +1,148 @@
+"""
+Feed Diffing
+Remember what each raw board listing was turned into, so refreshing a feed
+only cleans, extracts skills from and validates the listings that are new
+or changed since they were last seen. Steady-state scraping work follows
+feed churn rather than feed size.
+
+Listings are keyed by platform and upstream ID and carry a content hash;
+a listing whose content changed under the same ID is processed again.
+Only the cheap keyword filter still looks at every listing. Results are
+kept in memory per process, least recently seen evicted first.
+"""
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from utils.metrics import CACHE_REQUESTS
+from utils.query_matcher import QueryMatcher
+from validators.job_validator import record_validation_metrics
+
+# Processed listings kept in memory per process
+LISTING_CACHE_SIZE = int(os.getenv('LISTING_CACHE_SIZE', '5000'))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def content_hash(listing: Dict) -> int:
+    """
+    Hash of a listing's content, valid within this process.
+
+    Strings cache their hash, so re-checking the listings of a feed reused
+    after a 304 costs next to nothing. Key order counts: a board that
+    reorders fields just has its listings processed again.
+    """
+    return hash(_freeze(listing))
+
+
+class ListingEntry:
+    """What one raw listing has been turned into so far."""
+
+    __slots__ = ('content_hash', 'job', 'valid', 'issues')
+
+    def __init__(self, content_hash):
+        self.content_hash = content_hash
+        self.job = None  # normalized job dict, once built
+        self.valid = None  # validation result, once validated
+        self.issues = ()  # validation issues, replayed into the metrics on reuse
+
+
+class ListingCache:
+    """Processed listings by (platform, upstream ID)."""
+
+    def __init__(self, max_size: int = LISTING_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def entry(self, platform: str, listing: Dict, id_field: str = 'id') -> ListingEntry:
+        """The listing's entry; a fresh one if the listing is new or changed."""
+        digest = content_hash(listing)
+        upstream_id = listing.get(id_field)
+        key = (platform, upstream_id if upstream_id not in (None, '') else digest)
+
+        entry = self.entries.get(key)
+        if entry is None or entry.content_hash != digest:
+            entry = ListingEntry(digest)
+            self.entries[key] = entry
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(key)
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+
+
+processed_listings = ListingCache()
+
+
+def _copy_job(job: Dict) -> Dict:
+    """A copy of a cached job whose lists (skills) and dicts aren't shared with the cache."""
+    return {key: value.copy() if isinstance(value, (list, dict)) else value for key, value in job.items()}
+
+
+def process_listings(platform: str, listings, build: Callable[[Dict], Dict],
+                     validate: Optional[Callable[[Dict], Any]] = None,
+                     keywords=None, search_fields: Optional[Callable[[Dict], Sequence]] = None,
+                     limit: Optional[int] = None, id_field: str = 'id',
+                     cache: Optional[ListingCache] = None):
+    """
+    Turn raw listings into validated jobs, reusing earlier results.
+
+    Args:
+        platform: Board name, part of the cache key
+        listings: Raw listings, in feed order
+        build: Listing -> normalized job dict (cleaning and skill extraction)
+        validate: Job -> (is_valid, issues); None accepts every job. Reused
+            results are counted in the validator metrics like fresh ones
+        keywords: QueryMatcher (or keyword list) a listing must match to be kept
+        search_fields: Listing -> fields the keywords are matched against,
+            cheapest first (see QueryMatcher.matches)
+        limit: Stop after this many valid jobs
+        id_field: Listing field holding the upstream ID
+        cache: Listing cache to use (default: the process-wide one)
+
+    Returns:
+        List of job dicts (copies, safe to modify)
+    """
+    cache = processed_listings if cache is None else cache
+    query = None if keywords is None else QueryMatcher.of(keywords)
+    jobs = []
+    hits = misses = 0
+
+    for listing in listings:
+        if limit is not None and len(jobs) >= limit:
+            break
+        if query is not None and not query.matches(search_fields(listing)):
+            continue
+
+        entry = cache.entry(platform, listing, id_field)
+        if entry.job is None:
+            entry.job = build(listing)
+            misses += 1
+        else:
+            hits += 1
+        if validate is not None:
+            if entry.valid is None:
+                is_valid, issues = validate(entry.job)
+                entry.valid, entry.issues = bool(is_valid), tuple(issues)
+            else:
+                # The validator records its own metrics; count reused results too
+                record_validation_metrics(entry.issues)
+        if validate is None or entry.valid:
+            jobs.append(_copy_job(entry.job))
+
+    if hits:
+        CACHE_REQUESTS.inc(hits, cache='listing', result='hit')
+    if misses:
+        CACHE_REQUESTS.inc(misses, cache='listing', result='miss')
+    return jobs
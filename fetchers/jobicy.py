@@ -2,13 +2,18 @@
 Jobicy API Integration
 Fetcher for remote jobs from Jobicy.
 """
-import requests
+import logging
+import os
 from typing import List, Dict, Optional
 
+from fetchers.feed_cache import fetch_json
+
+logger = logging.getLogger('jobflow.fetchers')
+
 class JobicyFetcher:
     """Fetches remote job listings from Jobicy API"""
     
-    BASE_URL = "https://jobicy.com/api/v2/remote-jobs"
+    BASE_URL = os.getenv('JOBICY_API_URL', "https://jobicy.com/api/v2/remote-jobs")
     
     def search_jobs(
         self,
@@ -39,10 +44,7 @@ class JobicyFetcher:
             if query:
                 params['tag'] = query # Using tag for query as it's most similar
                 
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = fetch_json(self.BASE_URL, params=params, timeout=10, feed='jobicy')
             
             if not data.get('success'):
                 return []
@@ -58,7 +60,7 @@ class JobicyFetcher:
             return jobs
             
         except Exception as e:
-            print(f"Error fetching Jobicy jobs: {e}")
+            logger.warning(f"Error fetching Jobicy jobs: {e}", extra={'platform': 'Jobicy', 'error_class': type(e).__name__})
             return []
     
     def _transform_job(self, raw_job: Dict) -> Dict:
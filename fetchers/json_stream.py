@@ -0,0 +1,122 @@
+"""
+Streaming JSON Arrays
+Yield the items of a JSON array as the document arrives, instead of
+loading and parsing the whole document first. Job board feeds are one big
+array of listings (at the top level, or under a key such as "jobs"), and a
+search usually needs only the first matching few.
+
+Each item is decoded with the standard library's C scanner
+(JSONDecoder.raw_decode), so parsing speed matches json.loads; only the
+array and object framing around the items is walked here.
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Sequence
+
+# Consumed text is dropped from the buffer once this much has piled up
+_COMPACT_AT = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789+-.eE'
+
+
+class _Buffer:
+    """Text decoded so far from a byte stream, with a read position."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; False at the end of the stream."""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_AT:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self.text += self.decoder.decode(chunk)
+                return True
+        self.text += self.decoder.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed), or '' at the end."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the JSON stream")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number cut by the end of the buffer ("12" of "125", "1.5" of
+            # "1.5e3") decodes without error; read on until something follows it
+            if (isinstance(value, (int, float)) and not self.eof
+                    and (end == len(self.text) or self.text[end] in _NUMBER_CHARS)
+                    and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(chunks: Iterable[bytes], path: Sequence[str] = ()) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array from a stream of bytes.
+
+    Args:
+        chunks: UTF-8 encoded document, in pieces of any size
+        path: Object keys leading to the array; () for a top-level array.
+            A missing key yields nothing.
+
+    Raises:
+        ValueError: The document is not shaped as path describes, or is
+            not valid JSON
+    """
+    buffer = _Buffer(chunks)
+    decoder = json.JSONDecoder()
+
+    for key in path:
+        buffer.expect('{')
+        while True:
+            if buffer.peek() == '}':
+                return
+            name = buffer.value(decoder)
+            buffer.expect(':')
+            if name == key:
+                break
+            buffer.value(decoder)  # a value before the one we want
+            if buffer.peek() == ',':
+                buffer.pos += 1
+
+    buffer.expect('[')
+    if buffer.peek() == ']':
+        return
+    while True:
+        yield buffer.value(decoder)
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or ']' at offset {buffer.pos - 1} of the JSON stream")
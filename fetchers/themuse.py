@@ -2,9 +2,12 @@
 The Muse API Integration
 Fetcher for job listings from The Muse.
 """
+import logging
 import requests
 from typing import List, Dict, Optional
 
+logger = logging.getLogger('jobflow.fetchers')
+
 class TheMuseFetcher:
     """Fetches job listings from The Muse API"""
     
@@ -51,7 +54,7 @@ class TheMuseFetcher:
             return jobs
             
         except Exception as e:
-            print(f"Error fetching The Muse jobs: {e}")
+            logger.warning(f"Error fetching The Muse jobs: {e}", extra={'platform': 'TheMuse', 'error_class': type(e).__name__})
             return []
     
     def _transform_job(self, raw_job: Dict) -> Dict:
@@ -2,16 +2,19 @@
 Wuzzuf Job Scraper
 Scrapes jobs from Wuzzuf.net (Egypt's leading job site).
 """
+import logging
+import os
 import requests
-from bs4 import BeautifulSoup
 from typing import List, Dict
 import time
 from urllib.parse import quote_plus
 
+logger = logging.getLogger('jobflow.fetchers')
+
 class WuzzufFetcher:
     """Scrapes job listings from Wuzzuf"""
     
-    BASE_URL = "https://wuzzuf.net/search/jobs/"
+    BASE_URL = os.getenv('WUZZUF_SEARCH_URL', "https://wuzzuf.net/search/jobs/")
     
     def __init__(self):
         self.headers = {
@@ -32,6 +35,8 @@ class WuzzufFetcher:
         Returns:
             List of job dictionaries
         """
+        from bs4 import BeautifulSoup
+        
         jobs = []
         page = 0
         
@@ -49,7 +54,7 @@ class WuzzufFetcher:
                 h2_tags = soup.find_all('h2')
                 
                 if not h2_tags:
-                    print(f"No h2 tags found on Wuzzuf page {page}")
+                    logger.debug(f"No h2 tags found on Wuzzuf page {page}", extra={'platform': 'Wuzzuf'})
                     break
                     
                 found_on_page = 0
@@ -84,7 +89,7 @@ class WuzzufFetcher:
                 time.sleep(1) # Be polite
                 
             except Exception as e:
-                print(f"Error scraping Wuzzuf: {e}")
+                logger.warning(f"Error scraping Wuzzuf: {e}", extra={'platform': 'Wuzzuf', 'error_class': type(e).__name__})
                 break
                 
         return jobs
@@ -0,0 +1,53 @@
+"""
+Gunicorn Configuration
+Loaded automatically by `gunicorn server:app` from the project root.
+
+By default each worker imports the app and warms up after it forks. With
+--preload (or PRELOAD=1) the master imports the app and warms up once
+before forking, so workers share the matcher, parsers and (with
+CATALOG_MATCHING=ann) the catalog ANN snapshot copy-on-write, and new
+workers serve their first request warm. Preloaded code is not reloaded on
+HUP; restart the master to deploy.
+
+Environment:
+    PRELOAD: 1 to load and warm the app in the master (default 0)
+    WARMUP: 0 to skip warmup entirely (default 1)
+"""
+import gc
+import os
+
+preload_app = os.getenv('PRELOAD', '0') == '1'
+
+def _warmup_enabled():
+    return os.getenv('WARMUP', '1') != '0'
+
+def on_starting(server):
+    """Drop metric shards left by a previous run, so counters start from zero."""
+    from utils import metrics
+    metrics.clear_shards()
+
+def child_exit(server, worker):
+    """Fold an exited worker's metric shard into the retired totals."""
+    from utils import metrics
+    metrics.retire_shards(worker.pid)
+
+def when_ready(server):
+    """Preload mode: warm the master once, then freeze its heap before workers fork."""
+    if not server.cfg.preload_app:
+        return
+    if _warmup_enabled():
+        from server import warmup
+        from utils import metrics
+        warmup()
+        metrics.reset()  # warmup is not user traffic
+    # Objects in the permanent generation are skipped by the cyclic GC, so
+    # collections in a worker don't write to (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+def post_worker_init(worker):
+    """Import heavy dependencies in each worker before it takes traffic."""
+    if worker.cfg.preload_app or not _warmup_enabled():
+        return
+    from server import warmup
+    warmup()
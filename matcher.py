@@ -1,10 +1,11 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import pandas as pd
+from utils.ranking import top_k_indices
+from utils.metrics import MATCHER_SECONDS
 
-def match_jobs(user_profile, jobs):
+@MATCHER_SECONDS.time(matcher='basic')
+def match_jobs(user_profile, jobs, top_k=None):
     """
     Matches user profile against a list of jobs using TF-IDF and Cosine Similarity.
+    Only the top_k best jobs are returned when top_k is given.
     """
     if not jobs:
         return []
@@ -31,8 +32,17 @@ def match_jobs(user_profile, jobs):
         user_doc += " " + user_profile['keywords']
 
     if not user_doc.strip():
-        # If no user info, just return jobs as is
-        return jobs
+        # If no user info, just return jobs as is (features stay internal)
+        unranked_jobs = []
+        for job in (jobs[:top_k] if top_k is not None else jobs):
+            job = job.copy()
+            job.pop('features', None)
+            unranked_jobs.append(job)
+        return unranked_jobs
+
+    # sklearn is imported on first use to keep worker start-up fast
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
 
     # 3. Vectorization
     documents = [user_doc] + job_docs
@@ -47,14 +57,12 @@ def match_jobs(user_profile, jobs):
     
     similarity_scores = cosine_similarity(user_vector, job_vectors).flatten()
     
-    # 5. Rank Jobs
+    # 5. Rank Jobs (select the top K before copying any job)
     ranked_jobs = []
-    for i, score in enumerate(similarity_scores):
+    for i in top_k_indices(similarity_scores, top_k):
         job = jobs[i].copy()
-        job['match_score'] = round(score * 100, 1) # Convert to percentage
+        job.pop('features', None)
+        job['match_score'] = round(float(similarity_scores[i]) * 100, 1) # Convert to percentage
         ranked_jobs.append(job)
-        
-    # Sort by score descending
-    ranked_jobs.sort(key=lambda x: x['match_score'], reverse=True)
     
     return ranked_jobs
@@ -1,8 +1,51 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import logging
+import os
+import threading
+import time
 import numpy as np
-import re
-from collections import Counter
+from utils.job_features import (
+    attach_job_features,
+    extract_skill_ids,
+    get_vectorizer,
+    normalize_skill,
+    term_vectors_to_matrix,
+)
+from utils.experience import (
+    LEVEL_DISTANCE_SCORES,
+    LEVEL_RANKS,
+    NEUTRAL_SCORE,
+    classify_experience,
+    level_match_matrix,
+    level_match_scores,
+    parse_years,
+    years_to_level,
+)
+from utils.ranking import top_k_indices
+from utils.job_index import InvertedJobIndex, profile_index_terms
+from utils.ann_index import JobVectorIndex
+from utils.tracing import span, traced
+from utils.metrics import MATCHER_SECONDS
+
+logger = logging.getLogger('jobflow.matcher')
+
+# Stored catalog jobs scored alongside each search's fresh jobs:
+#   index - jobs sharing a skill or title term with the user (default)
+#   ann   - the user's approximate nearest neighbours by job text
+#   off   - none; only the freshly scraped jobs are ranked
+CATALOG_MATCHING = os.getenv('CATALOG_MATCHING', 'index').lower()
+# Catalog candidates scored per search
+CATALOG_CANDIDATES = int(os.getenv('CATALOG_CANDIDATES', '500'))
+# Seconds before the ANN snapshot of the catalog is rebuilt (ann mode)
+CATALOG_ANN_MAX_AGE = float(os.getenv('CATALOG_ANN_MAX_AGE', '3600'))
+
+# User context fields each score component depends on; a profile edit only
+# recomputes the components whose inputs changed
+COMPONENT_INPUTS = {
+    'skill_match': ('skills',),
+    'text_similarity': ('doc',),
+    'experience_match': ('experience',),
+    'title_match': ('job_title',),
+}
 
 class EnhancedJobMatcher:
     """
@@ -21,6 +64,14 @@ class EnhancedJobMatcher:
             'related_match': 1.0     # Related/similar skill
         }
         
+        # Weights of the score components in the final match score
+        self.score_weights = {
+            'skill_match': 0.50,
+            'text_similarity': 0.30,
+            'experience_match': 0.20
+        }
+        self.title_boost = 1.15  # 15% boost when the desired title appears in the job title
+        
         # Common skill synonyms and related terms
         self.skill_synonyms = {
             'javascript': ['js', 'ecmascript', 'node', 'nodejs'],
@@ -36,31 +87,7 @@ class EnhancedJobMatcher:
         
     def extract_skills(self, text):
         """Extract skills from text using pattern matching"""
-        if not text:
-            return []
-            
-        text_lower = text.lower()
-        skills = []
-        
-        # Common programming languages
-        languages = ['python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php', 'go', 'rust', 
-                    'typescript', 'swift', 'kotlin', 'scala', 'r', 'matlab']
-        
-        # Frameworks and libraries
-        frameworks = ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 
-                     'fastapi', 'laravel', 'rails', 'nextjs', 'gatsby', 'svelte']
-        
-        # Tools and technologies
-        tools = ['docker', 'kubernetes', 'git', 'jenkins', 'aws', 'azure', 'gcp', 
-                'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch']
-        
-        all_keywords = languages + frameworks + tools
-        
-        for keyword in all_keywords:
-            if keyword in text_lower:
-                skills.append(keyword)
-                
-        return list(set(skills))
+        return extract_skill_ids(text)
     
     def calculate_skill_match_score(self, user_skills, job_skills):
         """Calculate skill match score with weighted importance"""
@@ -73,119 +100,235 @@ class EnhancedJobMatcher:
         if not user_skills_lower or not job_skills_lower:
             return 0.0
         
-        score = 0.0
+        score = sum(self.job_skill_weight(job_skill, user_skills_lower) for job_skill in job_skills_lower)
         max_possible_score = len(job_skills_lower) * self.skill_weights['exact_match']
         
-        for job_skill in job_skills_lower:
-            # Exact match
-            if job_skill in user_skills_lower:
-                score += self.skill_weights['exact_match']
-                continue
-            
-            # Partial match
-            partial_match = False
-            for user_skill in user_skills_lower:
-                if job_skill in user_skill or user_skill in job_skill:
-                    score += self.skill_weights['partial_match']
-                    partial_match = True
-                    break
-            
-            if partial_match:
-                continue
-            
-            # Synonym/related match
-            for key, synonyms in self.skill_synonyms.items():
-                if job_skill in synonyms or job_skill == key:
-                    for user_skill in user_skills_lower:
-                        if user_skill in synonyms or user_skill == key:
-                            score += self.skill_weights['related_match']
-                            break
-        
         # Normalize to 0-100
         return min(100, (score / max_possible_score * 100)) if max_possible_score > 0 else 0.0
     
-    def calculate_experience_match(self, user_experience, job_description):
-        """Match experience level from job description"""
-        if not job_description:
-            return 50.0  # Neutral score if no description
-            
-        job_desc_lower = job_description.lower()
-        
-        # Extract experience requirements from job description
-        experience_patterns = {
-            'entry': ['entry level', 'junior', '0-2 years', 'graduate', 'intern'],
-            'mid': ['mid level', '2-5 years', '3-5 years', 'intermediate'],
-            'senior': ['senior', '5+ years', '5-10 years', 'expert', 'lead'],
-            'principal': ['principal', 'staff', '10+ years', 'architect']
-        }
+    def job_skill_weight(self, job_skill, user_skills_lower):
+        """Credit one (lowercase) job skill earns against the user's skills"""
+        # Exact match
+        if job_skill in user_skills_lower:
+            return self.skill_weights['exact_match']
         
-        job_level = 'mid'  # Default
-        for level, patterns in experience_patterns.items():
-            if any(pattern in job_desc_lower for pattern in patterns):
-                job_level = level
-                break
+        # Partial match
+        for user_skill in user_skills_lower:
+            if job_skill in user_skill or user_skill in job_skill:
+                return self.skill_weights['partial_match']
         
-        # Parse user experience (assuming it's a number of years or string)
-        try:
-            if isinstance(user_experience, (int, float)):
-                years = user_experience
-            elif isinstance(user_experience, str):
-                # Extract number from string like "5 years" or "5"
-                match = re.search(r'\d+', user_experience)
-                years = int(match.group()) if match else 0
+        # Synonym/related match
+        score = 0.0
+        for key, synonyms in self.skill_synonyms.items():
+            if job_skill in synonyms or job_skill == key:
+                for user_skill in user_skills_lower:
+                    if user_skill in synonyms or user_skill == key:
+                        score += self.skill_weights['related_match']
+                        break
+        return score
+    
+    def calculate_experience_match(self, user_experience, job_description, job_level=None):
+        """Match experience level from job description (or a precomputed level)"""
+        if job_level is None:
+            if not job_description:
+                return NEUTRAL_SCORE  # Neutral score if no description
+            job_level = classify_experience(job_description)
+        
+        user_rank = LEVEL_RANKS[years_to_level(parse_years(user_experience))]
+        job_rank = LEVEL_RANKS.get(job_level, LEVEL_RANKS['mid'])
+        
+        return LEVEL_DISTANCE_SCORES[min(abs(user_rank - job_rank), 3)]
+    
+    def calculate_text_similarities(self, user_doc, job_term_vectors):
+        """Cosine similarity between the user document and precomputed job vectors"""
+        if not user_doc.strip() or not job_term_vectors:
+            return np.zeros(len(job_term_vectors))
+        
+        user_vector = get_vectorizer().transform([user_doc])
+        job_matrix = term_vectors_to_matrix(job_term_vectors)
+        
+        # Both sides are L2-normalized, so the dot product is the cosine
+        similarities = (job_matrix @ user_vector.T).toarray().ravel()
+        return np.clip(similarities, 0.0, 1.0) * 100  # Convert to percentage
+    
+    @traced('match.user_context')
+    def build_user_context(self, user_profile):
+        """Derive everything the scoring needs from the user profile, once per request"""
+        user_skills = []
+        if 'skills' in user_profile:
+            if isinstance(user_profile['skills'], list):
+                user_skills = user_profile['skills']
             else:
-                years = 0
-        except:
-            years = 0
-        
-        # Determine user level based on years
-        if years < 2:
-            user_level = 'entry'
-        elif years < 5:
-            user_level = 'mid'
-        elif years < 10:
-            user_level = 'senior'
-        else:
-            user_level = 'principal'
-        
-        # Calculate match score
-        level_hierarchy = {'entry': 0, 'mid': 1, 'senior': 2, 'principal': 3}
-        user_rank = level_hierarchy.get(user_level, 1)
-        job_rank = level_hierarchy.get(job_level, 1)
-        
-        # Perfect match = 100, one level off = 75, two levels = 50, three levels = 25
-        diff = abs(user_rank - job_rank)
-        if diff == 0:
-            return 100.0
-        elif diff == 1:
-            return 75.0
-        elif diff == 2:
-            return 50.0
-        else:
-            return 25.0
+                user_skills = [s.strip() for s in str(user_profile['skills']).split(',')]
+        
+        # JSON nulls from the form, chat and rerank routes count as empty
+        user_job_title = user_profile.get('job_title') or ''
+        user_keywords = user_profile.get('keywords') or ''
+        
+        # Build user document for text matching
+        user_doc = f"{user_job_title} {' '.join(user_skills)} {user_keywords}"
+        
+        # Also extract skills from user document
+        extracted_user_skills = self.extract_skills(user_doc)
+        all_user_skills = sorted({normalize_skill(s) for s in user_skills if s} | set(extracted_user_skills))
+        
+        return {
+            'doc': user_doc,
+            'skills': all_user_skills,
+            'experience': user_profile.get('experience', 0),
+            'job_title': user_job_title,
+            'index_terms': profile_index_terms(all_user_skills, f"{user_job_title} {user_keywords}"),
+        }
     
-    def calculate_text_similarity(self, user_doc, job_doc):
-        """Calculate TF-IDF cosine similarity between user profile and job"""
-        if not user_doc.strip() or not job_doc.strip():
-            return 0.0
-            
-        try:
-            documents = [user_doc, job_doc]
-            tfidf = TfidfVectorizer(stop_words='english', max_features=500)
-            tfidf_matrix = tfidf.fit_transform(documents)
-            
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return similarity * 100  # Convert to percentage
-        except:
-            return 0.0
+    @traced('match.candidates')
+    def retrieve_candidates(self, user_context, jobs, budget):
+        """
+        Narrow jobs to those sharing a skill or title term with the user.
+        
+        Returns:
+            The candidate jobs, best term overlap first, at most budget of them.
+            All jobs are kept when the profile has no index terms.
+        """
+        if not user_context['index_terms']:
+            return jobs
+        
+        attach_job_features(jobs)
+        index = InvertedJobIndex.from_jobs(jobs)
+        return [jobs[i] for i in index.candidates(user_context['index_terms'], budget)]
+    
+    def score_components(self, user_context, jobs, only=None):
+        """
+        Compute score components for a list of jobs.
+        
+        Args:
+            only: Names of the components to compute (default: all of
+                COMPONENT_INPUTS)
+        
+        Returns:
+            Dict of NumPy arrays aligned with jobs: skill_match, text_similarity,
+            experience_match and title_match (bool)
+        """
+        wanted = set(COMPONENT_INPUTS if only is None else only)
+        
+        # Job-side features are computed at ingestion; only fill in jobs that lack them
+        with span('match.features'):
+            attach_job_features(jobs)
+        features = [job['features'] for job in jobs]
+        
+        user_skills = user_context['skills']
+        user_job_title = user_context['job_title'].lower()
+        
+        components = {}
+        if 'skill_match' in wanted:
+            with span('match.skills'):
+                components['skill_match'] = np.fromiter(
+                    (self.calculate_skill_match_score(user_skills, f['skill_ids']) for f in features),
+                    dtype=np.float64, count=len(features)
+                )
+        # Text similarity for all jobs in one sparse product
+        if 'text_similarity' in wanted:
+            with span('match.text'):
+                components['text_similarity'] = self.calculate_text_similarities(
+                    user_context['doc'], [f['term_vector'] for f in features]
+                )
+        # Experience match for all jobs from their precomputed levels
+        if 'experience_match' in wanted:
+            with span('match.experience'):
+                components['experience_match'] = level_match_scores(
+                    user_context['experience'], [f['experience_level'] for f in features]
+                )
+        if 'title_match' in wanted:
+            with span('match.title'):
+                components['title_match'] = np.fromiter(
+                    (bool(user_job_title) and user_job_title in (job.get('title') or '').lower() for job in jobs),
+                    dtype=bool, count=len(jobs)
+                )
+        return components
+    
+    def score_matrix(self, user_contexts, jobs):
+        """
+        Final match scores for many users against many jobs in one batch.
+        
+        Equal to scoring each user with score_components and combine_scores,
+        but every component is computed as a (users, jobs) array.
+        
+        Returns:
+            NumPy array of shape (len(user_contexts), len(jobs))
+        """
+        attach_job_features(jobs)
+        features = [job['features'] for job in jobs]
+        
+        # Skills: job x skill counts times each user's credit per skill
+        vocabulary = {}
+        job_rows, skill_cols = [], []
+        for row, f in enumerate(features):
+            for skill in f['skill_ids']:
+                skill = skill.lower().strip() if skill else ''
+                if skill:
+                    job_rows.append(row)
+                    skill_cols.append(vocabulary.setdefault(skill, len(vocabulary)))
+        job_skill_counts = np.zeros((len(jobs), len(vocabulary)))
+        np.add.at(job_skill_counts, (job_rows, skill_cols), 1)
+        
+        credits = np.zeros((len(user_contexts), len(vocabulary)))
+        for u, context in enumerate(user_contexts):
+            user_skills_lower = [s.lower().strip() for s in context['skills'] if s]
+            if user_skills_lower:
+                for skill, col in vocabulary.items():
+                    credits[u, col] = self.job_skill_weight(skill, user_skills_lower)
+        
+        max_possible = job_skill_counts.sum(axis=1) * self.skill_weights['exact_match']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill_match = np.where(max_possible > 0, credits @ job_skill_counts.T / max_possible * 100, 0.0)
+        
+        # Text: both sides are L2-normalized, so the product is the cosine
+        user_matrix = get_vectorizer().transform([context['doc'] for context in user_contexts])
+        job_matrix = term_vectors_to_matrix([f['term_vector'] for f in features])
+        text_similarity = np.clip((user_matrix @ job_matrix.T).toarray(), 0.0, 1.0) * 100
+        
+        experience_match = level_match_matrix(
+            [context['experience'] for context in user_contexts], [f['experience_level'] for f in features]
+        )
+        
+        job_titles = np.array([(job.get('title') or '').lower() for job in jobs], dtype=str)
+        title_match = np.zeros((len(user_contexts), len(jobs)), dtype=bool)
+        for u, context in enumerate(user_contexts):
+            title = context['job_title'].lower()
+            if title and len(jobs):
+                title_match[u] = np.char.find(job_titles, title) >= 0
+        
+        return self.combine_scores({
+            'skill_match': np.minimum(100, skill_match),
+            'text_similarity': text_similarity,
+            'experience_match': experience_match,
+            'title_match': title_match,
+        })
     
-    def match_jobs(self, user_profile, jobs):
+    @traced('match.combine')
+    def combine_scores(self, components):
+        """Weighted final score from the score components"""
+        # Skills are most important (50%), then text similarity (30%), then experience (20%)
+        final_scores = (
+            components['skill_match'] * self.score_weights['skill_match'] +
+            components['text_similarity'] * self.score_weights['text_similarity'] +
+            components['experience_match'] * self.score_weights['experience_match']
+        )
+        
+        # Boost score if job title matches user's desired title
+        boosted = np.minimum(100, final_scores * self.title_boost)
+        return np.where(components['title_match'], boosted, final_scores)
+    
+    @MATCHER_SECONDS.time(matcher='enhanced')
+    def match_jobs(self, user_profile, jobs, top_k=None, candidate_budget=None):
         """
         Enhanced job matching with multiple weighted factors.
         
         Args:
             user_profile: Dict with user information (skills, experience, job_title, etc.)
             jobs: List of job dictionaries
+            top_k: Return only the K best matches (default: all jobs)
+            candidate_budget: Score only this many jobs, retrieved by shared
+                skills and title terms (default: score every job)
             
         Returns:
             List of jobs with match scores, sorted by relevance
@@ -193,76 +336,228 @@ class EnhancedJobMatcher:
         if not jobs:
             return []
         
-        # Extract user information
-        user_skills = []
-        if 'skills' in user_profile:
-            if isinstance(user_profile['skills'], list):
-                user_skills = user_profile['skills']
-            else:
-                user_skills = [s.strip() for s in str(user_profile['skills']).split(',')]
+        user_context = self.build_user_context(user_profile)
         
-        user_experience = user_profile.get('experience', 0)
-        user_job_title = user_profile.get('job_title', '')
-        user_keywords = user_profile.get('keywords', '')
+        if candidate_budget is not None and len(jobs) > candidate_budget:
+            jobs = self.retrieve_candidates(user_context, jobs, candidate_budget)
+            if not jobs:
+                return []
         
-        # Build user document for text matching
-        user_doc = f"{user_job_title} {' '.join(user_skills)} {user_keywords}"
+        components = self.score_components(user_context, jobs)
+        return self.rank_jobs(user_context, jobs, components, top_k)
+    
+    def rank_jobs(self, user_context, jobs, components, top_k=None):
+        """Combine score components and build result dicts for the top_k jobs"""
+        final_scores = self.combine_scores(components)
         
-        # Also extract skills from user document
-        extracted_user_skills = self.extract_skills(user_doc)
-        all_user_skills = list(set(user_skills + extracted_user_skills))
+        # Only the selected jobs are copied into result dicts
+        with span('match.rank'):
+            selected = top_k_indices(final_scores, top_k)
         
         ranked_jobs = []
-        
-        for job in jobs:
-            # Build job document
-            job_doc = f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('skills', []))}"
-            
-            # Extract job skills
-            job_skills = job.get('skills', [])
-            extracted_job_skills = self.extract_skills(job_doc)
-            all_job_skills = list(set(job_skills + extracted_job_skills))
+        for i in selected:
+            job = jobs[i]
             
-            # Calculate different match scores
-            text_similarity = self.calculate_text_similarity(user_doc, job_doc)
-            skill_match = self.calculate_skill_match_score(all_user_skills, all_job_skills)
-            experience_match = self.calculate_experience_match(user_experience, job.get('description', ''))
-            
-            # Weighted final score
-            # Skills are most important (50%), then text similarity (30%), then experience (20%)
-            final_score = (
-                skill_match * 0.50 +
-                text_similarity * 0.30 +
-                experience_match * 0.20
-            )
-            
-            # Boost score if job title matches user's desired title
-            if user_job_title and user_job_title.lower() in job.get('title', '').lower():
-                final_score = min(100, final_score * 1.15)  # 15% boost
-            
-            # Create enhanced job object
+            # Create enhanced job object (features stay internal)
             enhanced_job = job.copy()
-            enhanced_job['match_score'] = round(final_score, 1)
-            enhanced_job['skill_match'] = round(skill_match, 1)
-            enhanced_job['text_similarity'] = round(text_similarity, 1)
-            enhanced_job['experience_match'] = round(experience_match, 1)
-            enhanced_job['matched_skills'] = list(set(all_user_skills) & set(all_job_skills))
+            enhanced_job.pop('features', None)
+            enhanced_job['match_score'] = round(float(final_scores[i]), 1)
+            enhanced_job['skill_match'] = round(float(components['skill_match'][i]), 1)
+            enhanced_job['text_similarity'] = round(float(components['text_similarity'][i]), 1)
+            enhanced_job['experience_match'] = round(float(components['experience_match'][i]), 1)
+            enhanced_job['matched_skills'] = sorted(set(user_context['skills']) & set(job['features']['skill_ids']))
             
             ranked_jobs.append(enhanced_job)
         
-        # Sort by final match score
-        ranked_jobs.sort(key=lambda x: x['match_score'], reverse=True)
-        
         return ranked_jobs
+    
+    def rerank_jobs(self, previous_profile, user_profile, jobs, components, top_k=None):
+        """
+        Re-rank already scored jobs after the user edits their profile.
+        
+        Components whose inputs did not change (see COMPONENT_INPUTS) are
+        reused as given; only the others are recomputed.
+        
+        Args:
+            previous_profile: Profile the components were computed for
+            user_profile: Edited profile
+            jobs: The scored jobs, with features
+            components: Score component arrays aligned with jobs
+            top_k: Return only the K best matches
+            
+        Returns:
+            (ranked jobs, components for the edited profile)
+        """
+        previous_context = self.build_user_context(previous_profile)
+        user_context = self.build_user_context(user_profile)
+        changed = [
+            name for name, inputs in COMPONENT_INPUTS.items()
+            if any(previous_context[field] != user_context[field] for field in inputs)
+        ]
+        
+        components = dict(components)
+        if changed:
+            components.update(self.score_components(user_context, jobs, only=changed))
+        return self.rank_jobs(user_context, jobs, components, top_k), components
 
-
-def match_jobs(user_profile, jobs):
+def match_jobs(user_profile, jobs, top_k=None, candidate_budget=None):
     """
     Wrapper function for backward compatibility.
     Uses the enhanced matcher.
     """
     matcher = EnhancedJobMatcher()
-    return matcher.match_jobs(user_profile, jobs)
+    return matcher.match_jobs(user_profile, jobs, top_k=top_k, candidate_budget=candidate_budget)
+
+
+@MATCHER_SECONDS.time(matcher='enhanced')
+def match_and_score(user_profile, jobs, top_k=None):
+    """
+    Like match_jobs, but also return every job's score components (aligned
+    with jobs) so a later profile edit can be re-ranked with rerank_jobs.
+    
+    Returns:
+        (ranked jobs, components or None when there are no jobs)
+    """
+    if not jobs:
+        return [], None
+    matcher = EnhancedJobMatcher()
+    user_context = matcher.build_user_context(user_profile)
+    components = matcher.score_components(user_context, jobs)
+    return matcher.rank_jobs(user_context, jobs, components, top_k), components
+
+
+@MATCHER_SECONDS.time(matcher='rerank')
+def rerank_jobs(previous_profile, user_profile, jobs, components, top_k=None):
+    """Re-rank scored jobs for an edited profile (see EnhancedJobMatcher.rerank_jobs)."""
+    return EnhancedJobMatcher().rerank_jobs(previous_profile, user_profile, jobs, components, top_k=top_k)
+
+
+def stack_components(rows):
+    """Score component arrays from per-job dicts, e.g. rows stored with a search."""
+    return {
+        name: np.fromiter((row[name] for row in rows), dtype=bool if name == 'title_match' else np.float64, count=len(rows))
+        for name in COMPONENT_INPUTS
+    }
+
+
+def build_catalog_ann_index(**index_params):
+    """
+    Build an approximate nearest-neighbour index over every catalog job.
+    
+    index_params are passed to JobVectorIndex (n_components, n_tables,
+    n_bits, probe_radius) to trade recall for latency.
+    """
+    import database as db
+    
+    jobs = db.get_catalog_jobs()
+    attach_job_features(jobs)
+    term_matrix = term_vectors_to_matrix([job['features']['term_vector'] for job in jobs])
+    return JobVectorIndex(**index_params).fit([job['catalog_id'] for job in jobs], term_matrix)
+
+
+_ann_snapshot = {'index': None, 'built_at': 0.0, 'rebuilding': False}
+_ann_lock = threading.Lock()
+
+
+def _rebuild_ann_snapshot():
+    try:
+        index = build_catalog_ann_index()
+        _ann_snapshot.update(index=index, built_at=time.monotonic())
+    except Exception:
+        logger.exception("Rebuilding the catalog ANN snapshot failed")
+    finally:
+        _ann_snapshot['rebuilding'] = False
+
+
+def catalog_ann_index():
+    """
+    Process-wide ANN snapshot of the catalog, built on first use.
+    
+    Under gunicorn --preload the master builds it before forking so every
+    worker shares one copy. Once older than CATALOG_ANN_MAX_AGE it is
+    rebuilt in the background; requests keep using the old snapshot
+    meanwhile (jobs stored since it was built are not in it).
+    """
+    with _ann_lock:
+        if _ann_snapshot['index'] is None:
+            _ann_snapshot.update(index=build_catalog_ann_index(), built_at=time.monotonic())
+        elif (not _ann_snapshot['rebuilding']
+                and time.monotonic() - _ann_snapshot['built_at'] > CATALOG_ANN_MAX_AGE):
+            _ann_snapshot['rebuilding'] = True
+            threading.Thread(target=_rebuild_ann_snapshot, name='catalog-ann', daemon=True).start()
+        return _ann_snapshot['index']
+
+
+def catalog_candidate_ids(user_context, mode=None, budget=None):
+    """
+    Catalog job IDs worth scoring for a user, at most budget of them.
+    
+    'index' mode takes the jobs sharing a skill or title term with the user
+    (the catalog's inverted index); 'ann' mode takes the user's approximate
+    nearest neighbours by job text from catalog_ann_index(), and falls back
+    to the inverted index if the snapshot is empty or fails.
+    """
+    import database as db
+    
+    mode = mode or CATALOG_MATCHING
+    budget = budget or CATALOG_CANDIDATES
+    if mode == 'ann':
+        try:
+            ann_index = catalog_ann_index()
+            if len(ann_index):
+                user_vector = get_vectorizer().transform([user_context['doc']])
+                return ann_index.query(user_vector, k=budget)
+        except Exception:
+            logger.exception("ANN retrieval failed; using the catalog index")
+    return db.get_catalog_candidate_ids(user_context['index_terms'], budget)
+
+
+def _in_location(job, location):
+    job_location = (job.get('location') or '').lower()
+    return not job_location or location in job_location or 'remote' in job_location
+
+
+@MATCHER_SECONDS.time(matcher='catalog')
+def match_catalog_and_score(user_profile, jobs, top_k=None, mode=None, candidate_budget=None):
+    """
+    Rank a search's freshly scraped jobs together with catalog candidates.
+    
+    Candidates come from the whole stored catalog (see catalog_candidate_ids),
+    so only a bounded number of stored jobs is loaded and scored. With
+    mode 'off' only the given jobs are scored, as match_and_score does.
+    
+    Args:
+        user_profile: User profile; a "location" limits catalog candidates
+            to that location (or remote / unspecified)
+        jobs: Fresh jobs, with catalog_id once stored in the catalog
+        top_k: Return only the K best matches
+        mode: 'index', 'ann' or 'off' (default: CATALOG_MATCHING)
+        candidate_budget: Catalog jobs to score (default: CATALOG_CANDIDATES)
+        
+    Returns:
+        (ranked jobs, every scored job, their score components or None)
+    """
+    import database as db
+    
+    mode = mode or CATALOG_MATCHING
+    matcher = EnhancedJobMatcher()
+    user_context = matcher.build_user_context(user_profile)
+    scored_jobs = list(jobs)
+    
+    if mode != 'off':
+        with span('match.catalog'):
+            fresh_ids = {job.get('catalog_id') for job in jobs}
+            candidate_ids = [i for i in catalog_candidate_ids(user_context, mode, candidate_budget) if i not in fresh_ids]
+            candidates = db.get_catalog_jobs(candidate_ids)
+            location = (user_profile.get('location') or '').strip().lower()
+            if location:
+                candidates = [job for job in candidates if _in_location(job, location)]
+            scored_jobs.extend(candidates)
+    
+    if not scored_jobs:
+        return [], [], None
+    components = matcher.score_components(user_context, scored_jobs)
+    return matcher.rank_jobs(user_context, scored_jobs, components, top_k), scored_jobs, components
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+from flask import Blueprint, request, jsonify, session, send_file
+import database as db
+import os
+from utils import profiling
+
+admin_bp = Blueprint('admin', __name__)
+
+PROFILE_SORT_KEYS = ('cumulative', 'tottime', 'ncalls', 'name')
+
+def admin_emails():
+    """Admin accounts, from the comma-separated ADMIN_EMAILS setting"""
+    return {e.strip().lower() for e in os.getenv('ADMIN_EMAILS', '').split(',') if e.strip()}
+
+def is_admin():
+    """Whether the logged-in user is an admin"""
+    user_id = session.get('user_id')
+    emails = admin_emails()
+    if not user_id or not emails:
+        return False
+    user = db.get_user_by_id(user_id)
+    return bool(user) and (user.get('email') or '').lower() in emails
+
+@admin_bp.before_request
+def require_admin():
+    if not session.get('user_id'):
+        return jsonify({"status": "error", "message": "Not authenticated"}), 401
+    if not is_admin():
+        return jsonify({"status": "error", "message": "Admin access required"}), 403
+
+@admin_bp.route('/profiles', methods=['GET'])
+def get_profiles():
+    """List stored request profiles, newest first"""
+    return jsonify({"status": "success", "profiles": profiling.list_profiles()})
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """
+    Download a profile: the raw .prof file (for pstats/snakeviz) by default,
+    or a text summary with ?format=text&sort=cumulative&limit=40
+    """
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        return jsonify({"status": "error", "message": "Profile not found"}), 404
+
+    if request.args.get('format') == 'text':
+        sort = request.args.get('sort', 'cumulative')
+        if sort not in PROFILE_SORT_KEYS:
+            return jsonify({"status": "error", "message": f"sort must be one of {', '.join(PROFILE_SORT_KEYS)}"}), 400
+        limit = request.args.get('limit', 40, type=int)
+        report = profiling.profile_report(profile_id, sort=sort, limit=limit)
+        return report, 200, {'Content-Type': 'text/plain; charset=utf-8'}
+
+    return send_file(path.resolve(), mimetype='application/octet-stream', as_attachment=True,
+                     download_name=f"{profile_id}.prof")
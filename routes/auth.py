@@ -1,15 +1,18 @@
 from flask import Blueprint, request, jsonify, session
 import database as db
+import email_utils
 import hashlib
+import logging
 
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger('jobflow.routes')
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
-    """Create a new user account - simplified with no email dependencies"""
+    """Create a new user account; the welcome email is queued, not sent inline"""
     try:
         data = request.json
         if not data:
@@ -35,6 +38,8 @@ def signup():
         # Set session
         session['user_id'] = user_id
         
+        email_utils.send_welcome_email(email, full_name or email)
+        
         # Return success response
         return jsonify({
             "status": "success", 
@@ -48,9 +53,7 @@ def signup():
         }), 200
         
     except Exception as e:
-        print(f"Signup error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Signup error: {str(e)}")
         return jsonify({"status": "error", "message": "Failed to create account"}), 500
 
 @auth_bp.route('/login', methods=['POST'])
@@ -94,9 +97,7 @@ def login():
         }), 200
         
     except Exception as e:
-        print(f"Login error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Login error: {str(e)}")
         return jsonify({"status": "error", "message": "Failed to login"}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -106,9 +107,62 @@ def logout():
         session.clear()
         return jsonify({"status": "success", "message": "Logged out successfully"}), 200
     except Exception as e:
-        print(f"Logout error: {str(e)}")
+        logger.exception(f"Logout error: {str(e)}")
         return jsonify({"status": "error", "message": "Failed to logout"}), 500
 
+@auth_bp.route('/forgot-password', methods=['POST'])
+def forgot_password():
+    """Queue a password reset email"""
+    try:
+        data = request.json
+        email = (data or {}).get('email')
+        if not email:
+            return jsonify({"status": "error", "message": "Email required"}), 400
+        
+        # Same response whether or not the account exists, so the endpoint
+        # can't be used to find registered emails
+        token = db.create_reset_token(email)
+        if token:
+            user = db.get_user_by_email(email)
+            email_utils.send_password_reset_email(email, token, user.get('full_name'))
+        
+        return jsonify({
+            "status": "success",
+            "message": "If an account exists for this email, a reset link is on its way"
+        }), 200
+        
+    except Exception as e:
+        logger.exception(f"Forgot password error: {str(e)}")
+        return jsonify({"status": "error", "message": "Failed to send reset email"}), 500
+
+@auth_bp.route('/reset-password', methods=['POST'])
+def reset_password():
+    """Set a new password with a reset token"""
+    try:
+        data = request.json
+        if not data:
+            return jsonify({"status": "error", "message": "No data provided"}), 400
+        
+        token = data.get('token')
+        new_password = data.get('new_password')
+        if not token or not new_password:
+            return jsonify({"status": "error", "message": "Token and new password required"}), 400
+        if len(new_password) < 8:
+            return jsonify({"status": "error", "message": "Password must be at least 8 characters"}), 400
+        
+        user_id = db.verify_reset_token(token)
+        if not user_id:
+            return jsonify({"status": "error", "message": "Invalid or expired reset token"}), 400
+        
+        db.update_user_password(user_id, hash_password(new_password))
+        db.mark_token_used(token)
+        
+        return jsonify({"status": "success", "message": "Password reset successfully"}), 200
+        
+    except Exception as e:
+        logger.exception(f"Reset password error: {str(e)}")
+        return jsonify({"status": "error", "message": "Failed to reset password"}), 500
+
 @auth_bp.route('/me', methods=['GET'])
 def get_current_user():
     """Get current authenticated user"""
@@ -133,5 +187,5 @@ def get_current_user():
         }), 200
         
     except Exception as e:
-        print(f"Get current user error: {str(e)}")
+        logger.exception(f"Get current user error: {str(e)}")
         return jsonify({"status": "error", "message": "Failed to get user"}), 500
@@ -1,35 +1,72 @@
 from flask import Blueprint, request, jsonify, session, send_file
 import database as db
-import os
+from functools import lru_cache
 from werkzeug.utils import secure_filename
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.units import inch
 from datetime import datetime
-from cv_parser import CVParser
+from utils.tracing import span
+import logging
+
+logger = logging.getLogger('jobflow.routes')
+
+# Heavy dependencies (sklearn, scrapers, reportlab, PDF/DOCX readers) are
+# imported on first use or by server.warmup(), not when the app is imported.
+@lru_cache(maxsize=1)
+def load_pipeline():
+    """Import the scraper and matcher - prioritize the production scraper"""
+    try:
+        from scraper_production import scrape_jobs
+        logger.debug("✓ Using production scraper with validation")
+    except ImportError:
+        try:
+            from scraper_enhanced import scrape_jobs
+            logger.warning("⚠ Using enhanced scraper (no validation)")
+        except ImportError:
+            from scraper import scrape_jobs
+            logger.warning("⚠ Using basic scraper")
 
-# Import scrapers/matchers - prioritize production scraper
-try:
-    from scraper_production import scrape_jobs
-    print("✓ Using production scraper with validation")
-except ImportError:
     try:
-        from scraper_enhanced import scrape_jobs
-        print("⚠ Using enhanced scraper (no validation)")
+        from matcher_enhanced import match_catalog_and_score
     except ImportError:
-        from scraper import scrape_jobs
-        print("⚠ Using basic scraper")
+        from matcher import match_jobs as basic_match_jobs
+
+        def match_catalog_and_score(user_profile, jobs, top_k=None):
+            # The basic matcher has no score components, so its searches can't be re-ranked
+            return basic_match_jobs(user_profile, jobs, top_k=top_k), jobs, None
 
-try:
-    from matcher_enhanced import match_jobs
-except ImportError:
-    from matcher import match_jobs
+    return scrape_jobs, match_catalog_and_score
+
+def scrape_jobs(query, location='', max_jobs=20):
+    return load_pipeline()[0](query, location, max_jobs=max_jobs)
+
+def match_jobs(user_profile, jobs, top_k=None):
+    """
+    Rank the scraped jobs together with matching stored catalog jobs.
+    Returns (ranked jobs, every scored job, their score components or None)
+    """
+    return load_pipeline()[1](user_profile, jobs, top_k=top_k)
+
+def ingest_jobs(jobs, user_id):
+    """Store scraped jobs in the catalog and queue the new ones for saved-search alert matching"""
+    with span('db.catalog'):
+        new_ids = db.save_catalog_jobs(jobs)
+    try:
+        import alerts
+        alerts.queue_new_jobs(new_ids, seen_by=user_id)
+    except Exception:
+        # Alerts must never fail the user's own search
+        logger.exception("Queueing new jobs for alert matching failed")
+
+def save_candidates(search_id, jobs, components):
+    """Keep the scored jobs of a search so profile edits can be re-ranked"""
+    if components is not None:
+        db.save_search_candidates(search_id, jobs, components)
 
 jobs_bp = Blueprint('jobs', __name__)
 
+# Number of ranked jobs returned to the results page
+RESULTS_LIMIT = 20
+
 def get_current_user_id():
     return session.get('user_id')
 
@@ -41,12 +78,17 @@ def recommend_form():
             return jsonify({"status": "error", "message": "Not authenticated"}), 401
 
         data = request.json
-        jobs = scrape_jobs(data.get('job_title', ''), data.get('location', ''))
-        matched_jobs = match_jobs(data, jobs)
+        with span('scrape'):
+            jobs = scrape_jobs(data.get('job_title', ''), data.get('location', ''))
+        ingest_jobs(jobs, user_id)
+        with span('match'):
+            matched_jobs, scored_jobs, components = match_jobs(data, jobs, top_k=RESULTS_LIMIT)
         
         keywords = ', '.join(data.get('skills', [])) if isinstance(data.get('skills'), list) else data.get('skills', '')
-        search_id = db.save_search(user_id, 'form', data, keywords)
-        db.save_job_results(search_id, matched_jobs)
+        with span('db.results'):
+            search_id = db.save_search(user_id, 'form', data, keywords, match_profile=data)
+            db.save_job_results(search_id, matched_jobs)
+            save_candidates(search_id, scored_jobs, components)
         
         return jsonify({"status": "success", "jobs": matched_jobs, "search_id": search_id})
     except Exception as e:
@@ -62,11 +104,18 @@ def recommend_chat():
         data = request.json
         user_message = data.get('message', '')
         
-        jobs = scrape_jobs(user_message, "")
-        matched_jobs = match_jobs({"keywords": user_message}, jobs)
+        with span('scrape'):
+            jobs = scrape_jobs(user_message, "")
+        ingest_jobs(jobs, user_id)
+        with span('match'):
+            user_profile = {"keywords": user_message}
+            matched_jobs, scored_jobs, components = match_jobs(user_profile, jobs, top_k=RESULTS_LIMIT)
         
-        search_id = db.save_search(user_id, 'chat', {'message': user_message}, user_message[:100])
-        db.save_job_results(search_id, matched_jobs)
+        with span('db.results'):
+            search_id = db.save_search(user_id, 'chat', {'message': user_message}, user_message[:100],
+                                       match_profile=user_profile)
+            db.save_job_results(search_id, matched_jobs)
+            save_candidates(search_id, scored_jobs, components)
         
         return jsonify({"status": "success", "jobs": matched_jobs, "search_id": search_id})
     except Exception as e:
@@ -87,51 +136,174 @@ def recommend_cv():
             return jsonify({"status": "error", "message": "No selected file"}), 400
             
         filename = secure_filename(file.filename)
-        temp_path = os.path.join("temp_uploads", filename)
-        os.makedirs("temp_uploads", exist_ok=True)
-        file.save(temp_path)
         
-        try:
-            parser = CVParser()
-            parsed_data = parser.parse(temp_path)
+        with span('parse_cv'):
+            from cv_parser import parse_cv
+            try:
+                parsed_data, _ = parse_cv(file.read(), filename)
+            except ValueError as e:
+                return jsonify({"status": "error", "message": str(e)}), 400
+        
+        if "error" in parsed_data:
+            return jsonify({"status": "error", "message": parsed_data["error"]}), 400
             
-            if "error" in parsed_data:
-                return jsonify({"status": "error", "message": parsed_data["error"]}), 400
-                
-            extracted_skills = parsed_data.get("skills", [])
-            job_title = parsed_data.get("job_title", "Unknown")
+        extracted_skills = parsed_data.get("skills", [])
+        job_title = parsed_data.get("job_title", "Unknown")
+        
+        search_query = job_title if job_title != "Unknown" else "Software Engineer"
+        if not search_query and extracted_skills:
+            search_query = extracted_skills[0]
             
-            search_query = job_title if job_title != "Unknown" else "Software Engineer"
-            if not search_query and extracted_skills:
-                search_query = extracted_skills[0]
-                
+        with span('scrape'):
             jobs = scrape_jobs(search_query, "")
-            
-            user_profile = {
-                "skills": extracted_skills,
-                "job_title": job_title
-            }
-            matched_jobs = match_jobs(user_profile, jobs)
-            
-            skills_str = ", ".join(extracted_skills) if extracted_skills else ""
-            
-            search_id = db.save_search(user_id, 'cv', {'filename': filename, 'parsed_data': parsed_data}, skills_str)
+        ingest_jobs(jobs, user_id)
+        
+        user_profile = {
+            "skills": extracted_skills,
+            "job_title": job_title
+        }
+        if parsed_data.get("experience") is not None:
+            user_profile["experience"] = parsed_data["experience"]
+        with span('match'):
+            matched_jobs, scored_jobs, components = match_jobs(user_profile, jobs, top_k=RESULTS_LIMIT)
+        
+        skills_str = ", ".join(extracted_skills) if extracted_skills else ""
+        
+        with span('db.results'):
+            search_id = db.save_search(user_id, 'cv', {'filename': filename, 'parsed_data': parsed_data}, skills_str,
+                                       match_profile=user_profile)
             db.save_job_results(search_id, matched_jobs)
-            
-            return jsonify({
-                "status": "success", 
-                "jobs": matched_jobs, 
-                "search_id": search_id,
-                "parsed_data": parsed_data
-            })
-            
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            save_candidates(search_id, scored_jobs, components)
+        
+        return jsonify({
+            "status": "success", 
+            "jobs": matched_jobs, 
+            "search_id": search_id,
+            "parsed_data": parsed_data
+        })
                 
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Profile fields a re-rank may change; anything else (e.g. location) needs a new search
+RERANK_FIELDS = ('skills', 'experience', 'job_title', 'keywords')
+
+def apply_profile_changes(profile, data):
+    """
+    Apply a re-rank request's edits to a stored profile.
+    
+    data may hold "changes" (fields to replace) and "add_skills" /
+    "remove_skills" lists of strings. Raises ValueError for malformed edits
+    and fields that can't be re-ranked.
+    """
+    changes = data.get('changes') or {}
+    if not isinstance(changes, dict):
+        raise ValueError("changes must be an object")
+    unsupported = sorted(set(changes) - set(RERANK_FIELDS))
+    if unsupported:
+        raise ValueError(f"Cannot re-rank after changing {', '.join(unsupported)}; run a new search")
+    for field in ('add_skills', 'remove_skills'):
+        value = data.get(field) or []
+        if not isinstance(value, list) or not all(isinstance(skill, str) for skill in value):
+            raise ValueError(f"{field} must be a list of strings")
+    if 'skills' in changes and not (isinstance(changes['skills'], str) or (
+            isinstance(changes['skills'], list) and all(isinstance(s, str) for s in changes['skills']))):
+        raise ValueError("skills must be a list of strings")
+    for field in ('job_title', 'keywords'):
+        if field in changes and not isinstance(changes[field], str):
+            raise ValueError(f"{field} must be a string")
+    if 'experience' in changes and (isinstance(changes['experience'], bool)
+                                    or not isinstance(changes['experience'], (int, float, str))):
+        raise ValueError("experience must be a number")
+    
+    profile = dict(profile, **changes)
+    skills = profile.get('skills') or []
+    if not isinstance(skills, list):
+        skills = [s.strip() for s in str(skills).split(',') if s.strip()]
+    
+    removed = {s.lower() for s in data.get('remove_skills') or []}
+    skills = [s for s in skills if s.lower() not in removed]
+    present = {s.lower() for s in skills}
+    for skill in data.get('add_skills') or []:
+        if skill and skill.lower() not in present:
+            skills.append(skill)
+            present.add(skill.lower())
+    profile['skills'] = skills
+    return profile
+
+@jobs_bp.route('/recommend/rerank', methods=['POST'])
+def recommend_rerank():
+    """
+    Re-rank a previous search after a profile edit, without scraping.
+    Body: {"search_id": 1, "changes": {"experience": 5}, "add_skills": [...], "remove_skills": [...]}
+    """
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"status": "error", "message": "Not authenticated"}), 401
+
+        data = request.json or {}
+        search = db.get_search(data.get('search_id'))
+        if not search or search['user_id'] != user_id:
+            return jsonify({"status": "error", "message": "Search not found"}), 404
+        if search['match_profile'] is None:
+            return jsonify({"status": "error", "message": "This search can't be re-ranked; run a new search"}), 400
+        
+        try:
+            user_profile = apply_profile_changes(search['match_profile'], data)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        
+        from matcher_enhanced import rerank_jobs, stack_components
+        
+        with span('db.candidates'):
+            candidates = db.get_search_candidates(search['id'])
+            jobs_by_id = {job['catalog_id']: job for job in db.get_catalog_jobs([c['catalog_job_id'] for c in candidates])}
+        candidates = [c for c in candidates if c['catalog_job_id'] in jobs_by_id]
+        jobs = [jobs_by_id[c['catalog_job_id']] for c in candidates]
+        
+        with span('match'):
+            if jobs:
+                matched_jobs, components = rerank_jobs(
+                    search['match_profile'], user_profile, jobs, stack_components(candidates), top_k=RESULTS_LIMIT
+                )
+            else:
+                matched_jobs, components = [], None
+        
+        keywords = ', '.join(user_profile['skills'])
+        with span('db.results'):
+            search_id = db.save_search(user_id, search['search_type'], dict(user_profile, rerank_of=search['id']),
+                                       keywords, match_profile=user_profile)
+            db.save_job_results(search_id, matched_jobs)
+            save_candidates(search_id, jobs, components)
+        
+        return jsonify({"status": "success", "jobs": matched_jobs, "search_id": search_id})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@jobs_bp.route('/cv/parse-batch', methods=['POST'])
+def parse_cv_batch_endpoint():
+    """Parse several CVs at once (e.g. a recruiter's candidate list) without running a search"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"status": "error", "message": "Not authenticated"}), 401
+
+        from cv_parser import BATCH_MAX_FILES, parse_cv_batch
+        
+        files = [f for f in request.files.getlist('files') if f.filename]
+        if not files:
+            return jsonify({"status": "error", "message": "No files uploaded"}), 400
+        if len(files) > BATCH_MAX_FILES:
+            return jsonify({"status": "error", "message": f"At most {BATCH_MAX_FILES} files per batch"}), 400
+        
+        with span('parse_cv'):
+            results = parse_cv_batch([(secure_filename(f.filename), f.read()) for f in files])
+        
+        return jsonify({"status": "success", "results": results})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 @jobs_bp.route('/user/searches', methods=['GET'])
 def get_searches():
     try:
@@ -144,6 +316,70 @@ def get_searches():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@jobs_bp.route('/user/searches/<int:search_id>/alert', methods=['POST'])
+def create_alert(search_id):
+    """Get notified about new jobs matching a previous search. Body (optional): {"min_score": 70}"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"status": "error", "message": "Not authenticated"}), 401
+        
+        search = db.get_search(search_id)
+        if not search or search['user_id'] != user_id:
+            return jsonify({"status": "error", "message": "Search not found"}), 404
+        if search['match_profile'] is None:
+            return jsonify({"status": "error", "message": "Alerts need a newer search; please search again"}), 400
+        
+        from alerts import ALERT_MIN_SCORE
+        data = request.get_json(silent=True) or {}
+        try:
+            min_score = float(data.get('min_score', ALERT_MIN_SCORE))
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "min_score must be a number"}), 400
+        if not 0 <= min_score <= 100:
+            return jsonify({"status": "error", "message": "min_score must be between 0 and 100"}), 400
+        
+        alert = db.save_alert(user_id, search_id, search['match_profile'], min_score)
+        return jsonify({"status": "success", "alert": alert})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@jobs_bp.route('/user/searches/<int:search_id>/alert', methods=['DELETE'])
+def delete_alert(search_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"status": "error", "message": "Not authenticated"}), 401
+        
+        if not db.deactivate_alert(user_id, search_id):
+            return jsonify({"status": "error", "message": "Alert not found"}), 404
+        return jsonify({"status": "success", "message": "Alert turned off"})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@jobs_bp.route('/user/alerts', methods=['GET'])
+def get_alerts():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"status": "error", "message": "Not authenticated"}), 401
+        
+        return jsonify({"status": "success", "alerts": db.get_user_alerts(user_id)})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@jobs_bp.route('/user/alerts/<int:alert_id>/matches', methods=['GET'])
+def get_alert_matches_api(alert_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"status": "error", "message": "Not authenticated"}), 401
+        
+        limit = request.args.get('limit', 50, type=int)
+        return jsonify({"status": "success", "jobs": db.get_alert_matches(user_id, alert_id, limit)})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 @jobs_bp.route('/search/<int:search_id>/results', methods=['GET'])
 def get_search_results_api(search_id):
     try:
@@ -203,6 +439,12 @@ def unsave_job_endpoint(saved_id):
 @jobs_bp.route('/export/pdf', methods=['POST'])
 def export_pdf():
     try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.units import inch
+        
         data = request.json
         jobs = data.get('jobs', [])
         user_name = data.get('user_name', 'User')
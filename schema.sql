@@ -22,6 +22,7 @@ CREATE TABLE IF NOT EXISTS searches (
     search_type TEXT NOT NULL, -- 'form', 'chat', 'cv'
     query_data TEXT, -- JSON string of search parameters
     keywords TEXT,
+    match_profile TEXT, -- JSON of the profile the jobs were matched against
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
@@ -38,10 +39,113 @@ CREATE TABLE IF NOT EXISTS job_results (
     match_score REAL,
     platform TEXT,
     url TEXT,
+    catalog_job_id INTEGER,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (search_id) REFERENCES searches(id),
+    FOREIGN KEY (catalog_job_id) REFERENCES job_catalog(id)
+);
+
+-- Every job scored for a search, with its score components, so a profile
+-- edit can be re-ranked without scraping or recomputing unchanged scores
+CREATE TABLE IF NOT EXISTS search_candidates (
+    search_id INTEGER NOT NULL,
+    catalog_job_id INTEGER NOT NULL,
+    skill_match REAL,
+    text_similarity REAL,
+    experience_match REAL,
+    title_match BOOLEAN,
+    PRIMARY KEY (search_id, catalog_job_id),
+    FOREIGN KEY (search_id) REFERENCES searches(id),
+    FOREIGN KEY (catalog_job_id) REFERENCES job_catalog(id)
+) WITHOUT ROWID;
+
+-- Saved-search alerts: new catalog jobs are matched against the stored profile
+CREATE TABLE IF NOT EXISTS search_alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    search_id INTEGER UNIQUE NOT NULL,
+    profile TEXT NOT NULL, -- JSON of the matcher profile
+    min_score REAL NOT NULL,
+    active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id),
     FOREIGN KEY (search_id) REFERENCES searches(id)
 );
 
+-- New jobs that matched an alert; notified_at is NULL until the user is emailed
+CREATE TABLE IF NOT EXISTS alert_matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL,
+    catalog_job_id INTEGER NOT NULL,
+    match_score REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notified_at TIMESTAMP,
+    UNIQUE(alert_id, catalog_job_id),
+    FOREIGN KEY (alert_id) REFERENCES search_alerts(id),
+    FOREIGN KEY (catalog_job_id) REFERENCES job_catalog(id)
+);
+
+-- New catalog jobs waiting to be matched against the alerts (off the request path)
+CREATE TABLE IF NOT EXISTS alert_job_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    catalog_job_id INTEGER NOT NULL,
+    seen_by INTEGER, -- user whose search brought the job in
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Job Catalog (every scraped job, with matcher features computed at ingestion)
+CREATE TABLE IF NOT EXISTS job_catalog (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fingerprint TEXT UNIQUE NOT NULL,
+    job_title TEXT NOT NULL,
+    company TEXT,
+    location TEXT,
+    description TEXT,
+    skills TEXT, -- JSON array as string
+    platform TEXT,
+    url TEXT,
+    posted_date TEXT,
+    salary TEXT,
+    job_type TEXT,
+    features TEXT, -- JSON of precomputed matcher features
+    dedup_signature BLOB, -- MinHash signature for near-duplicate detection
+    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Inverted index over the catalog: skill IDs and title tokens -> jobs
+CREATE TABLE IF NOT EXISTS job_catalog_terms (
+    term TEXT NOT NULL, -- 'skill:<id>' or 'title:<token>'
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (term, job_id),
+    FOREIGN KEY (job_id) REFERENCES job_catalog(id)
+) WITHOUT ROWID;
+
+-- MinHash LSH band keys of catalog jobs, to find near-duplicate postings
+CREATE TABLE IF NOT EXISTS job_catalog_bands (
+    band INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (band, job_id),
+    FOREIGN KEY (job_id) REFERENCES job_catalog(id)
+) WITHOUT ROWID;
+
+-- Parsed CVs by content hash, so re-uploading a CV skips text extraction
+CREATE TABLE IF NOT EXISTS cv_parse_cache (
+    content_hash TEXT PRIMARY KEY, -- sha256 of the parser version and file bytes
+    parsed_data TEXT, -- JSON of the parse result
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Last response of each polled job board feed, for conditional refreshes
+CREATE TABLE IF NOT EXISTS feed_cache (
+    feed_key TEXT PRIMARY KEY, -- sha256 of the URL and query parameters
+    url TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB, -- zlib-compressed response body
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Saved Jobs (User Bookmarks)
 CREATE TABLE IF NOT EXISTS saved_jobs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -65,8 +169,31 @@ CREATE TABLE IF NOT EXISTS password_reset_tokens (
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Outgoing Email Queue (delivered in batches by email_utils.MailSender)
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT, -- 'password_reset', 'welcome', 'job_alert'
+    to_email TEXT NOT NULL,
+    message TEXT NOT NULL, -- Complete MIME message
+    status TEXT NOT NULL DEFAULT 'pending', -- 'pending', 'sending', 'sent', 'failed'
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL,
+    last_error TEXT,
+    claimed_by TEXT,
+    claimed_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_searches_user ON searches(user_id);
 CREATE INDEX IF NOT EXISTS idx_job_results_search ON job_results(search_id);
+CREATE INDEX IF NOT EXISTS idx_job_catalog_last_seen ON job_catalog(last_seen_at);
+CREATE INDEX IF NOT EXISTS idx_job_catalog_terms_job ON job_catalog_terms(job_id);
+CREATE INDEX IF NOT EXISTS idx_job_catalog_bands_job ON job_catalog_bands(job_id);
+CREATE INDEX IF NOT EXISTS idx_cv_parse_cache_created ON cv_parse_cache(created_at);
 CREATE INDEX IF NOT EXISTS idx_saved_jobs_user ON saved_jobs(user_id);
+CREATE INDEX IF NOT EXISTS idx_search_alerts_user ON search_alerts(user_id);
+CREATE INDEX IF NOT EXISTS idx_alert_matches_pending ON alert_matches(notified_at);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(status, next_attempt_at);
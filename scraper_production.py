@@ -2,9 +2,11 @@
 Production-Grade Job Scraper
 Enhanced scraper with validation, logging, and better error handling.
 """
-import requests
-from bs4 import BeautifulSoup
+import os
+import logging
 import time
+from contextlib import closing
+from itertools import islice
 from urllib.parse import quote_plus, urljoin
 import re
 from validators.job_validator import JobValidator
@@ -15,16 +17,32 @@ from utils.text_processor import (
     clean_company_name, 
     clean_location
 )
+from utils.dedup import deduplicate_jobs
+from utils.query_matcher import QueryMatcher
+from utils.job_features import attach_job_features
+from utils.tracing import span, traced
 from fetchers.adzuna import AdzunaFetcher
+from fetchers.feed_cache import fetch_json, stream_json_items
+from fetchers.feed_diff import process_listings
 
 from fetchers.jobicy import JobicyFetcher
 from fetchers.wuzzuf import WuzzufFetcher
 
+logger = logging.getLogger('jobflow.scraper')
+
+# Pause between platforms, to stay polite to the boards
+PLATFORM_DELAY = float(os.getenv('SCRAPER_PLATFORM_DELAY', '0.5'))
+
 class ProductionJobScraper:
     """
     Production-grade multi-platform job scraper with validation and logging.
     """
     
+    # Board endpoints (overridable, e.g. to point at a local stub server)
+    REMOTEOK_URL = os.getenv('REMOTEOK_API_URL', "https://remoteok.com/api")
+    REMOTIVE_URL = os.getenv('REMOTIVE_API_URL', "https://remotive.com/api/remote-jobs")
+    ARBEITNOW_URL = os.getenv('ARBEITNOW_API_URL', "https://www.arbeitnow.com/api/job-board-api")
+    
     def __init__(self, enable_validation=True, enable_logging=True):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -35,6 +53,137 @@ class ProductionJobScraper:
         self.validator = JobValidator() if enable_validation else None
         self.logger = ScraperLogger() if enable_logging else None
         
+    def _validate(self, job_data):
+        with span('validate'):
+            return self.validator.validate_job(job_data)
+    
+    # Listing -> job dict builders; process_listings() only runs them for
+    # listings that are new or changed since they were last processed
+    
+    def _remoteok_job(self, job):
+        # Get raw description
+        raw_description = job.get('description', '')
+        
+        # Clean and process description
+        clean_desc = clean_description(raw_description, max_length=1000)
+        
+        # Extract skills from description and tags
+        tags = job.get('tags', [])
+        desc_skills = extract_skills_from_text(raw_description)
+        all_skills = list(set(tags + desc_skills))[:15]  # Combine and limit
+        
+        return {
+            'title': job.get('position', 'N/A'),
+            'company': clean_company_name(job.get('company', 'N/A')),
+            'location': clean_location(job.get('location', 'Remote')),
+            'description': clean_desc,
+            'skills': all_skills,
+            'platform': "RemoteOK",
+            'url': job.get('url', ''),
+            'posted_date': job.get('date', 'N/A'),
+            'salary': f"${job.get('salary_min', 'N/A')}-${job.get('salary_max', 'N/A')}" if job.get('salary_min') else 'Not specified',
+            'job_type': 'Remote'
+        }
+    
+    def _remotive_job(self, job):
+        # Get raw description
+        raw_description = job.get('description', '')
+        
+        # Clean description
+        clean_desc = clean_description(raw_description, max_length=1000)
+        
+        # Extract skills
+        desc_skills = extract_skills_from_text(raw_description)
+        category = job.get('category', 'General')
+        job_type = job.get('job_type', 'Full-time')
+        all_skills = list(set([category, job_type] + desc_skills))[:15]
+        
+        return {
+            'title': job.get('title', 'N/A'),
+            'company': clean_company_name(job.get('company_name', 'N/A')),
+            'location': 'Remote',
+            'description': clean_desc,
+            'skills': all_skills,
+            'platform': "Remotive",
+            'url': job.get('url', ''),
+            'posted_date': job.get('publication_date', 'N/A'),
+            'salary': job.get('salary', 'Not specified'),
+            'job_type': job_type
+        }
+    
+    def _arbeitnow_job(self, job):
+        # Get raw description
+        raw_description = job.get('description', '')
+        
+        # Clean description
+        clean_desc = clean_description(raw_description, max_length=1000)
+        
+        # Extract and combine skills
+        tags = job.get('tags', [])
+        desc_skills = extract_skills_from_text(raw_description)
+        all_skills = list(set(tags + desc_skills))[:15]
+        
+        return {
+            'title': job.get('title', 'N/A'),
+            'company': clean_company_name(job.get('company_name', 'N/A')),
+            'location': clean_location(job.get('location', 'Remote')),
+            'description': clean_desc,
+            'skills': all_skills,
+            'platform': "Arbeitnow",
+            'url': job.get('url', ''),
+            'posted_date': job.get('created_at', 'N/A'),
+            'salary': 'Not specified',
+            'job_type': job.get('job_types', ['Full-time'])[0] if job.get('job_types') else 'Full-time'
+        }
+    
+    def _adzuna_job(self, job):
+        # Adzuna jobs are already standardized by the fetcher, but we ensure fields match
+        return {
+            'title': job.get('title', 'N/A'),
+            'company': clean_company_name(job.get('company', 'N/A')),
+            'location': clean_location(job.get('location', 'Remote')),
+            'description': clean_description(job.get('description', ''), max_length=1000),
+            'skills': job.get('skills', []),
+            'platform': "Adzuna",
+            'url': job.get('url', ''),
+            'posted_date': job.get('created', 'N/A'),
+            'salary': job.get('salary', 'Not specified'),
+            'job_type': job.get('contract_type', 'Full-time')
+        }
+    
+    def _jobicy_job(self, job):
+        job_data = {
+            'title': job.get('title', 'N/A'),
+            'company': clean_company_name(job.get('company', 'N/A')),
+            'location': clean_location(job.get('location', 'Remote')),
+            'description': clean_description(job.get('description', ''), max_length=1000),
+            'skills': job.get('skills', []) + extract_skills_from_text(job.get('description', '')),
+            'platform': "Jobicy",
+            'url': job.get('url', ''),
+            'posted_date': job.get('posted_date', 'N/A'),
+            'salary': job.get('salary', 'Not specified'),
+            'job_type': 'Remote'
+        }
+        
+        # Deduplicate skills
+        job_data['skills'] = list(set(job_data['skills']))[:15]
+        return job_data
+    
+    def _wuzzuf_job(self, job):
+        return {
+            'title': job.get('title', 'N/A'),
+            'company': clean_company_name(job.get('company', 'N/A')),
+            'location': clean_location(job.get('location', 'Egypt')),
+            'description': clean_description(job.get('description', ''), max_length=1000),
+            'skills': job.get('skills', []),
+            'platform': "Wuzzuf",
+            'url': job.get('url', ''),
+            'posted_date': job.get('posted_date', 'N/A'),
+            'salary': job.get('salary', 'Confidential'),
+            'job_type': 'Full-time'
+        }
+        
+    @traced('scrape.remoteok')
     def scrape_remoteok(self, keywords, limit=10):
         """Scrape RemoteOK with validation and improved text processing"""
         platform = "RemoteOK"
@@ -44,64 +193,29 @@ class ProductionJobScraper:
             self.logger.log_platform_attempt(platform)
         
         try:
-            url = "https://remoteok.com/api"
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            job_listings = data[1:] if len(data) > 1 else []
+            with span('fetch.remoteok'):
+                listings = stream_json_items(self.REMOTEOK_URL, headers=self.headers, timeout=self.timeout, feed='remoteok')
             
-            keywords_lower = [k.lower() for k in keywords]
-            
-            for job in job_listings[:50]:
-                if len(jobs) >= limit:
-                    break
-                    
-                job_text = f"{job.get('position', '')} {job.get('description', '')} {' '.join(job.get('tags', []))}".lower()
-                
-                if any(keyword in job_text for keyword in keywords_lower):
-                    # Get raw description
-                    raw_description = job.get('description', '')
-                    
-                    # Clean and process description
-                    clean_desc = clean_description(raw_description, max_length=1000)
-                    
-                    # Extract skills from description and tags
-                    tags = job.get('tags', [])
-                    desc_skills = extract_skills_from_text(raw_description)
-                    all_skills = list(set(tags + desc_skills))[:15]  # Combine and limit
-                    
-                    job_data = {
-                        'title': job.get('position', 'N/A'),
-                        'company': clean_company_name(job.get('company', 'N/A')),
-                        'location': clean_location(job.get('location', 'Remote')),
-                        'description': clean_desc,
-                        'skills': all_skills,
-                        'platform': platform,
-                        'url': job.get('url', ''),
-                        'posted_date': job.get('date', 'N/A'),
-                        'salary': f"${job.get('salary_min', 'N/A')}-${job.get('salary_max', 'N/A')}" if job.get('salary_min') else 'Not specified',
-                        'job_type': 'Remote'
-                    }
-                    
-                    # Validate if enabled
-                    if self.validator:
-                        is_valid, issues = self.validator.validate_job(job_data)
-                        if is_valid:
-                            jobs.append(job_data)
-                    else:
-                        jobs.append(job_data)
+            # The first element is feed metadata; parsing stops once limit jobs are found
+            with closing(listings):
+                jobs = process_listings(
+                    platform, islice(listings, 1, 51), self._remoteok_job, self._validate if self.validator else None,
+                    keywords=keywords, limit=limit,
+                    search_fields=lambda job: (job.get('position'), job.get('tags'), job.get('description')),
+                )
             
             if self.logger:
                 self.logger.log_platform_success(platform, len(jobs))
                 
         except Exception as e:
             if self.logger:
-                self.logger.log_platform_failure(platform, str(e))
-            print(f"✗ {platform} error: {str(e)}")
+                self.logger.log_platform_failure(platform, e)
+            else:
+                logger.warning(f"✗ {platform} error: {e}", extra={'platform': platform, 'error_class': type(e).__name__})
             
         return jobs
     
+    @traced('scrape.remotive')
     def scrape_remotive(self, keywords, limit=10):
         """Scrape Remotive with validation and improved text processing"""
         platform = "Remotive"
@@ -111,64 +225,29 @@ class ProductionJobScraper:
             self.logger.log_platform_attempt(platform)
         
         try:
-            url = "https://remotive.com/api/remote-jobs"
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            job_listings = data.get('jobs', [])
+            with span('fetch.remotive'):
+                listings = stream_json_items(self.REMOTIVE_URL, path=('jobs',), headers=self.headers,
+                                             timeout=self.timeout, feed='remotive')
             
-            keywords_lower = [k.lower() for k in keywords]
-            
-            for job in job_listings:
-                if len(jobs) >= limit:
-                    break
-                    
-                job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('category', '')}".lower()
-                
-                if any(keyword in job_text for keyword in keywords_lower):
-                    # Get raw description
-                    raw_description = job.get('description', '')
-                    
-                    # Clean description
-                    clean_desc = clean_description(raw_description, max_length=1000)
-                    
-                    # Extract skills
-                    desc_skills = extract_skills_from_text(raw_description)
-                    category = job.get('category', 'General')
-                    job_type = job.get('job_type', 'Full-time')
-                    all_skills = list(set([category, job_type] + desc_skills))[:15]
-                    
-                    job_data = {
-                        'title': job.get('title', 'N/A'),
-                        'company': clean_company_name(job.get('company_name', 'N/A')),
-                        'location': 'Remote',
-                        'description': clean_desc,
-                        'skills': all_skills,
-                        'platform': platform,
-                        'url': job.get('url', ''),
-                        'posted_date': job.get('publication_date', 'N/A'),
-                        'salary': job.get('salary', 'Not specified'),
-                        'job_type': job_type
-                    }
-                    
-                    if self.validator:
-                        is_valid, issues = self.validator.validate_job(job_data)
-                        if is_valid:
-                            jobs.append(job_data)
-                    else:
-                        jobs.append(job_data)
+            with closing(listings):
+                jobs = process_listings(
+                    platform, listings, self._remotive_job, self._validate if self.validator else None,
+                    keywords=keywords, limit=limit,
+                    search_fields=lambda job: (job.get('title'), job.get('category'), job.get('description')),
+                )
             
             if self.logger:
                 self.logger.log_platform_success(platform, len(jobs))
                 
         except Exception as e:
             if self.logger:
-                self.logger.log_platform_failure(platform, str(e))
-            print(f"✗ {platform} error: {str(e)}")
+                self.logger.log_platform_failure(platform, e)
+            else:
+                logger.warning(f"✗ {platform} error: {e}", extra={'platform': platform, 'error_class': type(e).__name__})
             
         return jobs
     
+    @traced('scrape.arbeitnow')
     def scrape_arbeitnow(self, keywords, limit=10):
         """Scrape Arbeitnow with validation and improved text processing"""
         platform = "Arbeitnow"
@@ -178,63 +257,28 @@ class ProductionJobScraper:
             self.logger.log_platform_attempt(platform)
         
         try:
-            url = "https://www.arbeitnow.com/api/job-board-api"
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
+            with span('fetch.arbeitnow'):
+                data = fetch_json(self.ARBEITNOW_URL, headers=self.headers, timeout=self.timeout, feed='arbeitnow')
             job_listings = data.get('data', [])
             
-            keywords_lower = [k.lower() for k in keywords]
-            
-            for job in job_listings:
-                if len(jobs) >= limit:
-                    break
-                    
-                job_text = f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('tags', []))}".lower()
-                
-                if any(keyword in job_text for keyword in keywords_lower):
-                    # Get raw description
-                    raw_description = job.get('description', '')
-                    
-                    # Clean description
-                    clean_desc = clean_description(raw_description, max_length=1000)
-                    
-                    # Extract and combine skills
-                    tags = job.get('tags', [])
-                    desc_skills = extract_skills_from_text(raw_description)
-                    all_skills = list(set(tags + desc_skills))[:15]
-                    
-                    job_data = {
-                        'title': job.get('title', 'N/A'),
-                        'company': clean_company_name(job.get('company_name', 'N/A')),
-                        'location': clean_location(job.get('location', 'Remote')),
-                        'description': clean_desc,
-                        'skills': all_skills,
-                        'platform': platform,
-                        'url': job.get('url', ''),
-                        'posted_date': job.get('created_at', 'N/A'),
-                        'salary': 'Not specified',
-                        'job_type': job.get('job_types', ['Full-time'])[0] if job.get('job_types') else 'Full-time'
-                    }
-                    
-                    if self.validator:
-                        is_valid, issues = self.validator.validate_job(job_data)
-                        if is_valid:
-                            jobs.append(job_data)
-                    else:
-                        jobs.append(job_data)
+            jobs = process_listings(
+                platform, job_listings, self._arbeitnow_job, self._validate if self.validator else None,
+                keywords=keywords, limit=limit, id_field='slug',
+                search_fields=lambda job: (job.get('title'), job.get('tags'), job.get('description')),
+            )
             
             if self.logger:
                 self.logger.log_platform_success(platform, len(jobs))
                 
         except Exception as e:
             if self.logger:
-                self.logger.log_platform_failure(platform, str(e))
-            print(f"✗ {platform} error: {str(e)}")
+                self.logger.log_platform_failure(platform, e)
+            else:
+                logger.warning(f"✗ {platform} error: {e}", extra={'platform': platform, 'error_class': type(e).__name__})
             
         return jobs
 
+    @traced('scrape.adzuna')
     def scrape_adzuna(self, query, location, limit=10):
         """Fetch jobs from Adzuna API"""
         platform = "Adzuna"
@@ -257,41 +301,24 @@ class ProductionJobScraper:
                 # But let's leave logic here just in case.
                 country = 'za' # South Africa is closest supported African country usually, but let's stick to 'us' default or specific if known
                 
-            raw_jobs = fetcher.search_jobs(query, location=country, results_per_page=limit)
+            with span('fetch.adzuna'):
+                raw_jobs = fetcher.search_jobs(query, location=country, results_per_page=limit)
+            
+            jobs = process_listings(platform, raw_jobs, self._adzuna_job, self._validate if self.validator else None)
             
-            for job in raw_jobs:
-                # Adzuna jobs are already standardized by the fetcher, but we ensure fields match
-                job_data = {
-                    'title': job.get('title', 'N/A'),
-                    'company': clean_company_name(job.get('company', 'N/A')),
-                    'location': clean_location(job.get('location', 'Remote')),
-                    'description': clean_description(job.get('description', ''), max_length=1000),
-                    'skills': job.get('skills', []),
-                    'platform': platform,
-                    'url': job.get('url', ''),
-                    'posted_date': job.get('created', 'N/A'),
-                    'salary': job.get('salary', 'Not specified'),
-                    'job_type': job.get('contract_type', 'Full-time')
-                }
-                
-                if self.validator:
-                    is_valid, issues = self.validator.validate_job(job_data)
-                    if is_valid:
-                        jobs.append(job_data)
-                else:
-                    jobs.append(job_data)
-                    
             if self.logger:
                 self.logger.log_platform_success(platform, len(jobs))
                 
         except Exception as e:
             if self.logger:
-                self.logger.log_platform_failure(platform, str(e))
-            print(f"✗ {platform} error: {str(e)}")
+                self.logger.log_platform_failure(platform, e)
+            else:
+                logger.warning(f"✗ {platform} error: {e}", extra={'platform': platform, 'error_class': type(e).__name__})
             
         return jobs
 
 
+    @traced('scrape.jobicy')
     def scrape_jobicy(self, query, limit=10):
         """Fetch jobs from Jobicy API"""
         platform = "Jobicy"
@@ -301,42 +328,23 @@ class ProductionJobScraper:
             
         try:
             fetcher = JobicyFetcher()
-            raw_jobs = fetcher.search_jobs(query=query, count=limit)
+            with span('fetch.jobicy'):
+                raw_jobs = fetcher.search_jobs(query=query, count=limit)
+            
+            jobs = process_listings(platform, raw_jobs, self._jobicy_job, self._validate if self.validator else None)
             
-            for job in raw_jobs:
-                job_data = {
-                    'title': job.get('title', 'N/A'),
-                    'company': clean_company_name(job.get('company', 'N/A')),
-                    'location': clean_location(job.get('location', 'Remote')),
-                    'description': clean_description(job.get('description', ''), max_length=1000),
-                    'skills': job.get('skills', []) + extract_skills_from_text(job.get('description', '')),
-                    'platform': platform,
-                    'url': job.get('url', ''),
-                    'posted_date': job.get('posted_date', 'N/A'),
-                    'salary': job.get('salary', 'Not specified'),
-                    'job_type': 'Remote'
-                }
-                
-                # Deduplicate skills
-                job_data['skills'] = list(set(job_data['skills']))[:15]
-                
-                if self.validator:
-                    is_valid, issues = self.validator.validate_job(job_data)
-                    if is_valid:
-                        jobs.append(job_data)
-                else:
-                    jobs.append(job_data)
-                    
             if self.logger:
                 self.logger.log_platform_success(platform, len(jobs))
                 
         except Exception as e:
             if self.logger:
-                self.logger.log_platform_failure(platform, str(e))
-            print(f"✗ {platform} error: {str(e)}")
+                self.logger.log_platform_failure(platform, e)
+            else:
+                logger.warning(f"✗ {platform} error: {e}", extra={'platform': platform, 'error_class': type(e).__name__})
             
         return jobs
 
+    @traced('scrape.wuzzuf')
     def scrape_wuzzuf(self, query, limit=10):
         """Scrape jobs from Wuzzuf (Egypt)"""
         platform = "Wuzzuf"
@@ -346,36 +354,19 @@ class ProductionJobScraper:
             
         try:
             fetcher = WuzzufFetcher()
-            raw_jobs = fetcher.search_jobs(query, limit=limit)
+            with span('fetch.wuzzuf'):
+                raw_jobs = fetcher.search_jobs(query, limit=limit)
+            
+            jobs = process_listings(platform, raw_jobs, self._wuzzuf_job, self._validate if self.validator else None)
             
-            for job in raw_jobs:
-                job_data = {
-                    'title': job.get('title', 'N/A'),
-                    'company': clean_company_name(job.get('company', 'N/A')),
-                    'location': clean_location(job.get('location', 'Egypt')),
-                    'description': clean_description(job.get('description', ''), max_length=1000),
-                    'skills': job.get('skills', []),
-                    'platform': platform,
-                    'url': job.get('url', ''),
-                    'posted_date': job.get('posted_date', 'N/A'),
-                    'salary': job.get('salary', 'Confidential'),
-                    'job_type': 'Full-time'
-                }
-                
-                if self.validator:
-                    is_valid, issues = self.validator.validate_job(job_data)
-                    if is_valid:
-                        jobs.append(job_data)
-                else:
-                    jobs.append(job_data)
-                    
             if self.logger:
                 self.logger.log_platform_success(platform, len(jobs))
                 
         except Exception as e:
             if self.logger:
-                self.logger.log_platform_failure(platform, str(e))
-            print(f"✗ {platform} error: {str(e)}")
+                self.logger.log_platform_failure(platform, e)
+            else:
+                logger.warning(f"✗ {platform} error: {e}", extra={'platform': platform, 'error_class': type(e).__name__})
             
         return jobs
 
@@ -392,18 +383,16 @@ def scrape_jobs(query, location='', max_jobs=20):
     Returns:
         List of validated job dictionaries
     """
-    print(f"\n{'='*70}")
-    print(f"🔍 Production Job Search")
-    print(f"{'='*70}")
-    print(f"Query: '{query}'")
-    print(f"Location: '{location or 'Any location'}'")
-    print(f"Target: {max_jobs} jobs")
-    print(f"{'='*70}\n")
+    logger.info(f"🔍 Production job search: '{query}'", extra={
+        'query': query, 'location': location or 'Any location', 'max_jobs': max_jobs,
+    })
     
     # Extract keywords
     keywords = [word.strip() for word in query.split() if len(word.strip()) > 2]
     if not keywords:
         keywords = ['developer']
+    # Compiled once, shared by every platform's keyword filter
+    keywords = QueryMatcher(keywords)
     
     scraper = ProductionJobScraper(enable_validation=True, enable_logging=True)
     all_jobs = []
@@ -430,18 +419,15 @@ def scrape_jobs(query, location='', max_jobs=20):
         try:
             jobs = scrape_func()
             all_jobs.extend(jobs)
-            time.sleep(0.5)
+            time.sleep(PLATFORM_DELAY)
         except Exception as e:
-            print(f"✗ {platform_name} failed: {e}")
+            logger.warning(f"✗ {platform_name} failed: {e}", extra={
+                'platform': platform_name, 'error_class': type(e).__name__,
+            })
     
-    # Remove duplicates
-    seen = set()
-    unique_jobs = []
-    for job in all_jobs:
-        key = (job['title'].lower().strip(), job['company'].lower().strip())
-        if key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
+    # Remove duplicates, including the same posting syndicated to several boards
+    with span('dedup'):
+        unique_jobs = deduplicate_jobs(all_jobs)
     
     # Limit to max_jobs
     result = unique_jobs[:max_jobs]
@@ -450,14 +436,18 @@ def scrape_jobs(query, location='', max_jobs=20):
     for i, job in enumerate(result, 1):
         job['id'] = i
     
+    # Compute matcher features once, as the jobs enter the system
+    with span('features'):
+        attach_job_features(result)
+    
     # Log summary
     if scraper.logger:
         scraper.logger.log_search_summary(query, len(result))
         scraper.logger.print_summary()
     
-    print(f"\n{'='*70}")
-    print(f"✅ Search Complete: {len(result)} validated jobs")
-    print(f"{'='*70}\n")
+    logger.debug(f"✅ Search complete: {len(result)} validated jobs", extra={
+        'query': query, 'jobs': len(result),
+    })
     
     return result
 
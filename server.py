@@ -1,18 +1,34 @@
-from flask import Flask, send_from_directory
+from flask import Flask, Response, g, send_from_directory, request, jsonify
 from flask_cors import CORS
 import os
+import logging
 import database as db
+import email_utils
+import alerts
+from utils.tracing import start_trace, finish_trace, log_trace
+from utils import metrics
+from utils.logging_config import configure_logging
 from routes.auth import auth_bp
 from routes.user import user_bp
 from routes.jobs import jobs_bp
+from routes.admin import admin_bp, is_admin
+from utils import profiling
 
 # Load environment variables
 try:
     from dotenv import load_dotenv
     load_dotenv()
-    print("✓ Loaded environment variables")
+    dotenv_loaded = True
 except ImportError:
-    print("⚠ python-dotenv not installed, using system env or defaults")
+    dotenv_loaded = False
+
+# Queue-based structured logging for every 'jobflow.*' logger (LOG_LEVEL, LOG_FILE, ...)
+configure_logging()
+logger = logging.getLogger('jobflow.server')
+if dotenv_loaded:
+    logger.debug("✓ Loaded environment variables")
+else:
+    logger.warning("⚠ python-dotenv not installed, using system env or defaults")
 
 app = Flask(__name__, static_folder='src')
 
@@ -22,16 +38,128 @@ app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production (HTTPS)
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
+# Send per-stage timings back in a Server-Timing header (visible in browser dev tools)
+app.config['SERVER_TIMING'] = os.getenv('SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+
 # CORS - Allow credentials for cookies
-CORS(app, supports_credentials=True)
+CORS(app, supports_credentials=True, expose_headers=['Server-Timing', 'X-Profile-Id'])
 
-# Initialize database
-db.init_database()
 
 # Register Blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(user_bp, url_prefix='/api/user')
 app.register_blueprint(jobs_bp, url_prefix='/api') # Jobs routes were mixed, some /api/recommend, some /api/user/searches
+app.register_blueprint(admin_bp, url_prefix='/api/admin')
+
+# Initialize database on the first request (or in warmup), not at import
+@app.before_request
+def initialize_database():
+    db.ensure_database()
+
+# Deliver the email outbox from a background thread in each worker
+@app.before_request
+def start_mail_sender():
+    email_utils.start_sender()
+
+# Match new catalog jobs against saved-search alerts from a background thread in each worker
+@app.before_request
+def start_alert_matcher():
+    alerts.start_matcher()
+
+# Synthetic request pushed through the matcher once during warmup
+WARMUP_PROFILE = {
+    'job_title': 'Python Developer',
+    'skills': ['Python', 'SQL', 'Docker'],
+    'experience': 3,
+}
+WARMUP_JOB = {
+    'id': 'warmup',
+    'title': 'Senior Python Developer',
+    'company': 'Warmup',
+    'description': 'Python, Django and PostgreSQL. 3+ years of experience with Docker and AWS.',
+    'skills': ['Python', 'Django', 'PostgreSQL'],
+    'platform': 'Warmup',
+}
+
+def warmup():
+    """
+    Load heavy dependencies and prime caches ahead of the first request.
+    Called in each worker by gunicorn's post_worker_init hook, or once in the
+    master before forking when the app is preloaded (see gunicorn.conf.py).
+    With CATALOG_MATCHING=ann this also builds the catalog ANN snapshot.
+    """
+    db.ensure_database()
+    
+    from routes.jobs import load_pipeline, match_jobs
+    load_pipeline()
+    
+    # One throwaway match runs the whole scoring path: skill automaton,
+    # vectorizer, experience rules and numpy kernels
+    from utils.text_processor import extract_skills_from_text
+    extract_skills_from_text(WARMUP_JOB['description'])
+    match_jobs(WARMUP_PROFILE, [dict(WARMUP_JOB)], top_k=1)
+    
+    from matcher_enhanced import CATALOG_MATCHING, catalog_ann_index
+    if CATALOG_MATCHING == 'ann':
+        catalog_ann_index()
+    
+    # CV parsing and PDF export
+    import cv_parser  # noqa: F401
+    import PyPDF2  # noqa: F401
+    import docx  # noqa: F401
+    import reportlab.platypus  # noqa: F401
+    import bs4  # noqa: F401
+
+# Request timing
+@app.before_request
+def begin_request_trace():
+    if request.path.startswith('/api/'):
+        start_trace(request.endpoint or request.path)
+
+@app.after_request
+def end_request_trace(response):
+    trace = finish_trace()
+    if trace is not None:
+        log_trace(trace, method=request.method, path=request.path, status=response.status_code)
+        endpoint = request.endpoint or 'unmatched'
+        metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        metrics.HTTP_SECONDS.observe(trace.total, endpoint=endpoint)
+        for stage, (seconds, _) in trace.spans.items():
+            metrics.STAGE_SECONDS.observe(seconds, stage=stage)
+        if app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = trace.server_timing()
+    return response
+
+# Opt-in profiling: admins send "X-Profile: 1", or PROFILE_SAMPLE_RATE samples recommendations
+@app.before_request
+def begin_request_profile():
+    trigger = None
+    if request.headers.get(profiling.PROFILE_HEADER) and is_admin():
+        trigger = 'header'
+    elif profiling.sampled(request.path):
+        trigger = 'sample'
+    if trigger:
+        g.profiler = profiling.RequestProfiler.start(trigger)
+
+@app.after_request
+def end_request_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profile_id = profiler.save(request.endpoint, request.method, request.path, response.status_code)
+        response.headers['X-Profile-Id'] = profile_id
+    return response
+
+@app.teardown_request
+def stop_request_profile(error=None):
+    # Unhandled errors skip after_request; never leave the profiler running
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+
+# Prometheus metrics, summed across workers when METRICS_DIR is set
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 # Serve static files (Frontend)
 @app.route('/')
@@ -53,13 +181,13 @@ def not_found_error(error):
 
 @app.errorhandler(500)
 def internal_error(error):
-    print(f"Internal server error: {str(error)}")
+    logger.error(f"Internal server error: {str(error)}")
     return jsonify({"status": "error", "message": "Internal server error"}), 500
 
 @app.errorhandler(Exception)
 def handle_exception(error):
     # Log the error
-    print(f"Unhandled exception: {str(error)}")
+    logger.exception(f"Unhandled exception: {str(error)}")
     # Return JSON for API routes
     if request.path.startswith('/api/'):
         return jsonify({"status": "error", "message": str(error)}), 500
@@ -67,7 +195,8 @@ def handle_exception(error):
     return jsonify({"status": "error", "message": "An error occurred"}), 500
 
 if __name__ == '__main__':
-    print("Starting Neuronix AI JobFlow Server...")
+    logger.info("Starting Neuronix AI JobFlow Server...")
+    db.ensure_database()
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV', 'development') == 'development'
     app.run(debug=debug, host='0.0.0.0', port=port)
@@ -0,0 +1,65 @@
+"""
+Shared fixtures. The environment is set before any project module is
+imported, so nothing touches jobs.db or writes log files.
+"""
+import os
+import tempfile
+
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='jobflow-tests-'), 'jobs.db')
+os.environ['LOG_FILE'] = ''
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Tests drive the outbox and the alert matcher directly
+os.environ['MAIL_SENDER'] = 'off'
+os.environ['ALERT_MATCHER'] = 'off'
+
+import pytest
+
+from benchmarks.corpus import generate_jobs
+from benchmarks.stub_server import StubBoardServer
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """The database module, pointed at a fresh database for this test."""
+    import database
+    monkeypatch.setattr(database, 'DATABASE_PATH', tmp_path / 'jobs.db')
+    monkeypatch.setattr(database, '_initialized', True)
+    database.init_database()
+    return database
+
+
+@pytest.fixture
+def corpus_jobs():
+    """200 synthetic jobs, the same ones every run."""
+    return list(generate_jobs(200, seed=7))
+
+
+@pytest.fixture(scope='session')
+def board_server():
+    """Local job boards serving the recorded fixtures; the scrapers are pointed at them."""
+    import scraper_production
+
+    server = StubBoardServer(listings=40).start()
+    server.apply()
+    scraper_production.PLATFORM_DELAY = 0
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(db, board_server):
+    """Flask test client for the app, on a fresh database."""
+    import server
+
+    server.app.config['TESTING'] = True
+    return server.app.test_client()
+
+
+@pytest.fixture
+def user_client(client):
+    """Test client signed in as a new user."""
+    response = client.post('/api/auth/signup', json={
+        'email': 'jane@example.com', 'password': 'password123', 'full_name': 'Jane Doe',
+    })
+    assert response.status_code == 200
+    return client
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+import alerts
+from matcher_enhanced import EnhancedJobMatcher
+
+
+PROFILES = [
+    {'job_title': 'Python Developer', 'skills': ['Python', 'Django'], 'experience': 3},
+    {'job_title': 'Frontend Developer', 'skills': 'React, TypeScript', 'experience': '8 years'},
+    {'skills': ['Go'], 'keywords': 'kubernetes platform'},
+    {},
+]
+
+
+def _user_with_alert(db, email, profile, min_score=0):
+    user_id = db.create_user(email, 'hash', email.split('@')[0])
+    search_id = db.save_search(user_id, 'form', profile, '', match_profile=profile)
+    db.save_alert(user_id, search_id, profile, min_score)
+    return user_id
+
+
+def _rows(db, query):
+    conn = db.get_db_connection()
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+def test_score_matrix_matches_per_user_scoring(corpus_jobs):
+    matcher = EnhancedJobMatcher()
+    contexts = [matcher.build_user_context(profile) for profile in PROFILES]
+
+    matrix = matcher.score_matrix(contexts, corpus_jobs)
+
+    expected = [matcher.combine_scores(matcher.score_components(context, corpus_jobs)) for context in contexts]
+    np.testing.assert_allclose(matrix, np.vstack(expected), rtol=1e-9, atol=1e-9)
+
+
+def test_score_matrix_with_no_jobs():
+    matcher = EnhancedJobMatcher()
+
+    assert matcher.score_matrix([matcher.build_user_context(PROFILES[0])], []).shape == (1, 0)
+
+
+def test_new_jobs_are_matched_off_the_request_path(db, corpus_jobs):
+    searcher = _user_with_alert(db, 'searcher@example.com', PROFILES[0])
+    subscriber = _user_with_alert(db, 'subscriber@example.com', PROFILES[0], min_score=35)
+    new_ids = db.save_catalog_jobs(corpus_jobs[:60])
+
+    alerts.queue_new_jobs(new_ids, seen_by=searcher)
+    assert not _rows(db, "SELECT * FROM alert_matches")
+
+    assert alerts.alert_matcher.drain() == len(new_ids)
+    matches = _rows(db, "SELECT m.match_score, a.user_id FROM alert_matches m JOIN search_alerts a ON a.id = m.alert_id")
+    assert matches
+    assert {m['user_id'] for m in matches} == {subscriber}
+    assert all(m['match_score'] >= 35 for m in matches)
+    assert len(matches) < len(new_ids)
+    assert db.claim_alert_jobs() == []
+
+
+def test_failed_matching_keeps_the_jobs_queued(db, corpus_jobs, monkeypatch):
+    _user_with_alert(db, 'subscriber@example.com', PROFILES[0])
+    new_ids = db.save_catalog_jobs(corpus_jobs[:5])
+    alerts.queue_new_jobs(new_ids)
+
+    def broken(catalog_ids, seen_by=None):
+        raise RuntimeError('matcher down')
+    monkeypatch.setattr(alerts, 'process_new_jobs', broken)
+    with pytest.raises(RuntimeError):
+        alerts.match_queued_jobs()
+
+    assert sorted(catalog_id for catalog_id, _ in db.claim_alert_jobs()) == sorted(new_ids)
+
+
+def test_a_failed_group_does_not_drop_the_others(db, corpus_jobs, monkeypatch):
+    first = _user_with_alert(db, 'first@example.com', PROFILES[0])
+    second = _user_with_alert(db, 'second@example.com', PROFILES[1])
+    new_ids = db.save_catalog_jobs(corpus_jobs[:6])
+    alerts.queue_new_jobs(new_ids[:3], seen_by=first)
+    alerts.queue_new_jobs(new_ids[3:], seen_by=second)
+    matched = []
+
+    def fail_first(catalog_ids, seen_by=None):
+        if seen_by == first:
+            raise RuntimeError('matcher down')
+        matched.append((seen_by, catalog_ids))
+    monkeypatch.setattr(alerts, 'process_new_jobs', fail_first)
+    with pytest.raises(RuntimeError):
+        alerts.match_queued_jobs()
+
+    assert matched == [(second, new_ids[3:])]
+    assert sorted(db.claim_alert_jobs()) == [(catalog_id, first) for catalog_id in new_ids[:3]]
+
+
+def test_emails_list_the_best_matches_and_leave_the_rest_pending(db, corpus_jobs, monkeypatch):
+    monkeypatch.setattr(alerts, 'ALERT_JOBS_PER_EMAIL', 4)
+    _user_with_alert(db, 'subscriber@example.com', PROFILES[0])
+    new_ids = db.save_catalog_jobs(corpus_jobs[:10])
+    alerts.process_new_jobs(new_ids)
+    total = len(_rows(db, "SELECT * FROM alert_matches"))
+    assert total == len(new_ids)
+
+    assert alerts.send_pending_notifications() == 1
+    assert len(db.get_pending_alert_matches()) == total - 4
+    alerts.send_pending_notifications()
+    alerts.send_pending_notifications()
+
+    assert db.get_pending_alert_matches() == []
+    assert len(_rows(db, "SELECT * FROM email_outbox WHERE kind = 'job_alert'")) == 3
+
+
+def test_searches_only_queue_their_new_jobs(user_client, db):
+    _user_with_alert(db, 'subscriber@example.com', PROFILES[0])
+
+    response = user_client.post('/api/recommend/form', json=dict(PROFILES[0], location='Remote'))
+
+    assert response.status_code == 200
+    assert _rows(db, "SELECT * FROM alert_job_queue")
+    assert not _rows(db, "SELECT * FROM alert_matches")
@@ -0,0 +1,114 @@
+import functools
+import time
+
+import numpy as np
+import pytest
+
+import matcher_enhanced
+from benchmarks.corpus import generate_jobs
+from utils.ann_index import JobVectorIndex
+from utils.job_features import attach_job_features, get_vectorizer, term_vectors_to_matrix
+
+
+QUERIES = ['python django backend developer', 'react javascript frontend', 'data engineer sql aws',
+           'java spring', 'devops kubernetes docker']
+
+
+@pytest.fixture(scope='module')
+def term_matrix():
+    jobs = attach_job_features(list(generate_jobs(200, seed=7)))
+    return term_vectors_to_matrix([job['features']['term_vector'] for job in jobs])
+
+
+@pytest.fixture
+def ann_snapshot(monkeypatch):
+    """A fresh process-wide ANN snapshot for the test, built with fewer dimensions to keep it fast."""
+    monkeypatch.setattr(matcher_enhanced, '_ann_snapshot', {'index': None, 'built_at': 0.0, 'rebuilding': False})
+    monkeypatch.setattr(matcher_enhanced, 'build_catalog_ann_index',
+                        functools.partial(matcher_enhanced.build_catalog_ann_index, n_components=16))
+
+
+def _recall(index, k=10):
+    """Share of the exact top k (cosine in the reduced space) that the index returns."""
+    hits = []
+    for query in QUERIES:
+        vector = get_vectorizer().transform([query])
+        reduced = index._normalize(index.svd.transform(vector).astype(np.float32))[0]
+        exact = np.argsort(-(index.vectors @ reduced), kind='stable')[:k]
+        hits.append(len(set(exact) & set(index.query(vector, k=k))) / k)
+    return float(np.mean(hits))
+
+
+def test_a_job_is_its_own_nearest_neighbour(term_matrix):
+    index = JobVectorIndex(n_components=16).fit(range(term_matrix.shape[0]), term_matrix)
+
+    assert all(index.query(term_matrix[row], k=1) == [row] for row in (0, 17, 120))
+
+
+def test_probing_every_bucket_is_exact(term_matrix):
+    index = JobVectorIndex(n_components=16, n_tables=1, n_bits=1, probe_radius=1).fit(
+        range(term_matrix.shape[0]), term_matrix
+    )
+
+    assert _recall(index) == 1.0
+
+
+def test_more_tables_raise_recall(term_matrix):
+    job_ids = range(term_matrix.shape[0])
+    default = JobVectorIndex(n_components=16).fit(job_ids, term_matrix)
+    wide = JobVectorIndex(n_components=16, n_tables=16, n_bits=6).fit(job_ids, term_matrix)
+
+    assert _recall(wide) >= 0.9
+    assert _recall(wide) >= _recall(default)
+
+
+def test_tiny_indexes():
+    vectorizer = get_vectorizer()
+    empty = JobVectorIndex().fit([], term_vectors_to_matrix([]))
+    single = JobVectorIndex().fit(['a'], vectorizer.transform(['python developer']))
+
+    assert empty.query(vectorizer.transform(['python'])) == []
+    assert single.query(vectorizer.transform(['python'])) == ['a']
+
+
+def test_ann_mode_retrieves_from_the_catalog_snapshot(db, corpus_jobs, ann_snapshot):
+    db.save_catalog_jobs(corpus_jobs)
+    context = matcher_enhanced.EnhancedJobMatcher().build_user_context({'job_title': 'Frontend Developer'})
+
+    candidate_ids = matcher_enhanced.catalog_candidate_ids(context, mode='ann', budget=20)
+
+    assert 0 < len(candidate_ids) <= 20
+    assert set(candidate_ids) <= {job['catalog_id'] for job in corpus_jobs}
+    assert len(matcher_enhanced.catalog_ann_index()) == len(db.get_catalog_jobs())
+
+
+def test_ann_mode_falls_back_to_the_inverted_index(db, corpus_jobs, monkeypatch):
+    db.save_catalog_jobs(corpus_jobs)
+    context = matcher_enhanced.EnhancedJobMatcher().build_user_context({'skills': ['Python']})
+
+    def broken():
+        raise RuntimeError('snapshot unavailable')
+    monkeypatch.setattr(matcher_enhanced, 'catalog_ann_index', broken)
+
+    assert (matcher_enhanced.catalog_candidate_ids(context, mode='ann', budget=20)
+            == matcher_enhanced.catalog_candidate_ids(context, mode='index', budget=20))
+
+
+def test_ann_mode_with_an_empty_catalog(db, ann_snapshot):
+    ranked, scored_jobs, components = matcher_enhanced.match_catalog_and_score({'skills': ['Python']}, [], mode='ann')
+
+    assert (ranked, scored_jobs, components) == ([], [], None)
+
+
+def test_stale_snapshot_is_rebuilt_in_the_background(db, corpus_jobs, ann_snapshot, monkeypatch):
+    db.save_catalog_jobs(corpus_jobs[:50])
+    first = matcher_enhanced.catalog_ann_index()
+    db.save_catalog_jobs(corpus_jobs[50:])
+    monkeypatch.setattr(matcher_enhanced, 'CATALOG_ANN_MAX_AGE', 0)
+
+    assert matcher_enhanced.catalog_ann_index() is first  # served while the rebuild runs
+    for _ in range(100):
+        if not matcher_enhanced._ann_snapshot['rebuilding']:
+            break
+        time.sleep(0.05)
+    assert len(matcher_enhanced._ann_snapshot['index']) == len(db.get_catalog_jobs())
@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from utils.cv_analysis import CVAnalyzer, get_analyzer, years_of_experience
+
+
+TODAY = date(2026, 6, 15)
+SKILLS = ('python', 'java', 'javascript', 'c++', 'machine learning', 'sql')
+TITLES = ('software engineer', 'machine learning engineer', 'data analyst')
+
+CV_TEXT = """Jane Doe
+Machine Learning Engineer
+
+Experience
+Acme Corp, Jan 2019 - Dec 2020
+Built Python and SQL pipelines.
+Globex, Jun 2020 - Present
+C++ services.
+
+Education
+BSc, Software Engineer track, 2012 - 2016
+"""
+
+
+@pytest.fixture
+def analyzer():
+    return CVAnalyzer(SKILLS, TITLES)
+
+
+def test_skills_and_titles_in_one_scan(analyzer):
+    skills, titles = analyzer.find_phrases('Java and JavaScript developer, now a Machine Learning Engineer')
+
+    assert [s for s, _ in skills] == ['java', 'javascript', 'machine learning']
+    assert [t for t, _ in titles] == ['machine learning engineer']
+
+
+def test_symbols_are_part_of_a_skill(analyzer):
+    assert analyzer.find_skills('C++, C, Python3 and python') == ['c++', 'python']
+
+
+def test_analyze(analyzer):
+    result = analyzer.analyze(CV_TEXT, today=TODAY)
+
+    assert result['sections'] == ['header', 'experience', 'education']
+    assert result['job_title'] == 'machine learning engineer'
+    assert result['skills'] == ['machine learning', 'python', 'sql', 'c++']
+    # Jan 2019 to June 2026, the overlap counted once and education dates ignored
+    assert result['years_experience'] == 7.5
+
+
+def test_title_in_the_education_section_is_skipped(analyzer):
+    text = "Education\nSoftware Engineer degree\n\nExperience\nData Analyst, 2018 - 2021"
+
+    assert analyzer.analyze(text, today=TODAY)['job_title'] == 'data analyst'
+
+
+@pytest.mark.parametrize('text, years', [
+    ('2015 - 2018', 3.0),
+    ('03/2017 – 06/2020', 3.3),
+    ('Jan 2019 - Dec 2019', 1.0),
+    ('Over 7 years of professional experience', 7.0),
+    ('Founded in 1890 - 1900', None),
+    ('No dates here', None),
+])
+def test_years_of_experience(text, years):
+    assert years_of_experience(text, today=TODAY) == years
+
+
+def test_analyzers_are_shared_per_vocabulary():
+    assert get_analyzer(SKILLS, TITLES) is get_analyzer(SKILLS, TITLES)
@@ -0,0 +1,151 @@
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+import cv_parser
+
+
+def make_pdf(*pages):
+    """A PDF with one line of text per page."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for text in pages:
+        pdf.drawString(72, 700, text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+CV_FIRST_PAGE = 'Jane Doe - Software Engineer. Python Django Docker AWS SQL. jane@example.com'
+CV = make_pdf(CV_FIRST_PAGE)
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache(monkeypatch):
+    monkeypatch.setattr(cv_parser, '_memory_cache', type(cv_parser._memory_cache)())
+
+
+def _cache_rows(db):
+    conn = db.get_db_connection()
+    try:
+        return conn.execute("SELECT content_hash, parsed_data FROM cv_parse_cache").fetchall()
+    finally:
+        conn.close()
+
+
+def test_identical_files_are_parsed_once(db):
+    parsed, cached = cv_parser.parse_cv(CV, 'cv.pdf')
+    cv_parser._memory_cache.clear()
+    again, cached_again = cv_parser.parse_cv(CV, 'other-name.pdf')
+
+    assert (cached, cached_again) == (False, True)
+    assert parsed['email'] == 'jane@example.com'
+    assert {'python', 'django'} <= {s.lower() for s in parsed['skills']}
+    assert again == {k: v for k, v in parsed.items() if k != 'raw_text'}
+
+
+def test_cv_text_is_not_stored(db):
+    cv_parser.parse_cv(CV, 'cv.pdf')
+
+    columns = {info[1] for info in db.get_db_connection().execute("PRAGMA table_info(cv_parse_cache)")}
+    assert 'raw_text' not in columns
+    assert all('Jane Doe' not in row['parsed_data'] for row in _cache_rows(db))
+
+
+def test_expired_entries_are_ignored_and_pruned(db):
+    db.save_cached_cv('old', {'skills': []})
+    conn = db.get_db_connection()
+    conn.execute("UPDATE cv_parse_cache SET created_at = ?", (datetime.now() - timedelta(days=10),))
+    conn.commit()
+    conn.close()
+    week = 7 * 86400
+
+    assert db.get_cached_cv('old', max_age=week) is None
+    assert db.get_cached_cv('old') is not None
+    db.save_cached_cv('new', {'skills': []}, max_age=week)
+    assert [row['content_hash'] for row in _cache_rows(db)] == ['new']
+
+
+def test_cache_size_is_capped(db):
+    for i in range(5):
+        db.save_cached_cv(f'cv{i}', {'skills': []}, max_rows=3)
+
+    assert sorted(row['content_hash'] for row in _cache_rows(db)) == ['cv2', 'cv3', 'cv4']
+
+
+def test_batch_parses_duplicates_once_and_reports_bad_files(db):
+    results = cv_parser.parse_cv_batch([('a.pdf', CV), ('notes.txt', b'hello'), ('b.pdf', CV)])
+
+    assert [r['status'] for r in results] == ['success', 'error', 'success']
+    assert results[0]['parsed_data'] == results[2]['parsed_data']
+    assert 'Unsupported file format' in results[1]['message']
+    assert len(_cache_rows(db)) == 1
+
+
+def _stuck_extraction(data, ext):
+    """Stands in for a PDF that never finishes extracting (runs in the pool)."""
+    import time
+    time.sleep(60)
+
+
+def test_details_on_later_pages_are_found():
+    pdf = make_pdf(CV_FIRST_PAGE, 'Experience: Backend Developer, Jan 2015 - Dec 2020')
+
+    parsed = cv_parser.CVParser().parse_bytes(pdf, 'cv.pdf')
+
+    assert parsed['experience']
+
+
+def test_page_budget():
+    pdf = make_pdf('page one', 'page two', 'page three')
+
+    text = cv_parser.CVParser().extract_text_from_pdf(io.BytesIO(pdf), max_pages=2)
+
+    assert 'page two' in text and 'page three' not in text
+
+
+def test_stuck_extraction_is_stopped_within_the_budget(db, monkeypatch):
+    import time
+
+    monkeypatch.setattr(cv_parser, 'EXTRACT_TIMEOUT', 0.5)
+    monkeypatch.setattr(cv_parser, 'EXTRACT_KILL_GRACE', 0.5)
+    with monkeypatch.context() as m:
+        m.setattr(cv_parser, '_extract_and_parse', _stuck_extraction)
+        started = time.monotonic()
+        parsed, cached = cv_parser.parse_cv(CV + b'stuck', 'cv.pdf')
+
+    assert time.monotonic() - started < 10
+    assert parsed == {'error': 'The file took too long to read'} and not cached
+    assert not _cache_rows(db)
+
+    # The stuck process is replaced on the next upload
+    parsed, _ = cv_parser.parse_cv(CV, 'cv.pdf')
+    assert parsed['email'] == 'jane@example.com'
+
+
+def _idle_pids():
+    pool = cv_parser._get_pool()
+    return sorted(worker.process.pid for worker in list(pool.idle.queue))
+
+
+def test_extraction_processes_are_reused(db, monkeypatch):
+    monkeypatch.setattr(cv_parser, 'EXTRACT_TIMEOUT', 0.5)
+    monkeypatch.setattr(cv_parser, 'EXTRACT_KILL_GRACE', 0.5)
+    cv_parser.parse_cv(CV + b'first', 'cv.pdf')
+    pids = _idle_pids()
+
+    cv_parser.parse_cv(CV + b'second', 'cv.pdf')
+    assert _idle_pids() == pids
+
+    with monkeypatch.context() as m:
+        m.setattr(cv_parser, '_extract_and_parse', _stuck_extraction)
+        cv_parser.parse_cv(CV + b'stuck again', 'cv.pdf')
+    stuck = [pid for pid in pids if pid not in _idle_pids()]
+    cv_parser.parse_cv(CV + b'third', 'cv.pdf')
+
+    assert len(stuck) == 1 and stuck[0] not in _idle_pids()
+    assert cv_parser._get_pool().started <= cv_parser.BATCH_WORKERS
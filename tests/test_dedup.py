@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+
+from utils.dedup import (
+    deduplicate_jobs,
+    is_near_duplicate,
+    job_sketch,
+    minhash,
+    normalize_company,
+    normalize_title_tokens,
+    signature_similarity,
+)
+
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design, build and run the services behind our "
+    "payments platform. You will work with Python, Django and PostgreSQL, review code, mentor "
+    "engineers and take part in an on-call rotation. 5+ years of experience required."
+)
+
+POSTING = {'title': 'Senior Backend Engineer', 'company': 'Acme Payments Inc.', 'description': DESCRIPTION,
+           'platform': 'RemoteOK', 'url': 'https://remoteok.com/1'}
+SYNDICATED = {'title': 'Sr. Backend Engineer (Remote)', 'company': 'Acme Payments',
+              'description': DESCRIPTION.replace('. ', '.\n\n') + ' Apply now.',
+              'platform': 'Remotive', 'url': 'https://remotive.com/2'}
+
+
+def test_company_and_title_normalization():
+    assert normalize_company('Acme Payments, Inc.') == normalize_company('ACME Payments LLC') == 'acme payments'
+    assert normalize_company('Group') == 'group'
+    assert normalize_title_tokens('Sr. Backend Eng - Full Time (Remote)') == {'senior', 'backend', 'engineer'}
+
+
+def test_minhash_estimates_jaccard_similarity():
+    a = {f"shingle{i}" for i in range(200)}
+    b = {f"shingle{i}" for i in range(50, 250)}  # Jaccard 150 / 250 = 0.6
+    c = {f"shingle{i}" for i in range(150, 350)}  # Jaccard with a: 50 / 350
+
+    # 64 permutations: the standard error of the estimate is about 0.06
+    assert abs(signature_similarity(minhash(a), minhash(b)) - 0.6) < 0.2
+    assert signature_similarity(minhash(a), minhash(c)) < 0.35
+    assert signature_similarity(minhash(a), minhash(set(a))) == 1.0
+
+
+def test_syndicated_copies_are_near_duplicates():
+    assert is_near_duplicate(job_sketch(POSTING), job_sketch(SYNDICATED))
+
+
+def test_different_openings_are_kept_apart():
+    posting = job_sketch(POSTING)
+
+    assert not is_near_duplicate(posting, job_sketch(dict(POSTING, title='Junior Backend Engineer')))
+    assert not is_near_duplicate(posting, job_sketch(dict(POSTING, company='Globex')))
+    assert not is_near_duplicate(posting, job_sketch(dict(POSTING, description='Build our mobile apps in Swift.')))
+
+
+def test_deduplicate_keeps_the_first_copy_in_order():
+    other = dict(POSTING, title='Data Analyst', description='SQL dashboards and reporting for finance.')
+
+    unique = deduplicate_jobs([POSTING, other, SYNDICATED, dict(other)])
+
+    assert unique == [POSTING, other]
+
+
+def test_catalog_resolves_copies_to_the_stored_job(db):
+    posting, syndicated = dict(POSTING), dict(SYNDICATED)
+    new_ids = db.save_catalog_jobs([posting])
+
+    assert db.save_catalog_jobs([syndicated]) == []
+    assert syndicated['catalog_id'] == posting['catalog_id'] == new_ids[0]
+    assert len(db.get_catalog_jobs()) == 1
+
+
+def test_catalog_jobs_are_json_serializable(db, corpus_jobs):
+    db.save_catalog_jobs(corpus_jobs[:20])
+
+    jobs = db.get_catalog_jobs()
+
+    assert 'dedup_signature' not in jobs[0] and 'fingerprint' not in jobs[0]
+    json.dumps(jobs)
+
+
+def test_jobs_stored_before_dedup_get_a_signature(db):
+    job = dict(POSTING)
+    db.save_catalog_jobs([job])
+    conn = db.get_db_connection()
+    conn.execute("UPDATE job_catalog SET dedup_signature = NULL")
+    conn.execute("DELETE FROM job_catalog_bands")
+    conn.commit()
+
+    db.save_catalog_jobs([dict(POSTING)])
+
+    signature = conn.execute("SELECT dedup_signature FROM job_catalog").fetchone()[0]
+    conn.close()
+    np.testing.assert_array_equal(np.frombuffer(signature, dtype=np.uint64), job_sketch(POSTING).signature)
+    assert db.save_catalog_jobs([dict(SYNDICATED)]) == []
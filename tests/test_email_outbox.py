@@ -0,0 +1,153 @@
+import socket
+from datetime import datetime
+
+import pytest
+
+import email_utils
+from benchmarks.smtp_stub import StubSMTPServer
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """SMTP stub that email_utils delivers to."""
+    with StubSMTPServer() as server:
+        env = server.env()
+        monkeypatch.setattr(email_utils, 'SMTP_SERVER', env['SMTP_SERVER'])
+        monkeypatch.setattr(email_utils, 'SMTP_PORT', int(env['SMTP_PORT']))
+        monkeypatch.setattr(email_utils, 'SMTP_USERNAME', env['SMTP_USERNAME'])
+        monkeypatch.setattr(email_utils, 'SMTP_PASSWORD', env['SMTP_PASSWORD'])
+        monkeypatch.setattr(email_utils, 'SMTP_STARTTLS', False)
+        yield server
+
+
+def _queue(*recipients):
+    for recipient in recipients:
+        assert email_utils.send_welcome_email(recipient, recipient.split('@')[0])
+
+
+def _outbox(db):
+    conn = db.get_db_connection()
+    try:
+        rows = conn.execute("SELECT * FROM email_outbox ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    return {row['to_email']: dict(row) for row in rows}
+
+
+def _retry_delay(row):
+    return (datetime.fromisoformat(row['next_attempt_at']) - datetime.now()).total_seconds()
+
+
+def _make_due(db):
+    conn = db.get_db_connection()
+    conn.execute("UPDATE email_outbox SET next_attempt_at = ? WHERE status = 'pending'", (datetime(2000, 1, 1),))
+    conn.commit()
+    conn.close()
+
+
+def test_batches_share_one_connection(db, smtp):
+    _queue(*(f'user{i}@example.com' for i in range(12)))
+
+    assert email_utils.MailSender(batch_size=5).drain() == 12
+
+    assert len(smtp.messages) == 12
+    assert (smtp.connections, smtp.logins) == (3, 3)
+    assert db.get_outbox_stats() == {'sent': 12}
+    assert all(row['message'] == '' for row in _outbox(db).values())
+
+
+def test_signup_queues_the_welcome_email(client, db, smtp):
+    response = client.post('/api/auth/signup', json={
+        'email': 'jane@example.com', 'password': 'password123', 'full_name': 'Jane',
+    })
+
+    assert response.status_code == 200
+    assert smtp.messages == []
+    assert email_utils.sender.drain() == 1
+    assert smtp.messages[0]['to'] == ['jane@example.com']
+
+
+def test_temporary_failures_back_off_exponentially(db, smtp, monkeypatch):
+    monkeypatch.setattr(email_utils, 'MAIL_RETRY_BASE', 30)
+    monkeypatch.setattr(email_utils, 'MAIL_RETRY_MAX', 100)
+    _queue('a@example.com', 'b@example.com')
+    sender = email_utils.MailSender()
+
+    delays = []
+    for _ in range(3):
+        smtp.fail_next(1)
+        sender.drain()
+        delays.append(_retry_delay(_outbox(db)['a@example.com']))
+        _make_due(db)
+
+    assert [round(delay, -1) for delay in delays] == [30, 60, 100]
+    assert _outbox(db)['a@example.com']['attempts'] == 3
+    assert _outbox(db)['b@example.com']['status'] == 'sent'
+    assert smtp.connections == 3
+
+
+def test_gives_up_after_the_last_attempt(db, smtp, monkeypatch):
+    monkeypatch.setattr(email_utils, 'MAIL_MAX_ATTEMPTS', 2)
+    _queue('a@example.com')
+    sender = email_utils.MailSender()
+
+    for _ in range(2):
+        smtp.fail_next(1)
+        sender.drain()
+        _make_due(db)
+
+    row = _outbox(db)['a@example.com']
+    assert (row['status'], row['attempts']) == ('failed', 2)
+    assert '451' in row['last_error']
+
+
+def test_refused_recipients_fail_without_retry(db, smtp):
+    smtp.reject('gone@example.com')
+    _queue('gone@example.com', 'ok@example.com')
+
+    email_utils.MailSender().drain()
+
+    outbox = _outbox(db)
+    assert (outbox['gone@example.com']['status'], outbox['ok@example.com']['status']) == ('failed', 'sent')
+    assert smtp.connections == 1
+
+
+def test_unreachable_server_reschedules_the_batch(db, monkeypatch):
+    with socket.socket() as closed:
+        closed.bind(('127.0.0.1', 0))
+        port = closed.getsockname()[1]
+    monkeypatch.setattr(email_utils, 'SMTP_SERVER', '127.0.0.1')
+    monkeypatch.setattr(email_utils, 'SMTP_PORT', port)
+    monkeypatch.setattr(email_utils, 'SMTP_USERNAME', 'stub')
+    monkeypatch.setattr(email_utils, 'SMTP_PASSWORD', 'stub')
+    monkeypatch.setattr(email_utils, 'SMTP_STARTTLS', False)
+    _queue('a@example.com', 'b@example.com')
+
+    assert email_utils.MailSender().drain() == 2
+
+    assert db.get_outbox_stats() == {'pending': 2}
+    assert all(_retry_delay(row) > 0 for row in _outbox(db).values())
+
+
+def test_stale_claims_are_taken_over(db):
+    _queue('a@example.com')
+    assert len(db.claim_outbox_emails('worker-1')) == 1
+
+    assert db.claim_outbox_emails('worker-2') == []
+    assert [row['to_email'] for row in db.claim_outbox_emails('worker-2', stale_after=0)] == ['a@example.com']
+
+
+def test_alert_emails_escape_the_user_name(db):
+    import email
+
+    job = {'job_title': 'Python <Developer>', 'company': 'Acme', 'location': 'Remote',
+           'url': 'https://example.com/1', 'match_score': 80}
+    assert email_utils.send_job_alert_email('eve@example.com', '<b>Eve</b> & co', [job])
+
+    message = email.message_from_string(_outbox(db)['eve@example.com']['message'])
+    html = next(part for part in message.walk() if part.get_content_type() == 'text/html')
+    text = next(part for part in message.walk() if part.get_content_type() == 'text/plain')
+    body = html.get_payload(decode=True).decode()
+    assert 'Hello &lt;b&gt;Eve&lt;/b&gt; &amp; co,' in body and '<b>Eve' not in body
+    assert 'Python &lt;Developer&gt;' in body
+    assert 'Hello <b>Eve</b> & co,' in text.get_payload(decode=True).decode()
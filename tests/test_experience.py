@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from matcher_enhanced import EnhancedJobMatcher
+from utils.experience import (
+    NEUTRAL_SCORE,
+    ExperienceExtractor,
+    extract_required_years,
+    level_match_scores,
+)
+
+
+@pytest.mark.parametrize('text, years', [
+    ('3-5 years of experience', 3),
+    ('2 to 4 yrs in a similar role', 2),
+    ('5+ years with Python', 5),
+    ('At least 7 plus years of backend work', 7),
+    ('3+ years of Python, 6+ years overall', 6),
+    ('Trusted by customers for 25 years. 2 years of React.', 2),
+    ('No requirement stated', None),
+    ('', None),
+])
+def test_required_years(text, years):
+    assert extract_required_years(text) == years
+
+
+@pytest.mark.parametrize('title, text, level', [
+    ('Developer', 'You need 1 year of experience', 'entry'),
+    ('Developer', 'Requires 3-5 years', 'mid'),
+    ('Developer', '7+ years building services', 'senior'),
+    ('Developer', '12 years leading teams', 'principal'),
+    ('Senior Developer', 'Join a junior-friendly team', 'senior'),
+    ('Junior Developer', 'Requires 6+ years', 'senior'),
+    ('Developer', 'A staff role for an architect', 'principal'),
+    ('Developer', 'Build things with us', 'mid'),
+    ('Engineer', 'Our intern program, great for a graduate', 'entry'),
+    ('Sr. Engineer', '', 'senior'),
+])
+def test_classify(title, text, level):
+    assert ExperienceExtractor().classify(text, title) == level
+
+
+def test_keywords_match_whole_words():
+    extractor = ExperienceExtractor()
+
+    assert extractor.classify('Help us internationalize the seniority model', 'Developer') == 'mid'
+
+
+def test_classifications_are_cached_with_a_bounded_size():
+    extractor = ExperienceExtractor(cache_size=2)
+    for i in range(5):
+        extractor.classify(f"{i} years", 'Developer')
+
+    assert len(extractor._cache) == 2
+    assert extractor.classify('4 years', 'Developer') == 'mid'
+
+
+def test_level_scores_match_the_per_job_scorer():
+    matcher = EnhancedJobMatcher()
+    levels = ['entry', 'mid', 'senior', 'principal', None]
+
+    scores = level_match_scores('6 years', levels)
+
+    expected = [matcher.calculate_experience_match('6 years', 'x', level) if level else NEUTRAL_SCORE
+                for level in levels]
+    np.testing.assert_array_equal(scores, expected)
+    np.testing.assert_array_equal(scores, [50.0, 75.0, 100.0, 75.0, NEUTRAL_SCORE])
@@ -0,0 +1,159 @@
+import gc
+import time
+
+import pytest
+import requests
+
+from benchmarks.stub_server import StubBoardServer
+from fetchers import feed_cache
+
+
+@pytest.fixture(scope='module')
+def boards():
+    """Stub boards of its own, since tests here change the feeds."""
+    with StubBoardServer(listings=5) as server:
+        yield server
+
+
+@pytest.fixture
+def feeds(boards, db, monkeypatch):
+    """The stub boards with 5 listings per feed, and an empty in-memory feed cache."""
+    boards.set_listings(5)
+    monkeypatch.setattr(feed_cache, '_memory_cache', type(feed_cache._memory_cache)())
+    return boards
+
+
+@pytest.fixture
+def responses(feeds, monkeypatch):
+    """Every feed response received during the test, in order."""
+    received = []
+    get = requests.get
+
+    def recording_get(*args, **kwargs):
+        response = get(*args, **kwargs)
+        received.append(response)
+        return response
+
+    monkeypatch.setattr(requests, 'get', recording_get)
+    return received
+
+
+def _statuses(responses):
+    return [response.status_code for response in responses]
+
+
+def test_unchanged_feed_is_revalidated(feeds, responses):
+    url = f"{feeds.base_url}/remoteok/api"
+
+    first = feed_cache.fetch_json(url, feed='RemoteOK')
+    second = feed_cache.fetch_json(url, feed='RemoteOK')
+
+    assert _statuses(responses) == [200, 304]
+    assert second is first
+    assert responses[1].request.headers['If-None-Match'] == responses[0].headers['ETag']
+    assert 'gzip' in responses[0].request.headers['Accept-Encoding']
+
+
+def test_stored_feed_survives_a_restart(feeds, responses, monkeypatch):
+    url = f"{feeds.base_url}/remotive/api/remote-jobs"
+    first = feed_cache.fetch_json(url, params={'limit': 5})
+
+    # A new process, or another worker: only the database copy is left
+    monkeypatch.setattr(feed_cache, '_memory_cache', type(feed_cache._memory_cache)())
+    second = feed_cache.fetch_json(url, params={'limit': 5})
+
+    assert _statuses(responses) == [200, 304]
+    assert second == first
+
+
+def test_params_are_part_of_the_key(feeds, responses):
+    url = f"{feeds.base_url}/remotive/api/remote-jobs"
+
+    feed_cache.fetch_json(url, params={'search': 'python'})
+    feed_cache.fetch_json(url, params={'search': 'java'})
+
+    assert _statuses(responses) == [200, 200]
+    assert 'If-None-Match' not in responses[1].request.headers
+
+
+def test_changed_feed_is_fetched_again(feeds, responses):
+    url = f"{feeds.base_url}/remoteok/api"
+    first = feed_cache.fetch_json(url)
+
+    feeds.set_listings(8)
+    second = feed_cache.fetch_json(url)
+
+    assert _statuses(responses) == [200, 200]
+    assert len(first) == 6 and len(second) == 9  # metadata entry first
+
+
+def test_stored_body_is_only_read_after_a_304(feeds, responses, db, monkeypatch):
+    url = f"{feeds.base_url}/remoteok/api"
+    feed_cache.fetch_json(url)
+    reads = []
+    get_feed_body = db.get_feed_body
+    monkeypatch.setattr(db, 'get_feed_body', lambda key: reads.append(key) or get_feed_body(key))
+
+    feeds.set_listings(8)
+    monkeypatch.setattr(feed_cache, '_memory_cache', type(feed_cache._memory_cache)())
+    feed_cache.fetch_json(url)
+    monkeypatch.setattr(feed_cache, '_memory_cache', type(feed_cache._memory_cache)())
+    feed_cache.fetch_json(url)
+
+    assert _statuses(responses) == [200, 200, 304]
+    assert reads == [feed_cache.feed_key(url)]
+
+
+def test_missing_stored_body_is_fetched_in_full(feeds, responses, db, monkeypatch):
+    url = f"{feeds.base_url}/remoteok/api"
+    first = feed_cache.fetch_json(url)
+    monkeypatch.setattr(feed_cache, '_memory_cache', type(feed_cache._memory_cache)())
+    monkeypatch.setattr(db, 'get_feed_body', lambda key: None)
+
+    assert feed_cache.fetch_json(url) == first
+    assert list(feed_cache.stream_json_items(url)) == first
+    assert _statuses(responses) == [200, 304, 200, 304, 200]
+
+
+def test_error_status_raises(feeds):
+    with pytest.raises(requests.HTTPError):
+        feed_cache.fetch_json(f"{feeds.base_url}/unknown")
+
+
+def test_streamed_feed_is_revalidated(feeds, responses):
+    url = f"{feeds.base_url}/remotive/api/remote-jobs"
+
+    fresh = list(feed_cache.stream_json_items(url, path=('jobs',)))
+    cached = list(feed_cache.stream_json_items(url, path=('jobs',)))
+
+    assert _statuses(responses) == [200, 304]
+    assert len(fresh) == 5
+    assert cached == fresh == feed_cache.fetch_json(url)['jobs']
+
+
+def test_stopping_a_stream_early_still_stores_the_feed(feeds, responses, db):
+    url = f"{feeds.base_url}/remotive/api/remote-jobs"
+
+    items = feed_cache.stream_json_items(url, path=('jobs',))
+    first = next(items)
+    items.close()
+
+    # The rest of the body is downloaded in the background
+    deadline = time.monotonic() + 5
+    while db.get_feed_validators(feed_cache.feed_key(url)) is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    cached = list(feed_cache.stream_json_items(url, path=('jobs',)))
+
+    assert _statuses(responses) == [200, 304]
+    assert cached[0] == first and len(cached) == 5
+
+
+def test_unread_streams_close_their_response(feeds, responses):
+    url = f"{feeds.base_url}/remotive/api/remote-jobs"
+
+    feed_cache.stream_json_items(url, path=('jobs',)).close()
+    feed_cache.stream_json_items(url, path=('jobs',), params={'page': 2})
+    gc.collect()
+
+    assert _statuses(responses) == [200, 200]
+    assert all(response.raw.closed for response in responses)
@@ -0,0 +1,171 @@
+import pytest
+
+from fetchers import feed_diff
+from fetchers.feed_diff import ListingCache, content_hash, process_listings
+from utils.metrics import VALIDATOR_JOBS, VALIDATOR_REJECTIONS
+from validators.job_validator import record_validation_metrics
+
+
+LISTINGS = [
+    {'id': 1, 'title': 'Python Developer', 'tags': ['python', 'django']},
+    {'id': 2, 'title': 'Java Engineer', 'tags': ['java']},
+    {'id': 3, 'title': 'Python Data Engineer', 'tags': ['python', 'spark']},
+]
+
+
+class Processing:
+    """build and validate callbacks that count their calls."""
+
+    def __init__(self, invalid_ids=()):
+        self.built = []
+        self.validated = []
+        self.invalid_ids = set(invalid_ids)
+
+    def build(self, listing):
+        self.built.append(listing['id'])
+        return {'id': listing['id'], 'title': listing['title'].strip(), 'skills': list(listing['tags'])}
+
+    def validate(self, job):
+        """Like JobValidator.validate_job, including its metrics."""
+        self.validated.append(job['id'])
+        issues = ['Blocked ID'] if job['id'] in self.invalid_ids else []
+        record_validation_metrics(issues)
+        return not issues, issues
+
+
+def test_unchanged_listings_are_processed_once():
+    cache, processing = ListingCache(), Processing()
+
+    first = process_listings('Board', LISTINGS, processing.build, processing.validate, cache=cache)
+    second = process_listings('Board', [dict(listing) for listing in LISTINGS],
+                              processing.build, processing.validate, cache=cache)
+
+    assert second == first and [job['id'] for job in first] == [1, 2, 3]
+    assert processing.built == [1, 2, 3]
+    assert processing.validated == [1, 2, 3]
+
+
+def test_new_and_changed_listings_are_processed_again():
+    cache, processing = ListingCache(), Processing()
+    process_listings('Board', LISTINGS, processing.build, cache=cache)
+
+    changed = dict(LISTINGS[1], title='Senior Java Engineer')
+    jobs = process_listings('Board', [LISTINGS[0], changed, {'id': 4, 'title': 'Go Developer', 'tags': []}],
+                            processing.build, cache=cache)
+
+    assert processing.built == [1, 2, 3, 2, 4]
+    assert jobs[1]['title'] == 'Senior Java Engineer'
+
+
+def test_returned_jobs_are_copies():
+    cache, processing = ListingCache(), Processing()
+
+    process_listings('Board', LISTINGS, processing.build, cache=cache)[0]['title'] = 'edited'
+    jobs = process_listings('Board', LISTINGS, processing.build, cache=cache)
+
+    assert jobs[0]['title'] == 'Python Developer'
+
+
+def test_invalid_listings_are_dropped_without_revalidation():
+    cache, processing = ListingCache(), Processing(invalid_ids={2})
+
+    for _ in range(2):
+        jobs = process_listings('Board', LISTINGS, processing.build, processing.validate, cache=cache)
+
+    assert [job['id'] for job in jobs] == [1, 3]
+    assert processing.validated == [1, 2, 3]
+
+
+def test_reused_validations_are_counted_in_the_metrics(monkeypatch):
+    monkeypatch.setattr(VALIDATOR_JOBS, 'values', {})
+    monkeypatch.setattr(VALIDATOR_REJECTIONS, 'values', {})
+    cache, processing = ListingCache(), Processing(invalid_ids={2})
+
+    for _ in range(2):
+        process_listings('Board', LISTINGS, processing.build, processing.validate, cache=cache)
+
+    assert processing.validated == [1, 2, 3]
+    assert VALIDATOR_JOBS.values == {('valid',): 4, ('invalid',): 2}
+    assert VALIDATOR_REJECTIONS.values == {('Blocked ID',): 2}
+
+
+def test_returned_lists_are_not_shared_with_the_cache():
+    cache, processing = ListingCache(), Processing()
+
+    process_listings('Board', LISTINGS, processing.build, cache=cache)[0]['skills'].append('edited')
+    jobs = process_listings('Board', LISTINGS, processing.build, cache=cache)
+
+    assert jobs[0]['skills'] == ['python', 'django']
+
+
+def test_keyword_filter_runs_before_processing():
+    cache, processing = ListingCache(), Processing()
+
+    jobs = process_listings('Board', LISTINGS, processing.build, keywords=['python'], cache=cache,
+                            search_fields=lambda listing: (listing['title'], listing['tags']))
+
+    assert [job['id'] for job in jobs] == [1, 3]
+    assert processing.built == [1, 3]
+
+
+def test_limit_stops_processing():
+    cache, processing = ListingCache(), Processing(invalid_ids={1})
+
+    jobs = process_listings('Board', LISTINGS, processing.build, processing.validate, limit=1, cache=cache)
+
+    assert [job['id'] for job in jobs] == [2]
+    assert processing.built == [1, 2]
+
+
+def test_listings_are_keyed_by_platform_and_id():
+    cache, processing = ListingCache(), Processing()
+    anonymous = [{'title': 'Python Developer', 'tags': []}]
+
+    process_listings('Board', LISTINGS, processing.build, cache=cache)
+    process_listings('Other Board', LISTINGS, processing.build, cache=cache)
+    processing.build = lambda listing: dict(listing)
+    process_listings('Board', anonymous, processing.build, cache=cache)
+    process_listings('Board', anonymous, pytest.fail, cache=cache)
+
+    assert processing.built == [1, 2, 3, 1, 2, 3]
+    assert len(cache) == 7
+
+
+def test_least_recently_seen_listings_are_evicted():
+    cache, processing = ListingCache(max_size=2), Processing()
+
+    process_listings('Board', LISTINGS, processing.build, cache=cache)
+    process_listings('Board', LISTINGS[2:], processing.build, cache=cache)
+    process_listings('Board', LISTINGS[:1], processing.build, cache=cache)
+
+    assert len(cache) == 2
+    assert processing.built == [1, 2, 3, 1]
+
+
+def test_content_hash_follows_nested_content():
+    listing = {'id': 1, 'tags': ['python'], 'company': {'name': 'Acme'}}
+
+    assert content_hash(listing) == content_hash({'id': 1, 'tags': ['python'], 'company': {'name': 'Acme'}})
+    assert content_hash(listing) != content_hash({'id': 1, 'tags': ['python'], 'company': {'name': 'Globex'}})
+
+
+def test_refreshing_a_feed_reuses_processed_listings(board_server, monkeypatch):
+    from scraper_production import ProductionJobScraper
+
+    monkeypatch.setattr(feed_diff, 'processed_listings', ListingCache())
+    scraper = ProductionJobScraper(enable_logging=False)
+    built = []
+    build = scraper._remotive_job
+
+    def counting_build(listing):
+        built.append(listing['id'])
+        return build(listing)
+
+    monkeypatch.setattr(scraper, '_remotive_job', counting_build)
+
+    first = scraper.scrape_remotive(['developer', 'engineer'], limit=20)
+    count = len(built)
+    second = scraper.scrape_remotive(['developer', 'engineer'], limit=20)
+
+    assert first and second == first
+    assert count and len(built) == count
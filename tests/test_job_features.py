@@ -0,0 +1,66 @@
+import copy
+
+import matcher_enhanced
+from utils.job_features import FEATURE_VERSION, attach_job_features, compute_job_features, has_current_features
+
+
+PROFILE = {'job_title': 'Backend Developer', 'skills': ['Python', 'Django', 'PostgreSQL'], 'experience': 4}
+
+
+def test_features_cover_skills_in_the_description():
+    job = {'title': 'Backend Developer', 'description': 'You will work with Django and Docker.', 'skills': ['Python']}
+    features = compute_job_features(job)
+
+    assert features['version'] == FEATURE_VERSION
+    assert {'python', 'django', 'docker'} <= set(features['skill_ids'])
+    assert features['term_vector']
+
+
+def test_features_without_a_description_have_no_experience_level():
+    assert compute_job_features({'title': 'Chef', 'description': '', 'skills': []})['experience_level'] is None
+
+
+def test_attach_keeps_current_features_and_refreshes_stale_ones():
+    current = {'title': 'A', 'description': 'Python', 'skills': []}
+    attach_job_features([current])
+    kept = current['features']
+    stale = {'title': 'B', 'description': 'Java', 'skills': [], 'features': {'version': FEATURE_VERSION - 1}}
+
+    attach_job_features([current, stale])
+
+    assert current['features'] is kept
+    assert has_current_features(stale)
+
+
+def test_precomputed_features_give_the_same_ranking(corpus_jobs):
+    fresh = copy.deepcopy(corpus_jobs)
+    precomputed = attach_job_features(copy.deepcopy(corpus_jobs))
+
+    assert matcher_enhanced.match_jobs(PROFILE, precomputed) == matcher_enhanced.match_jobs(PROFILE, fresh)
+
+
+def test_catalog_jobs_keep_their_features(db, corpus_jobs):
+    jobs = corpus_jobs[:20]
+    new_ids = db.save_catalog_jobs(jobs)
+
+    stored = {job['catalog_id']: job for job in db.get_catalog_jobs(new_ids)}
+    for job in jobs:
+        assert stored[job['catalog_id']]['features']['skill_ids'] == job['features']['skill_ids']
+
+
+def test_results_do_not_expose_features(corpus_jobs):
+    assert all('features' not in job for job in matcher_enhanced.match_jobs(PROFILE, corpus_jobs))
+
+
+def test_null_titles_are_treated_as_empty(corpus_jobs):
+    jobs = [dict(job) for job in corpus_jobs[:20]]
+    jobs[0]['title'] = None
+    profile = dict(PROFILE, job_title=None, keywords=None)
+    matcher = matcher_enhanced.EnhancedJobMatcher()
+
+    results = matcher_enhanced.match_jobs(profile, jobs)
+    matrix = matcher.score_matrix([matcher.build_user_context(PROFILE)], jobs)
+
+    assert len(results) == len(jobs)
+    assert matcher.build_user_context(profile)['doc'].split() == ['Python', 'Django', 'PostgreSQL']
+    assert matrix.shape == (1, len(jobs))
@@ -0,0 +1,136 @@
+import matcher_enhanced
+from utils.job_features import attach_job_features
+from utils.job_index import InvertedJobIndex, profile_index_terms
+
+
+PROFILE = {'job_title': 'Backend Developer', 'skills': ['Python', 'Django'], 'experience': 4}
+
+
+def test_profile_terms_cover_skills_and_title_tokens():
+    assert profile_index_terms(['Python', ' Django '], 'Senior Backend Developer (m/f/d)') == [
+        'skill:django', 'skill:python', 'title:backend', 'title:developer', 'title:senior',
+    ]
+
+
+def test_candidates_rank_jobs_by_shared_terms():
+    index = InvertedJobIndex()
+    index.add('a', ['skill:python'])
+    index.add('b', ['skill:python', 'title:backend'])
+    index.add('c', ['skill:java'])
+
+    assert index.candidates(['skill:python', 'title:backend']) == ['b', 'a']
+    assert index.candidates(['skill:python', 'title:backend'], budget=1) == ['b']
+
+
+def test_replacing_and_removing_a_job_updates_its_postings():
+    index = InvertedJobIndex()
+    index.add('a', ['skill:python'])
+    index.add('a', ['skill:java'])
+    assert index.candidates(['skill:python']) == []
+
+    index.remove('a')
+    assert len(index) == 0
+    assert not index.postings
+
+
+def test_candidate_budget_only_scores_jobs_sharing_a_term(corpus_jobs):
+    attach_job_features(corpus_jobs)
+    terms = set(matcher_enhanced.EnhancedJobMatcher().build_user_context(PROFILE)['index_terms'])
+
+    ranked = matcher_enhanced.match_jobs(PROFILE, corpus_jobs, candidate_budget=30)
+
+    assert len(ranked) == 30
+    by_url = {job['url']: job for job in corpus_jobs}
+    for job in ranked:
+        features = by_url[job['url']]['features']
+        job_terms = {f"skill:{s}" for s in features['skill_ids']} | {f"title:{t}" for t in features['title_tokens']}
+        assert terms & job_terms
+
+
+def test_catalog_candidates_come_from_the_stored_index(db, corpus_jobs):
+    db.save_catalog_jobs(corpus_jobs)
+    terms = ['skill:python', 'skill:django']
+
+    candidate_ids = db.get_catalog_candidate_ids(terms, budget=1000)
+
+    jobs = db.get_catalog_jobs(candidate_ids)
+    assert jobs
+    assert all({'python', 'django'} & set(job['features']['skill_ids']) for job in jobs)
+    assert len(db.get_catalog_candidate_ids(terms, budget=5)) == 5
+
+
+def test_catalog_matching_finds_the_best_stored_jobs(db, corpus_jobs):
+    db.save_catalog_jobs(corpus_jobs)
+    exact = matcher_enhanced.match_jobs(PROFILE, db.get_catalog_jobs(), top_k=5)
+
+    ranked, scored_jobs, components = matcher_enhanced.match_catalog_and_score(
+        PROFILE, [], top_k=5, mode='index', candidate_budget=100
+    )
+
+    assert [job['catalog_id'] for job in ranked] == [job['catalog_id'] for job in exact]
+    assert len(components['skill_match']) == len(scored_jobs) <= 100
+
+
+def test_catalog_matching_scores_fresh_jobs_once(db, corpus_jobs):
+    db.save_catalog_jobs(corpus_jobs)
+    fresh = corpus_jobs[:10]
+
+    _, scored_jobs, _ = matcher_enhanced.match_catalog_and_score(PROFILE, fresh, mode='index', candidate_budget=50)
+
+    catalog_ids = [job['catalog_id'] for job in scored_jobs]
+    assert scored_jobs[:10] == fresh
+    assert len(catalog_ids) == len(set(catalog_ids))
+
+
+def test_catalog_candidates_respect_the_location(db, corpus_jobs):
+    db.save_catalog_jobs(corpus_jobs)
+
+    _, scored_jobs, _ = matcher_enhanced.match_catalog_and_score(
+        dict(PROFILE, location='Berlin'), [], mode='index', candidate_budget=200
+    )
+
+    assert scored_jobs
+    for job in scored_jobs:
+        location = job['location'].lower()
+        assert not location or 'berlin' in location or 'remote' in location
+
+
+def test_catalog_matching_off_scores_only_the_fresh_jobs(db, corpus_jobs):
+    db.save_catalog_jobs(corpus_jobs)
+
+    _, scored_jobs, _ = matcher_enhanced.match_catalog_and_score(PROFILE, corpus_jobs[:10], mode='off')
+
+    assert scored_jobs == corpus_jobs[:10]
+
+
+def test_tied_candidates_are_ordered_by_job_id():
+    index = InvertedJobIndex()
+    for job_id in [7, 3, 9, 1, 5]:
+        index.add(job_id, ['skill:python', f'title:t{job_id}'])
+    index.add(4, ['skill:python', 'title:t1'])
+
+    assert index.candidates(['skill:python', 'title:t1']) == [1, 4, 3, 5, 7, 9]
+    assert index.candidates(['title:t1', 'skill:python'], budget=3) == [1, 4, 3]
+
+
+def test_budgeted_candidates_do_not_depend_on_the_hash_seed():
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "from utils.job_index import InvertedJobIndex\n"
+        "index = InvertedJobIndex()\n"
+        "for i in range(50):\n"
+        "    index.add(f'job-{i}', ['skill:python'])\n"
+        "print(index.candidates(['skill:python'], budget=5))\n"
+    )
+    outputs = {
+        subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                       cwd=Path(__file__).resolve().parent.parent,
+                       env=dict(os.environ, PYTHONHASHSEED=str(seed))).stdout
+        for seed in range(4)
+    }
+
+    assert outputs == {"['job-0', 'job-1', 'job-10', 'job-11', 'job-12']\n"}
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from fetchers.json_stream import iter_json_items
+
+
+FEED = {
+    'job-count': 3,
+    'meta': {'note': 'skip [me], {please}', 'jobs': ['not these']},
+    'jobs': [
+        {'id': 1, 'title': 'Développeur Python ☕', 'salary': 1.5e3, 'tags': ['python', 'django']},
+        {'id': 2, 'title': 'Go "Gopher"', 'salary': -125, 'nested': {'a': [1, {'b': None}]}},
+        {'id': 3, 'title': 'Data Engineer', 'salary': 0.25, 'remote': True},
+    ],
+}
+
+
+def _chunked(data: bytes, size: int):
+    return (data[start:start + size] for start in range(0, len(data), size))
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 1 << 20])
+def test_items_are_the_same_at_any_chunk_size(size):
+    body = json.dumps(FEED, ensure_ascii=False, indent=2).encode('utf-8')
+
+    assert list(iter_json_items(_chunked(body, size), path=('jobs',))) == FEED['jobs']
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 4, 5])
+def test_numbers_split_across_chunks(size):
+    body = b'[125, 1.5e3, -0.75, 1E-2, 7]'
+
+    assert list(iter_json_items(_chunked(body, size))) == [125, 1.5e3, -0.75, 1e-2, 7]
+
+
+def test_top_level_array():
+    assert list(iter_json_items([b'[{"id": 1}, ', b'{"id": 2}]'])) == [{'id': 1}, {'id': 2}]
+
+
+def test_nested_path():
+    body = b'{"data": {"count": 2, "results": [1, 2]}}'
+
+    assert list(iter_json_items([body], path=('data', 'results'))) == [1, 2]
+
+
+def test_empty_and_missing_arrays_yield_nothing():
+    assert list(iter_json_items([b'  [ ] '])) == []
+    assert list(iter_json_items([b'{"count": 0, "jobs": []}'], path=('jobs',))) == []
+    assert list(iter_json_items([b'{"count": 0}'], path=('jobs',))) == []
+
+
+def test_items_are_yielded_before_the_rest_arrives():
+    def chunks():
+        yield b'[{"id": 1}, {"id": 2},'
+        raise AssertionError("read past the items that were needed")
+
+    items = iter_json_items(chunks())
+
+    assert next(items) == {'id': 1}
+    assert next(items) == {'id': 2}
+
+
+def test_large_feeds_are_parsed_with_bounded_buffering():
+    jobs = [{'id': i, 'description': 'x' * 500} for i in range(2000)]
+    body = json.dumps({'jobs': jobs}).encode('utf-8')
+
+    assert list(iter_json_items(_chunked(body, 4096), path=('jobs',))) == jobs
+
+
+@pytest.mark.parametrize('body, path', [
+    (b'{"jobs": []}', ()),
+    (b'[1, 2', ()),
+    (b'[1 2]', ()),
+    (b'[{"id": 1,}]', ()),
+    (b'[1, 2]', ('jobs',)),
+])
+def test_malformed_documents_raise_value_error(body, path):
+    with pytest.raises(ValueError):
+        list(iter_json_items([body], path))
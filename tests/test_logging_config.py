@@ -0,0 +1,39 @@
+import json
+import logging
+
+from utils.logging_config import JsonFormatter, _build_handlers
+
+
+def _record(message, **extra):
+    record = logging.makeLogRecord({'name': 'jobflow.test', 'levelno': logging.INFO, 'levelname': 'INFO',
+                                    'msg': message})
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_lines_carry_extra_fields():
+    entry = json.loads(JsonFormatter().format(_record('scraped', platform='RemoteOK', jobs=12)))
+
+    assert entry['message'] == 'scraped'
+    assert entry['logger'] == 'jobflow.test'
+    assert (entry['platform'], entry['jobs']) == ('RemoteOK', 12)
+
+
+def test_log_file_is_reopened_after_external_rotation(tmp_path, monkeypatch):
+    log_file = tmp_path / 'jobflow.log'
+    monkeypatch.setenv('LOG_FILE', str(log_file))
+    file_handler = _build_handlers(tmp_path)[0]
+
+    file_handler.handle(_record('before'))
+    log_file.rename(tmp_path / 'jobflow.log.1')
+    file_handler.handle(_record('after'))
+    file_handler.close()
+
+    assert json.loads((tmp_path / 'jobflow.log.1').read_text())['message'] == 'before'
+    assert json.loads(log_file.read_text())['message'] == 'after'
+
+
+def test_no_file_handler_without_a_log_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('LOG_FILE', '')
+
+    assert [type(handler) for handler in _build_handlers(tmp_path)] == [logging.StreamHandler]
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+from utils import metrics
+
+
+REQUESTS = metrics.Counter('test_requests_total', 'Requests in tests', ['outcome'])
+LATENCY = metrics.Histogram('test_latency_seconds', 'Latency in tests', buckets=(0.1, 1.0))
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    REQUESTS.values = {}
+    LATENCY.values = {}
+
+
+@pytest.fixture
+def shard_dir(tmp_path, monkeypatch):
+    """Shards in a temp directory, without a background flusher."""
+    monkeypatch.setattr(metrics, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setitem(metrics._state, 'flusher_pid', os.getpid())
+    return tmp_path
+
+
+def _worker_shard(monkeypatch, pid, count):
+    """Write a shard as worker pid would, with count requests."""
+    REQUESTS.values = {('ok',): float(count)}
+    with monkeypatch.context() as m:
+        m.setitem(metrics._state, 'pid', pid)
+        metrics.flush()
+    REQUESTS.values = {}
+
+
+def _requests(collected):
+    return collected['test_requests_total']['values'].get(('ok',), 0.0)
+
+
+def test_render_counters_and_histograms():
+    REQUESTS.inc(outcome='ok')
+    REQUESTS.inc(2, outcome='ok')
+    LATENCY.observe(0.05)
+    LATENCY.observe(0.5)
+    LATENCY.observe(5)
+
+    text = metrics.render()
+
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{outcome="ok"} 3.0' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count 3' in text
+
+
+def test_labels_must_match_the_declared_names():
+    with pytest.raises(ValueError):
+        REQUESTS.inc(platform='x')
+
+
+def test_timer_observes_every_call():
+    @LATENCY.time()
+    def work():
+        return 'done'
+
+    assert work() == 'done'
+    with LATENCY.time():
+        pass
+
+    assert sum(LATENCY.values[()][0]) == 2
+
+
+def test_collect_sums_worker_shards(shard_dir, monkeypatch):
+    _worker_shard(monkeypatch, 101, 2)
+    _worker_shard(monkeypatch, 102, 3)
+    REQUESTS.inc(outcome='ok')
+
+    assert _requests(metrics.collect()) == 6
+
+
+def test_retired_workers_keep_their_counts(shard_dir, monkeypatch):
+    _worker_shard(monkeypatch, 101, 2)
+    _worker_shard(monkeypatch, 102, 3)
+
+    metrics.retire_shards(101)
+    metrics.retire_shards(102)
+    _worker_shard(monkeypatch, 103, 4)
+
+    assert sorted(path.name for path in shard_dir.glob('metrics-*.json'))[-1] == 'metrics-retired.json'
+    assert not list(shard_dir.glob('metrics-101-*')) and not list(shard_dir.glob('metrics-102-*'))
+    assert _requests(metrics.collect()) == 9
+
+
+def test_clear_shards_starts_from_zero(shard_dir, monkeypatch):
+    _worker_shard(monkeypatch, 101, 2)
+    metrics.retire_shards(101)
+    _worker_shard(monkeypatch, 102, 3)
+
+    metrics.clear_shards()
+
+    assert not list(shard_dir.glob('metrics-*.json'))
+    assert _requests(metrics.collect()) == 0
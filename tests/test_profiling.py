@@ -0,0 +1,72 @@
+import pytest
+
+from utils import profiling
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', tmp_path / 'profiles')
+    return tmp_path / 'profiles'
+
+
+@pytest.fixture
+def admin_client(user_client, monkeypatch):
+    monkeypatch.setenv('ADMIN_EMAILS', 'ops@example.com, Jane@Example.com')
+    return user_client
+
+
+def test_admins_can_profile_a_request_and_download_it(admin_client, profile_dir):
+    response = admin_client.get('/api/auth/me', headers={profiling.PROFILE_HEADER: '1'})
+    profile_id = response.headers['X-Profile-Id']
+
+    listed = admin_client.get('/api/admin/profiles').get_json()['profiles']
+    report = admin_client.get(f'/api/admin/profiles/{profile_id}?format=text&sort=tottime&limit=5')
+    raw = admin_client.get(f'/api/admin/profiles/{profile_id}')
+
+    assert [(p['id'], p['trigger'], p['path']) for p in listed] == [(profile_id, 'header', '/api/auth/me')]
+    assert report.status_code == 200 and 'function calls' in report.get_data(as_text=True)
+    assert raw.status_code == 200 and raw.data == (profile_dir / f'{profile_id}.prof').read_bytes()
+
+
+def test_profile_header_is_ignored_for_other_users(user_client, profile_dir):
+    response = user_client.get('/api/auth/me', headers={profiling.PROFILE_HEADER: '1'})
+
+    assert 'X-Profile-Id' not in response.headers
+    assert user_client.get('/api/admin/profiles').status_code == 403
+    assert not profile_dir.exists()
+
+
+def test_unknown_profiles_and_sort_keys_are_rejected(admin_client, profile_dir):
+    profile_id = admin_client.get('/api/auth/me', headers={profiling.PROFILE_HEADER: '1'}).headers['X-Profile-Id']
+
+    assert admin_client.get('/api/admin/profiles/..%2Fjobs').status_code == 404
+    assert admin_client.get('/api/admin/profiles/missing').status_code == 404
+    assert admin_client.get(f'/api/admin/profiles/{profile_id}?format=text&sort=bogus').status_code == 400
+
+
+def test_sampling_only_covers_recommendations(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_SAMPLE_RATE', 1.0)
+
+    assert profiling.sampled('/api/recommend/form')
+    assert not profiling.sampled('/api/auth/me')
+
+
+def test_only_the_newest_profiles_are_kept(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_KEEP', 2)
+    for i in range(4):
+        profiler = profiling.RequestProfiler.start('header')
+        profiler.save(f'endpoint{i}', 'GET', '/api/x', 200)
+
+    assert len(list(profile_dir.glob('*.prof'))) == 2
+    assert len(profiling.list_profiles()) == 2
+
+
+def test_one_profiler_at_a_time():
+    first = profiling.RequestProfiler.start('header')
+    try:
+        assert profiling.RequestProfiler.start('header') is None
+    finally:
+        first.stop()
+    second = profiling.RequestProfiler.start('header')
+    second.stop()
+    assert second is not None
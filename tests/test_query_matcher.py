@@ -0,0 +1,68 @@
+import pytest
+
+from utils.query_matcher import QueryMatcher
+
+
+@pytest.mark.parametrize('keyword, text, expected', [
+    ('java', 'Java/Kotlin Developer', True),
+    ('java', 'JavaScript Developer', False),
+    ('go', 'Go engineer', True),
+    ('go', 'Google Cloud', False),
+    ('python', 'Senior Python Developer', True),
+    ('python', 'python_tools maintainer', False),
+    ('c++', 'Modern C++ (C++17)', True),
+    ('c++', 'C programmer', False),
+    ('c#', 'C#/.NET developer', True),
+    ('.net', 'ASP.NET Core', True),
+    ('.net', 'network engineer', False),
+    ('machine learning', 'Machine Learning Engineer', True),
+    ('machine learning', 'machine-learning', False),
+    ('react', 'React.js and React Native', True),
+])
+def test_keywords_match_whole_words(keyword, text, expected):
+    assert QueryMatcher([keyword]).matches_text(text) is expected
+
+
+def test_later_occurrences_are_checked():
+    assert QueryMatcher(['go']).matches_text('Google, Gopher and Go')
+
+
+def test_keywords_are_normalized():
+    matcher = QueryMatcher(['  Python ', 'python', '', None, 'SQL'])
+
+    assert matcher.keywords == ('python', 'sql')
+    assert not QueryMatcher([]).matches(['anything'])
+
+
+def test_fields_and_lists_of_tags():
+    matcher = QueryMatcher(['django'])
+
+    assert matcher.matches([None, 'Backend Developer', ['python', 'Django'], 'description'])
+    assert matcher.matches([('django',)])
+    assert not matcher.matches([None, 42, {'django': True}, ['python', None], 'Flask apps'])
+
+
+def test_of_reuses_a_matcher():
+    matcher = QueryMatcher(['python'])
+
+    assert QueryMatcher.of(matcher) is matcher
+    assert QueryMatcher.of(['python']).keywords == matcher.keywords
+
+
+def test_scrape_filters_on_whole_words(board_server, monkeypatch):
+    import scraper_production
+    from fetchers import feed_diff
+
+    monkeypatch.setattr(feed_diff, 'processed_listings', feed_diff.ListingCache())
+    scraper = scraper_production.ProductionJobScraper(enable_logging=False)
+
+    def search(keyword):
+        matcher = QueryMatcher([keyword])
+        return {job['url'] for job in scraper.scrape_remotive(matcher, limit=50)
+                + scraper.scrape_arbeitnow(matcher, limit=50)}
+
+    java, javascript = search('java'), search('javascript')
+
+    assert java and javascript
+    # Listings that only mention JavaScript are not Java results
+    assert len(java & javascript) < len(javascript)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import matcher
+import matcher_enhanced
+from utils.job_features import attach_job_features
+from utils.ranking import top_k_indices
+
+
+PROFILE = {'job_title': 'Data Engineer', 'skills': ['Python', 'SQL', 'AWS'], 'experience': 3}
+
+
+@pytest.mark.parametrize('k', [None, 0, 1, 5, 10, 50])
+def test_top_k_matches_a_stable_sort(k):
+    scores = np.random.default_rng(3).integers(0, 10, size=40).astype(float)
+
+    expected = sorted(range(len(scores)), key=lambda i: -scores[i])
+    if k is not None:
+        expected = expected[:k]
+    assert top_k_indices(scores, k).tolist() == expected
+
+
+def test_top_k_keeps_input_order_for_ties():
+    assert top_k_indices([1.0, 2.0, 2.0, 1.0, 2.0], 2).tolist() == [1, 2]
+
+
+@pytest.mark.parametrize('match', [matcher.match_jobs, matcher_enhanced.match_jobs])
+def test_top_k_is_a_prefix_of_the_full_ranking(match, corpus_jobs):
+    ranked = match(PROFILE, corpus_jobs)
+    top = match(PROFILE, corpus_jobs, top_k=10)
+
+    assert top == ranked[:10]
+    assert [job['match_score'] for job in ranked] == sorted((job['match_score'] for job in ranked), reverse=True)
+
+
+def test_basic_matcher_without_a_profile_returns_the_jobs_unranked(corpus_jobs):
+    jobs = attach_job_features(corpus_jobs[:5])
+
+    results = matcher.match_jobs({}, jobs, top_k=3)
+
+    assert [job['url'] for job in results] == [job['url'] for job in jobs[:3]]
+    assert all('features' not in job for job in results)
+    assert all('features' in job for job in jobs)
@@ -0,0 +1,78 @@
+import pytest
+
+import matcher_enhanced
+from routes.jobs import apply_profile_changes
+
+
+# A location outside Egypt skips Wuzzuf, whose scraper pauses between pages
+PROFILE = {'job_title': 'Python Developer', 'skills': ['Python', 'Django'], 'experience': 3, 'location': 'Remote'}
+
+
+@pytest.fixture
+def search_id(user_client):
+    response = user_client.post('/api/recommend/form', json=PROFILE)
+    assert response.status_code == 200
+    return response.get_json()['search_id']
+
+
+def _scored_jobs(db, search_id):
+    candidates = db.get_search_candidates(search_id)
+    return db.get_catalog_jobs([c['catalog_job_id'] for c in candidates])
+
+
+def test_rerank_matches_a_fresh_ranking_of_the_same_jobs(user_client, db, search_id):
+    response = user_client.post('/api/recommend/rerank', json={
+        'search_id': search_id, 'add_skills': ['Docker'], 'changes': {'experience': 8},
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    edited = dict(PROFILE, skills=['Python', 'Django', 'Docker'], experience=8)
+    expected = matcher_enhanced.match_jobs(edited, _scored_jobs(db, search_id), top_k=20)
+    assert [(j['catalog_id'], j['match_score']) for j in body['jobs']] == \
+        [(j['catalog_id'], j['match_score']) for j in expected]
+    assert db.get_search(body['search_id'])['match_profile'] == edited
+
+
+def test_a_reranked_search_can_be_reranked_again(user_client, search_id):
+    first = user_client.post('/api/recommend/rerank', json={'search_id': search_id, 'remove_skills': ['django']})
+    second = user_client.post('/api/recommend/rerank', json={
+        'search_id': first.get_json()['search_id'], 'changes': {'job_title': 'Backend Engineer'},
+    })
+
+    assert second.status_code == 200
+    assert second.get_json()['jobs']
+
+
+@pytest.mark.parametrize('edit', [
+    {'add_skills': [5]},
+    {'add_skills': 'Docker'},
+    {'remove_skills': [None]},
+    {'changes': {'skills': [{}]}},
+    {'changes': {'experience': True}},
+    {'changes': {'job_title': ['a']}},
+    {'changes': {'location': 'Berlin'}},
+    {'changes': ['experience']},
+])
+def test_malformed_edits_are_rejected(user_client, search_id, edit):
+    response = user_client.post('/api/recommend/rerank', json=dict(edit, search_id=search_id))
+
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+
+
+def test_only_the_owner_can_rerank_a_search(client, search_id):
+    client.post('/api/auth/logout')
+    assert client.post('/api/recommend/rerank', json={'search_id': search_id}).status_code == 401
+
+    client.post('/api/auth/signup', json={'email': 'sam@example.com', 'password': 'password123', 'full_name': 'Sam'})
+    assert client.post('/api/recommend/rerank', json={'search_id': search_id}).status_code == 404
+
+
+def test_profile_changes():
+    profile = apply_profile_changes(
+        {'skills': 'Python, Django', 'experience': 2},
+        {'changes': {'experience': '5'}, 'add_skills': ['docker', 'PYTHON'], 'remove_skills': ['django']},
+    )
+
+    assert profile == {'skills': ['Python', 'docker'], 'experience': '5'}
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('sklearn', 'scipy', 'pandas', 'PyPDF2', 'docx', 'reportlab', 'bs4')
+
+
+def test_importing_the_app_is_light(tmp_path):
+    database_path = tmp_path / 'jobs.db'
+    env = dict(os.environ, DATABASE_PATH=str(database_path), LOG_FILE='')
+    script = f"import sys, server; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+
+    result = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ''
+    assert not database_path.exists()
+
+
+def test_database_is_initialized_on_the_first_request(client, db, monkeypatch):
+    db.DATABASE_PATH.unlink()
+    monkeypatch.setattr(db, '_initialized', False)
+
+    assert client.get('/api/auth/me').status_code == 401
+    assert db.DATABASE_PATH.exists()
+    assert db.get_user_by_email('nobody@example.com') is None
+
+
+def test_warmup_builds_the_ann_snapshot_only_when_it_is_served(db, corpus_jobs, monkeypatch):
+    import matcher_enhanced
+    import server
+
+    db.save_catalog_jobs(corpus_jobs[:30])
+    monkeypatch.setattr(matcher_enhanced, '_ann_snapshot', {'index': None, 'built_at': 0.0, 'rebuilding': False})
+
+    monkeypatch.setattr(matcher_enhanced, 'CATALOG_MATCHING', 'index')
+    server.warmup()
+    assert matcher_enhanced._ann_snapshot['index'] is None
+
+    monkeypatch.setattr(matcher_enhanced, 'CATALOG_MATCHING', 'ann')
+    server.warmup()
+    assert len(matcher_enhanced._ann_snapshot['index']) == len(db.get_catalog_jobs())
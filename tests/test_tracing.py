@@ -0,0 +1,44 @@
+import server
+from utils.tracing import finish_trace, span, start_trace, traced
+
+
+def test_spans_are_summed_per_name():
+    trace = start_trace('search')
+    for _ in range(3):
+        with span('scrape'):
+            pass
+    with span('match'):
+        pass
+    finished = finish_trace()
+
+    assert finished is trace
+    assert list(trace.spans) == ['scrape', 'match']
+    assert trace.as_dict()['spans']['scrape']['calls'] == 3
+    assert trace.total >= sum(seconds for seconds, _ in trace.spans.values())
+
+
+def test_spans_outside_a_trace_are_ignored():
+    @traced('work')
+    def work():
+        return 42
+
+    with span('idle'):
+        assert work() == 42
+    assert finish_trace() is None
+
+
+def test_server_timing_header(user_client, monkeypatch):
+    monkeypatch.setitem(server.app.config, 'SERVER_TIMING', True)
+
+    response = user_client.post('/api/recommend/form', json={'job_title': 'Python Developer', 'skills': ['Python']})
+
+    assert response.status_code == 200
+    entries = dict(entry.split(';dur=') for entry in response.headers['Server-Timing'].split(', '))
+    assert {'scrape', 'total'} <= set(entries)
+    assert all(float(ms) >= 0 for ms in entries.values())
+
+
+def test_no_server_timing_header_by_default(client):
+    response = client.get('/api/auth/me')
+
+    assert 'Server-Timing' not in response.headers
@@ -0,0 +1,140 @@
+"""
+Approximate Nearest-Neighbour Job Index
+Random-projection LSH over TruncatedSVD-reduced job text vectors, used to
+retrieve match candidates from large catalogs without an exact cosine over
+every row.
+"""
+from typing import Hashable, List, Sequence
+
+import numpy as np
+
+
+class JobVectorIndex:
+    """
+    LSH index over reduced job vectors.
+
+    Recall/latency trade-offs:
+        n_components: Reduced dimensions; more keeps more of the text signal
+            but makes hashing and re-ranking slower.
+        n_tables: Independent hash tables; more tables raise recall at the
+            cost of more bucket lookups and a larger candidate pool.
+        n_bits: Hyperplanes per table; more bits mean smaller buckets
+            (faster, lower recall per table).
+        probe_radius: 0 probes only the query's own bucket, 1 also probes
+            every bucket one bit away (multi-probe), raising recall without
+            adding tables.
+    """
+
+    def __init__(self, n_components=128, n_tables=8, n_bits=12, probe_radius=1, random_state=42):
+        self.n_components = n_components
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.probe_radius = probe_radius
+        self.random_state = random_state
+
+        self.svd = None
+        self.job_ids = []
+        self.vectors = None
+        self.planes = None
+        self.tables = []
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def fit(self, job_ids: Sequence[Hashable], term_matrix):
+        """
+        Build the index.
+
+        Args:
+            job_ids: ID for each row of term_matrix
+            term_matrix: Sparse (n_jobs, n_terms) matrix of job text vectors
+        """
+        from sklearn.decomposition import TruncatedSVD
+
+        self.job_ids = list(job_ids)
+        n_jobs = term_matrix.shape[0]
+        if n_jobs == 0:
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            return self
+
+        # TruncatedSVD needs fewer components than rows
+        n_components = max(1, min(self.n_components, n_jobs - 1))
+        if n_jobs > 1:
+            self.svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+            reduced = self.svd.fit_transform(term_matrix)
+        else:
+            self.svd = None
+            reduced = term_matrix.toarray()[:, :0]
+        self.vectors = self._normalize(reduced.astype(np.float32))
+
+        rng = np.random.default_rng(self.random_state)
+        self.planes = rng.standard_normal(
+            (self.n_tables, self.vectors.shape[1], self.n_bits)
+        ).astype(np.float32)
+
+        self.tables = []
+        codes = self._hash(self.vectors)
+        for table_codes in codes:
+            buckets = {}
+            for position, code in enumerate(table_codes.tolist()):
+                buckets.setdefault(code, []).append(position)
+            self.tables.append({code: np.asarray(rows) for code, rows in buckets.items()})
+
+        return self
+
+    def query(self, term_vector, k=100) -> List[Hashable]:
+        """
+        Approximate k nearest jobs to a query text vector.
+
+        Args:
+            term_vector: Sparse (1, n_terms) query vector
+            k: Number of job IDs to return
+
+        Returns:
+            Job IDs, most similar first
+        """
+        from utils.ranking import top_k_indices
+
+        if not self.job_ids:
+            return []
+        if self.svd is None or self.vectors.shape[1] == 0:
+            return self.job_ids[:k]
+
+        query = self._normalize(self.svd.transform(term_vector).astype(np.float32))
+        positions = self._probe(query)
+        if positions.size == 0:
+            return []
+
+        similarities = self.vectors[positions] @ query[0]
+        best = top_k_indices(similarities, k)
+        return [self.job_ids[p] for p in positions[best]]
+
+    def _probe(self, query):
+        """Candidate rows from the query's buckets and their near neighbours."""
+        bit_flips = [0]
+        if self.probe_radius >= 1:
+            bit_flips += [1 << bit for bit in range(self.n_bits)]
+
+        found = []
+        for table, (code,) in zip(self.tables, self._hash(query)):
+            code = int(code)
+            for flip in bit_flips:
+                rows = table.get(code ^ flip)
+                if rows is not None:
+                    found.append(rows)
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _hash(self, vectors):
+        """LSH codes for each table: (n_tables, n_vectors) integer array."""
+        weights = (1 << np.arange(self.n_bits, dtype=np.int64))
+        bits = np.einsum('nd,tdb->tnb', vectors, self.planes) > 0
+        return bits.astype(np.int64) @ weights
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
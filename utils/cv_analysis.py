@@ -0,0 +1,244 @@
+"""
+CV Analysis
+Single-pass analysis of extracted CV text: section detection, skill and job
+title matching with one shared compiled matcher, and years of experience
+computed from the date ranges in the work history.
+"""
+import re
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Section name -> headings that open it
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile',
+                'about me', 'objective', 'career objective'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'education': ('education', 'education and training', 'education & training',
+                  'academic background', 'qualifications'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core skills', 'skills & tools',
+               'core competencies', 'technologies', 'tech stack'),
+    'projects': ('projects', 'personal projects', 'key projects'),
+    'certifications': ('certifications', 'certificates', 'licenses & certifications',
+                       'licenses and certifications', 'courses'),
+}
+
+# Text before the first heading (name, contact details, headline)
+HEADER_SECTION = 'header'
+
+
+def _heading_alternative(heading: str) -> str:
+    return r'\s+'.join(re.escape(word) for word in heading.split())
+
+
+# A heading is a line of its own, optionally ending in a colon
+_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:'
+    + '|'.join(
+        f"(?P<{name}>{'|'.join(_heading_alternative(h) for h in sorted(headings, key=len, reverse=True))})"
+        for name, headings in SECTION_HEADINGS.items()
+    )
+    + r')[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_MONTH = (
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+)
+_MONTH_NUMBERS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1
+)}
+
+
+def _date_pattern(prefix: str) -> str:
+    return (
+        rf'(?:(?P<{prefix}_month>{_MONTH})\.?,?\s+|(?P<{prefix}_num>\d{{1,2}})\s*[/.]\s*)?'
+        rf'(?P<{prefix}_year>(?:19|20)\d{{2}})'
+    )
+
+
+# "Jan 2019 - Present", "03/2017 – 06/2020", "2015 to 2018"
+_DATE_RANGE_PATTERN = re.compile(
+    r'(?<![\d/])' + _date_pattern('start')
+    + r'\s*(?:-|–|—|to|until)\s*'
+    + r'(?:(?P<ongoing>present|current|now|today|date)\b|' + _date_pattern('end') + r'(?!\d))',
+    re.IGNORECASE,
+)
+
+# "5+ years of experience", "over 7 years of professional experience"
+_STATED_YEARS_PATTERN = re.compile(
+    r'(?<!\d)(?P<years>\d{1,2})\s*\+?\s*(?:years?|yrs?)\s+(?:of\s+)?'
+    r'(?:\w+\s+)?experience\b',
+    re.IGNORECASE,
+)
+
+EARLIEST_YEAR = 1950
+# Years beyond this are typos or education dates, not a work history
+MAX_YEARS_EXPERIENCE = 50
+
+
+class CVAnalyzer:
+    """
+    Analyzer for one skills and job title vocabulary.
+
+    Skills and titles share one compiled alternation (longest phrase first),
+    so the text is scanned once for both. Use get_analyzer() to reuse the
+    compiled matcher across parsers.
+    """
+
+    def __init__(self, skills: Iterable[str], titles: Iterable[str]):
+        skills = list(skills)
+        self.phrases = {}  # lowercase phrase -> ('skill' | 'title', canonical name)
+        for title in titles:
+            self.phrases[title.lower()] = ('title', title)
+        for skill in skills:
+            self.phrases.setdefault(skill.lower(), ('skill', skill))
+
+        self.pattern = self._compile(self.phrases)
+
+        # Skills named inside a title ("machine learning" in "machine learning engineer")
+        skill_pattern = self._compile({s.lower(): None for s in skills})
+        self.title_skills = {
+            phrase: [m.group(1).lower() for m in skill_pattern.finditer(phrase)]
+            for phrase, (kind, _) in self.phrases.items() if kind == 'title'
+        }
+
+    @staticmethod
+    def _compile(phrases):
+        if not phrases:
+            return re.compile(r'(?!)')
+        alternation = '|'.join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+        return re.compile(r'(?<![\w+#])(' + alternation + r')(?![\w+#])', re.IGNORECASE)
+
+    def sections(self, text: str) -> List[Tuple[str, int, int]]:
+        """(section name, start, end) spans in text order, starting with the header."""
+        spans = []
+        name, start = HEADER_SECTION, 0
+        for match in _HEADING_PATTERN.finditer(text):
+            spans.append((name, start, match.start()))
+            name, start = match.lastgroup, match.end()
+        spans.append((name, start, len(text)))
+        return [span for span in spans if span[2] > span[1] or span[0] != HEADER_SECTION]
+
+    def find_phrases(self, text: str) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """Skills and titles in text order, as (canonical name, offset), in one scan."""
+        skills, titles = [], []
+        seen_skills = set()
+        for match in self.pattern.finditer(text):
+            phrase = match.group(1).lower()
+            kind, canonical = self.phrases[phrase]
+            if kind == 'title':
+                titles.append((canonical, match.start()))
+                embedded = self.title_skills[phrase]
+            else:
+                embedded = (phrase,)
+            for skill in embedded:
+                if skill not in seen_skills:
+                    seen_skills.add(skill)
+                    skills.append((self.phrases[skill][1], match.start()))
+        return skills, titles
+
+    def find_skills(self, text: str) -> List[str]:
+        return [skill for skill, _ in self.find_phrases(text)[0]]
+
+    def find_title(self, text: str) -> Optional[str]:
+        titles = self.find_phrases(text)[1]
+        return titles[0][0] if titles else None
+
+    def analyze(self, text: str, today: Optional[date] = None) -> Dict:
+        """
+        Analyze extracted CV text.
+
+        Returns:
+            Dict with sections (names in order), skills (first-seen order),
+            job_title (first title outside the education section, or None)
+            and years_experience (float, or None if the CV gives no dates
+            or stated years)
+        """
+        text = text or ''
+        sections = self.sections(text)
+        starts = [start for _, start, _ in sections]
+
+        def section_at(offset):
+            return sections[max(0, bisect_right(starts, offset) - 1)][0]
+
+        skills, titles = self.find_phrases(text)
+        job_title = next((t for t, offset in titles if section_at(offset) != 'education'), None)
+
+        # Work history dates: the experience section if there is one, else
+        # everything except education
+        work_sections = [s for s in sections if s[0] == 'experience'] or \
+            [s for s in sections if s[0] != 'education']
+        work_text = '\n'.join(text[start:end] for _, start, end in work_sections)
+
+        return {
+            'sections': list(dict.fromkeys(name for name, _, _ in sections)),
+            'skills': [skill for skill, _ in skills],
+            'job_title': job_title,
+            'years_experience': years_of_experience(work_text, today),
+        }
+
+
+@lru_cache(maxsize=8)
+def get_analyzer(skills: Tuple[str, ...], titles: Tuple[str, ...]) -> CVAnalyzer:
+    """Shared analyzer for a vocabulary, compiled once per process."""
+    return CVAnalyzer(skills, titles)
+
+
+def _month_index(month_name: Optional[str], month_number: Optional[str], year: str) -> Tuple[int, bool]:
+    """Months since year 0 for a parsed date, and whether the month was given."""
+    if month_name:
+        month = _MONTH_NUMBERS[month_name[:3].lower()]
+    elif month_number and 1 <= int(month_number) <= 12:
+        month = int(month_number)
+    else:
+        # Year only: count from mid-year so "2018 - 2021" is three years
+        return int(year) * 12 + 5, False
+    return int(year) * 12 + month - 1, True
+
+
+def employment_intervals(text: str, today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """Date ranges in text as (start, end) month indexes, end exclusive."""
+    today = today or date.today()
+    now = today.year * 12 + today.month - 1
+    intervals = []
+    for match in _DATE_RANGE_PATTERN.finditer(text):
+        start, _ = _month_index(match.group('start_month'), match.group('start_num'), match.group('start_year'))
+        if match.group('ongoing'):
+            end = now + 1
+        else:
+            end, month_given = _month_index(match.group('end_month'), match.group('end_num'), match.group('end_year'))
+            # "Jan 2019 - Dec 2019" is twelve months
+            end += 1 if month_given else 0
+        end = min(end, now + 1)
+        if start // 12 >= EARLIEST_YEAR and start < end:
+            intervals.append((start, end))
+    return intervals
+
+
+def years_of_experience(text: str, today: Optional[date] = None) -> Optional[float]:
+    """
+    Years of experience from a work history.
+
+    Overlapping date ranges (two jobs at once) are counted once. Without
+    any date ranges, the highest "N years of experience" statement is used.
+    """
+    intervals = sorted(employment_intervals(text, today))
+    if intervals:
+        months = 0
+        current_start, current_end = intervals[0]
+        for start, end in intervals[1:]:
+            if start > current_end:
+                months += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        months += current_end - current_start
+        return round(min(months / 12, MAX_YEARS_EXPERIENCE), 1)
+
+    stated = [int(m.group('years')) for m in _STATED_YEARS_PATTERN.finditer(text)]
+    stated = [years for years in stated if years <= MAX_YEARS_EXPERIENCE]
+    return float(max(stated)) if stated else None
@@ -0,0 +1,186 @@
+"""
+Near-Duplicate Job Detection
+MinHash signatures over a job's normalized title, company and description,
+with an LSH band index, so the same posting syndicated to several boards
+(slightly different title, "Inc." on the company, re-wrapped description)
+is found with a few bucket lookups instead of comparing every pair.
+
+A job is a near-duplicate of another when:
+    - their companies match once legal suffixes and punctuation are dropped,
+    - their normalized title tokens overlap by DEDUP_TITLE_THRESHOLD, and
+    - their estimated shingle Jaccard similarity is at least DEDUP_THRESHOLD.
+"""
+import os
+import re
+import zlib
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from utils.job_features import tokenize_title
+
+# Estimated Jaccard similarity of title, company and description shingles
+DEDUP_THRESHOLD = float(os.getenv('DEDUP_THRESHOLD', '0.85'))
+# Overlap of normalized title tokens, so "Senior" and "Junior" openings with
+# the same boilerplate description stay separate
+DEDUP_TITLE_THRESHOLD = float(os.getenv('DEDUP_TITLE_THRESHOLD', '0.7'))
+
+# Signature layout: NUM_PERM = BANDS * ROWS. Pairs at Jaccard 0.85 share a
+# band with probability 1 - (1 - 0.85**4)**16 > 0.99; candidates are then
+# confirmed against the full signature.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Words shingled together from the description
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# a and b range over the whole field so that a * h + b wraps around 2**64:
+# with small coefficients every permutation ranks shingles nearly by h
+# alone, and the signature values all come from the same few shingles
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, NUM_PERM, dtype=np.uint64)
+
+_WORD_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+COMPANY_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'gmbh', 'corp', 'corporation',
+    'co', 'company', 'plc', 'sa', 'ag', 'bv', 'srl', 'pty', 'lp', 'llp', 'group',
+}
+
+# Tags boards add to the same title ("(Remote)", "- Contract")
+TITLE_NOISE = {'remote', 'contract', 'hybrid', 'onsite', 'full', 'time', 'fulltime', 'part', 'parttime'}
+TITLE_ABBREVIATIONS = {'sr': 'senior', 'jr': 'junior', 'snr': 'senior', 'mid': 'middle', 'eng': 'engineer', 'dev': 'developer'}
+
+
+class JobSketch(NamedTuple):
+    """What near-duplicate checks need to know about one job."""
+    title_tokens: frozenset
+    company: str
+    signature: np.ndarray
+
+
+def normalize_company(company: str) -> str:
+    """Lowercase company name without punctuation or legal suffixes."""
+    words = _WORD_PATTERN.findall((company or '').lower().replace('.', ''))
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def normalize_title_tokens(title: str) -> frozenset:
+    """Title tokens with abbreviations expanded and board tags dropped."""
+    tokens = (TITLE_ABBREVIATIONS.get(t, t) for t in tokenize_title(title))
+    return frozenset(t for t in tokens if t not in TITLE_NOISE)
+
+
+def shingles(job: Dict, title_tokens: Iterable[str], company: str) -> List[str]:
+    words = _WORD_PATTERN.findall((job.get('description') or '').lower())
+    result = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))]
+    result.extend(f"title:{token}" for token in title_tokens)
+    result.append(f"company:{company}")
+    return [s for s in result if s]
+
+
+def minhash(features: Iterable[str]) -> np.ndarray:
+    """NUM_PERM-value MinHash signature of a set of strings."""
+    hashes = np.fromiter(
+        (zlib.crc32(f.encode('utf-8')) for f in set(features)), dtype=np.uint64
+    )
+    if hashes.size == 0:
+        return np.full(NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+    permuted = ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & np.uint64(_MAX_HASH)
+    return permuted.min(axis=0)
+
+
+def job_sketch(job: Dict) -> JobSketch:
+    title_tokens = normalize_title_tokens(job.get('title') or '')
+    company = normalize_company(job.get('company') or '')
+    return JobSketch(title_tokens, company, minhash(shingles(job, title_tokens, company)))
+
+
+def stored_sketch(title: str, company: str, signature: bytes) -> JobSketch:
+    """Sketch of a stored job from its title, company and saved signature bytes."""
+    return JobSketch(
+        normalize_title_tokens(title or ''),
+        normalize_company(company or ''),
+        np.frombuffer(signature, dtype=np.uint64),
+    )
+
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    """One integer key per LSH band, stable across processes."""
+    rows = signature.reshape(BANDS, ROWS)
+    return [(band << 32) | zlib.crc32(rows[band].tobytes()) for band in range(BANDS)]
+
+
+def signature_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def title_similarity(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def is_near_duplicate(a: JobSketch, b: JobSketch) -> bool:
+    if a.company and b.company and a.company != b.company:
+        return False
+    if title_similarity(a.title_tokens, b.title_tokens) < DEDUP_TITLE_THRESHOLD:
+        return False
+    return signature_similarity(a.signature, b.signature) >= DEDUP_THRESHOLD
+
+
+class NearDuplicateIndex:
+    """In-memory LSH index of job sketches."""
+
+    def __init__(self):
+        self.buckets = {}  # band key -> keys of the jobs in that bucket
+        self.sketches = {}  # job key -> JobSketch
+
+    def __len__(self):
+        return len(self.sketches)
+
+    def find(self, sketch: JobSketch) -> Optional[Hashable]:
+        """Key of an indexed near-duplicate of sketch, or None."""
+        checked = set()
+        for band in band_keys(sketch.signature):
+            for key in self.buckets.get(band, ()):
+                if key not in checked:
+                    checked.add(key)
+                    if is_near_duplicate(sketch, self.sketches[key]):
+                        return key
+        return None
+
+    def add(self, key: Hashable, sketch: JobSketch):
+        self.sketches[key] = sketch
+        for band in band_keys(sketch.signature):
+            self.buckets.setdefault(band, []).append(key)
+
+
+def deduplicate_jobs(jobs: List[Dict]) -> List[Dict]:
+    """
+    Drop exact and near-duplicate postings, keeping the first of each.
+
+    Jobs keep their order, so the earlier platform's copy wins.
+    """
+    seen = set()
+    index = NearDuplicateIndex()
+    unique_jobs = []
+    for job in jobs:
+        key = ((job.get('title') or '').lower().strip(), (job.get('company') or '').lower().strip())
+        if key in seen:
+            continue
+        seen.add(key)
+
+        sketch = job_sketch(job)
+        if index.find(sketch) is not None:
+            continue
+        index.add(len(unique_jobs), sketch)
+        unique_jobs.append(job)
+    return unique_jobs
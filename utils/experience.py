@@ -0,0 +1,217 @@
+"""
+Experience Extraction
+Classify the experience level a job asks for from its title and description.
+"""
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from utils.metrics import CACHE_REQUESTS
+
+# Levels in ascending order of seniority
+LEVELS = ('entry', 'mid', 'senior', 'principal')
+LEVEL_RANKS = {level: rank for rank, level in enumerate(LEVELS)}
+DEFAULT_LEVEL = 'mid'
+
+# Match score by distance between user and job level:
+# perfect match = 100, one level off = 75, two levels = 50, three levels = 25
+LEVEL_DISTANCE_SCORES = (100.0, 75.0, 50.0, 25.0)
+
+# Score used when a job has no description to classify
+NEUTRAL_SCORE = 50.0
+
+# "3-5 years", "2 to 4 yrs", "5+ years", "5 plus years", "3 years"
+_YEARS_PATTERN = re.compile(
+    r'(?<!\d)(?P<low>\d{1,2})\s*'
+    r'(?:(?:-|–|—|to)\s*(?P<high>\d{1,2})\s*)?'
+    r'(?P<plus>\+|plus\s)?\s*'
+    r'(?:years?|yrs?)\b',
+    re.IGNORECASE,
+)
+
+# One alternation for every level keyword; the named group tells the level
+_KEYWORD_PATTERN = re.compile(
+    r'\b(?:'
+    r'(?P<entry>entry[\s-]level|junior|jr\.?|graduate|intern(?:ship)?)'
+    r'|(?P<mid>mid[\s-]level|intermediate)'
+    r'|(?P<senior>senior|sr\.?|expert|lead)'
+    r'|(?P<principal>principal|staff|architect)'
+    r')(?!\w)',
+    re.IGNORECASE,
+)
+
+# Year counts above this are company ages, not requirements ("for 25 years...")
+MAX_REQUIRED_YEARS = 20
+
+
+def years_to_level(years: float) -> str:
+    """Map a number of years of experience to a level."""
+    if years < 2:
+        return 'entry'
+    elif years < 5:
+        return 'mid'
+    elif years < 10:
+        return 'senior'
+    return 'principal'
+
+
+def parse_years(value) -> float:
+    """Read a years-of-experience value such as 5, '5', or '5 years'."""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        match = re.search(r'\d+(?:\.\d+)?', value)
+        return float(match.group()) if match else 0
+    return 0
+
+
+def extract_required_years(text: str) -> Optional[int]:
+    """
+    Return the minimum years of experience a text asks for, if it states one.
+
+    With several mentions ("3+ years of Python, 5+ years overall") the highest
+    lower bound is taken, since that is the requirement the candidate must meet.
+    """
+    if not text:
+        return None
+
+    required = None
+    for match in _YEARS_PATTERN.finditer(text):
+        low = int(match.group('low'))
+        if low > MAX_REQUIRED_YEARS:
+            continue
+        if required is None or low > required:
+            required = low
+    return required
+
+
+def _keyword_level(text: str) -> Optional[str]:
+    """Return the level named most often in a text, if any."""
+    counts = [0] * len(LEVELS)
+    for match in _KEYWORD_PATTERN.finditer(text):
+        counts[LEVEL_RANKS[match.lastgroup]] += 1
+
+    best = max(counts)
+    if best == 0:
+        return None
+    # Ties go to the more senior level
+    return LEVELS[len(counts) - 1 - counts[::-1].index(best)]
+
+
+class ExperienceExtractor:
+    """
+    Experience-level classifier with a per-job result cache.
+
+    Signals are ranked by how specific they are: an explicit year requirement
+    in the description beats a level keyword in the title, which beats level
+    keywords scattered through the description.
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def fingerprint(text: str, title: str = '') -> str:
+        """Cache key for a job's title and description."""
+        return hashlib.sha1(f"{title}\x00{text}".encode('utf-8')).hexdigest()
+
+    def classify(self, text: str, title: str = '', fingerprint: Optional[str] = None) -> str:
+        """
+        Classify the experience level a job asks for.
+
+        Args:
+            text: Job description
+            title: Job title (optional)
+            fingerprint: Precomputed cache key (optional)
+
+        Returns:
+            One of LEVELS
+        """
+        key = fingerprint or self.fingerprint(text or '', title or '')
+        level = self._cache.get(key)
+        if level is not None:
+            self._cache.move_to_end(key)
+            CACHE_REQUESTS.inc(cache='experience', result='hit')
+            return level
+        CACHE_REQUESTS.inc(cache='experience', result='miss')
+
+        level = self._classify(text or '', title or '')
+
+        self._cache[key] = level
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return level
+
+    def classify_many(self, texts: Iterable[str], titles: Optional[Iterable[str]] = None) -> List[str]:
+        """Classify a batch of job descriptions (and optional titles)."""
+        texts = list(texts)
+        titles = list(titles) if titles is not None else [''] * len(texts)
+        return [self.classify(text, title) for text, title in zip(texts, titles)]
+
+    def rank_many(self, texts: Iterable[str], titles: Optional[Iterable[str]] = None):
+        """Classify a batch and return the level ranks as a NumPy array."""
+        import numpy as np
+
+        return np.fromiter(
+            (LEVEL_RANKS[level] for level in self.classify_many(texts, titles)),
+            dtype=np.int8,
+        )
+
+    def clear_cache(self):
+        """Forget all cached classifications."""
+        self._cache.clear()
+
+    def _classify(self, text: str, title: str) -> str:
+        years = extract_required_years(text)
+        if years is not None:
+            return years_to_level(years)
+
+        return _keyword_level(title) or _keyword_level(text) or DEFAULT_LEVEL
+
+
+def level_match_scores(user_experience, job_levels):
+    """
+    Score a user's experience against many job levels at once.
+
+    Args:
+        user_experience: Years of experience (number or string like "5 years")
+        job_levels: Sequence of job levels; None marks a job with no description
+
+    Returns:
+        NumPy array of scores from 25 to 100 (NEUTRAL_SCORE where level is None)
+    """
+    return level_match_matrix([user_experience], job_levels)[0]
+
+
+def level_match_matrix(user_experiences, job_levels):
+    """
+    Score many users' experience against many job levels at once.
+
+    Returns:
+        (users, jobs) NumPy array of scores, as level_match_scores per user
+    """
+    import numpy as np
+
+    user_ranks = np.fromiter(
+        (LEVEL_RANKS[years_to_level(parse_years(e))] for e in user_experiences),
+        dtype=np.int16,
+    )
+    job_ranks = np.fromiter(
+        (LEVEL_RANKS.get(level, -1) if level is not None else -1 for level in job_levels),
+        dtype=np.int16,
+    )
+
+    distances = np.abs(job_ranks[None, :] - user_ranks[:, None]).clip(0, 3)
+    scores = np.asarray(LEVEL_DISTANCE_SCORES)[distances]
+    return np.where(job_ranks[None, :] < 0, NEUTRAL_SCORE, scores)
+
+
+# Shared extractor so the cache is reused across requests in a worker
+default_extractor = ExperienceExtractor()
+
+
+def classify_experience(text: str, title: str = '') -> str:
+    """Classify a job's experience level using the shared extractor."""
+    return default_extractor.classify(text, title)
@@ -0,0 +1,184 @@
+"""
+Job Feature Extraction
+Precompute the job-side matching features once, when a job enters the system,
+so the matcher only has to do user-side work per request.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+from utils.experience import classify_experience
+
+# Bump when the feature layout or extraction rules change so stale
+# features stored with older jobs are recomputed on next use.
+FEATURE_VERSION = 2
+
+# Size of the hashed term space used for job/user text vectors
+TERM_VECTOR_FEATURES = 2 ** 18
+
+# Skills the matcher recognises in free text
+MATCHER_SKILL_KEYWORDS = [
+    # Common programming languages
+    'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php', 'go', 'rust',
+    'typescript', 'swift', 'kotlin', 'scala', 'r', 'matlab',
+    # Frameworks and libraries
+    'react', 'angular', 'vue', 'django', 'flask', 'spring', 'express',
+    'fastapi', 'laravel', 'rails', 'nextjs', 'gatsby', 'svelte',
+    # Tools and technologies
+    'docker', 'kubernetes', 'git', 'jenkins', 'aws', 'azure', 'gcp',
+    'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
+]
+
+# Words that carry no signal when comparing job titles
+TITLE_STOP_WORDS = {
+    'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with',
+    'm', 'f', 'd', 'w', 'x',  # gender markers like (m/f/d)
+}
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def normalize_skill(skill: str) -> str:
+    """Return the canonical ID for a skill name (lowercase, single-spaced)."""
+    return re.sub(r'\s+', ' ', str(skill)).strip().lower()
+
+
+@lru_cache(maxsize=1)
+def _skill_matcher():
+    """Compile all matcher skill keywords into a single alternation."""
+    # Longest first so multi-character names win over their prefixes
+    keywords = sorted(MATCHER_SKILL_KEYWORDS, key=len, reverse=True)
+    alternation = '|'.join(re.escape(k) for k in keywords)
+    return re.compile(r'(?<![\w+#])(' + alternation + r')(?![\w+#])')
+
+
+def extract_skill_ids(text: str) -> List[str]:
+    """Extract canonical skill IDs from free text in a single scan."""
+    if not text:
+        return []
+    return sorted(set(_skill_matcher().findall(text.lower())))
+
+
+def tokenize_title(title: str) -> List[str]:
+    """Split a job title into normalized tokens, dropping filler words."""
+    if not title:
+        return []
+    tokens = (t.rstrip('.') for t in _TOKEN_PATTERN.findall(title.lower()))
+    return [t for t in tokens if t and t not in TITLE_STOP_WORDS]
+
+
+def job_document(job: Dict) -> str:
+    """Build the text the matcher compares against the user profile."""
+    return f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('skills', []))}"
+
+
+def job_fingerprint(job: Dict) -> str:
+    """Stable identity for a job posting across scrapes."""
+    key = '|'.join(
+        normalize_skill(job.get(field) or '') for field in ('title', 'company', 'url')
+    )
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_vectorizer():
+    """
+    Shared text vectorizer for job and user documents.
+
+    Terms are hashed rather than looked up in a fitted vocabulary, so a vector
+    computed when a job is ingested stays comparable with user vectors built
+    later, in any worker process.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(
+        n_features=TERM_VECTOR_FEATURES,
+        stop_words='english',
+        alternate_sign=False,
+        norm='l2',
+    )
+
+
+def _sparse_row_to_dict(row) -> Dict:
+    """Serialize one CSR row into a JSON-friendly dict."""
+    return {
+        'indices': row.indices.tolist(),
+        'values': [round(float(v), 6) for v in row.data],
+    }
+
+
+def term_vectors_to_matrix(vectors: List[Dict]):
+    """Stack serialized term vectors back into a CSR matrix."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+
+    indptr = [0]
+    indices = []
+    data = []
+    for vector in vectors:
+        indices.extend(vector.get('indices', []))
+        data.extend(vector.get('values', []))
+        indptr.append(len(indices))
+
+    return csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(len(vectors), TERM_VECTOR_FEATURES),
+    )
+
+
+def compute_job_features(job: Dict, term_vector: Dict = None) -> Dict:
+    """
+    Compute the matching features for a single job.
+
+    Args:
+        job: Job dictionary as produced by the scrapers
+        term_vector: Optional precomputed serialized term vector
+
+    Returns:
+        JSON-serializable feature dictionary
+    """
+    doc = job_document(job)
+
+    if term_vector is None:
+        term_vector = _sparse_row_to_dict(get_vectorizer().transform([doc]))
+
+    skill_ids = {normalize_skill(s) for s in job.get('skills', []) if s}
+    skill_ids.update(extract_skill_ids(doc))
+    skill_ids.discard('')
+
+    description = job.get('description', '')
+
+    return {
+        'version': FEATURE_VERSION,
+        'fingerprint': job_fingerprint(job),
+        'skill_ids': sorted(skill_ids),
+        # None means "no description", which the matcher scores as neutral
+        'experience_level': classify_experience(description, job.get('title', '')) if description else None,
+        'title_tokens': tokenize_title(job.get('title', '')),
+        'term_vector': term_vector,
+    }
+
+
+def has_current_features(job: Dict) -> bool:
+    """Check whether a job carries features from the current extractor."""
+    features = job.get('features')
+    return bool(features) and features.get('version') == FEATURE_VERSION
+
+
+def attach_job_features(jobs: List[Dict]) -> List[Dict]:
+    """
+    Attach features to every job that does not already carry current ones.
+
+    Text vectors for the whole batch are computed in one vectorizer call.
+    Jobs are updated in place and the same list is returned.
+    """
+    pending = [job for job in jobs if not has_current_features(job)]
+    if not pending:
+        return jobs
+
+    matrix = get_vectorizer().transform([job_document(job) for job in pending])
+    for i, job in enumerate(pending):
+        job['features'] = compute_job_features(job, _sparse_row_to_dict(matrix[i]))
+
+    return jobs
@@ -0,0 +1,109 @@
+"""
+Inverted Job Index
+Map canonical skill IDs and title tokens to jobs, so matching only scores
+jobs that share at least one term with the user.
+"""
+import heapq
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from utils.job_features import extract_skill_ids, normalize_skill, tokenize_title
+
+SKILL_PREFIX = 'skill:'
+TITLE_PREFIX = 'title:'
+
+
+def job_index_terms(features: Dict) -> List[str]:
+    """Index terms for a job, from its precomputed features."""
+    terms = {SKILL_PREFIX + skill for skill in features.get('skill_ids', [])}
+    terms.update(TITLE_PREFIX + token for token in features.get('title_tokens', []))
+    return sorted(terms)
+
+
+def profile_index_terms(skills: Iterable[str], title_text: str = '') -> List[str]:
+    """
+    Query terms for a user profile.
+
+    Args:
+        skills: User skill names (any case)
+        title_text: Desired job title, or free-text keywords from chat
+
+    Returns:
+        Sorted list of index terms
+    """
+    skill_ids = {normalize_skill(s) for s in skills if s}
+    skill_ids.update(extract_skill_ids(title_text))
+    skill_ids.discard('')
+
+    terms = {SKILL_PREFIX + skill for skill in skill_ids}
+    terms.update(TITLE_PREFIX + token for token in tokenize_title(title_text))
+    return sorted(terms)
+
+
+def _by_hits(item):
+    job_id, hits = item
+    return -hits, job_id
+
+
+class InvertedJobIndex:
+    """In-memory postings from index terms to job IDs"""
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.job_terms = {}
+
+    @classmethod
+    def from_jobs(cls, jobs: List[Dict], key: str = None):
+        """
+        Build an index over jobs carrying features.
+
+        Args:
+            jobs: Jobs with a 'features' dict
+            key: Job field to use as ID (default: position in the list)
+        """
+        index = cls()
+        for position, job in enumerate(jobs):
+            job_id = job[key] if key else position
+            index.add(job_id, job_index_terms(job['features']))
+        return index
+
+    def __len__(self):
+        return len(self.job_terms)
+
+    def add(self, job_id: Hashable, terms: Iterable[str]):
+        """Add or replace the postings for a job."""
+        if job_id in self.job_terms:
+            self.remove(job_id)
+
+        terms = list(terms)
+        self.job_terms[job_id] = terms
+        for term in terms:
+            self.postings[term].add(job_id)
+
+    def remove(self, job_id: Hashable):
+        """Drop a job from the index."""
+        for term in self.job_terms.pop(job_id, []):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.discard(job_id)
+                if not posting:
+                    del self.postings[term]
+
+    def candidates(self, terms: Iterable[str], budget: Optional[int] = None) -> List[Hashable]:
+        """
+        Union of the postings for the query terms.
+
+        Jobs matching more query terms come first, ties going to the lowest
+        job ID, so the order (and the jobs kept under a budget) doesn't vary
+        with set iteration order between processes. When a budget is given,
+        only that many jobs are returned.
+        """
+        hits = Counter()
+        for term in set(terms):
+            hits.update(self.postings.get(term, ()))
+
+        if budget is None:
+            ranked = sorted(hits.items(), key=_by_hits)
+        else:
+            ranked = heapq.nsmallest(budget, hits.items(), key=_by_hits)
+        return [job_id for job_id, _ in ranked]
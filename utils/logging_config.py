@@ -0,0 +1,133 @@
+"""
+Logging Configuration
+Non-blocking, structured logging for the scraper and API: records are put on
+a queue and formatted and written (JSON file, console) by a background
+listener thread, off the request path.
+
+Under gunicorn every worker has its own listener appending to the same file,
+so the file is never rotated in-process: rotate it with an external tool
+(logrotate, without copytruncate) and each worker reopens the new file on
+its next write. Or set LOG_FILE='' and let the process manager collect the
+console output.
+
+Environment:
+    LOG_LEVEL: Minimum level for the 'jobflow' loggers (default INFO)
+    LOG_FILE: Log file path, '' to log to the console only (default logs/jobflow.log)
+    LOG_FORMAT: Console format, 'text' or 'json' (default text; the file is always JSON)
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from pathlib import Path
+
+ROOT_LOGGER = 'jobflow'
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_state = {'listener': None, 'handler': None, 'handlers': None}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra` fields as top-level keys"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _TextFormatter(logging.Formatter):
+    """Classic one-line format, with extra fields appended as key=value"""
+
+    def format(self, record):
+        line = super().format(record)
+        extras = [
+            f"{key}={value}" for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS and not key.startswith('_')
+        ]
+        return f"{line} [{' '.join(extras)}]" if extras else line
+
+
+def _build_handlers(log_dir):
+    handlers = []
+
+    log_file = os.getenv('LOG_FILE', str(Path(log_dir) / 'jobflow.log'))
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        # Reopens the file when it is rotated away, so several processes can share it
+        file_handler = WatchedFileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    console_handler = logging.StreamHandler()
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(_TextFormatter(TEXT_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
+    handlers.append(console_handler)
+    return handlers
+
+
+def _start_listener():
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *_state['handlers'], respect_handler_level=True)
+    listener.start()
+    _state['listener'] = listener
+    return log_queue
+
+
+def configure_logging(log_dir='logs'):
+    """
+    Route every 'jobflow.*' logger through the queue. Safe to call repeatedly;
+    only the first call sets up handlers. Modules just use
+    logging.getLogger('jobflow.<name>') and never configure handlers themselves.
+
+    Returns:
+        The 'jobflow' root logger
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    if _state['handler'] is not None:
+        return logger
+
+    _state['handlers'] = _build_handlers(log_dir)
+    handler = QueueHandler(_start_listener())
+    _state['handler'] = handler
+
+    logger.addHandler(handler)
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+    return logger
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    listener = _state['listener']
+    if listener is not None:
+        _state['listener'] = None
+        listener.stop()
+
+
+def _restart_after_fork():
+    # The listener thread does not survive fork; give the child its own queue and listener
+    if _state['handler'] is not None:
+        _state['handler'].queue = _start_listener()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+atexit.register(shutdown_logging)
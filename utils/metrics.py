@@ -0,0 +1,347 @@
+"""
+Metrics
+Prometheus-style counters and histograms for the scraper, matcher and DB,
+rendered in the text exposition format for the /metrics endpoint.
+
+Each process keeps its own values. When METRICS_DIR is set (required with
+several gunicorn workers), every process also writes its values to a shard
+file there, and rendering sums the shards of all workers.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+# Seconds between shard writes while a worker has new observations
+FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1.0'))
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = {}
+_lock = threading.Lock()
+_state = {'pid': os.getpid(), 'started': time.time_ns(), 'dirty': False, 'flusher_pid': None}
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if name in _registry:
+            raise ValueError(f"Metric already registered: {name}")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        _registry[name] = self
+
+    def _key(self, labels: Dict) -> tuple:
+        if len(labels) != len(self.labelnames) or not all(name in labels for name in self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def describe(self) -> Dict:
+        return {'kind': self.kind, 'documentation': self.documentation, 'labelnames': list(self.labelnames)}
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, per label set"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+        _touched()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (usually seconds) over fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            entry = self.values.get(key)
+            if entry is None:
+                # Per-bucket (non-cumulative) counts, last slot is +Inf; then sum
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+        _touched()
+
+    def time(self, **labels):
+        """Time a block or, used as a decorator, every call of a function."""
+        return _Timer(self, labels)
+
+    def describe(self) -> Dict:
+        description = super().describe()
+        description['buckets'] = list(self.buckets)
+        return description
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+    def __call__(self, func):
+        import functools
+
+        histogram, labels = self.histogram, self.labels
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, **labels)
+        return wrapper
+
+
+# ============= MULTI-PROCESS SHARDS =============
+
+def _touched():
+    if METRICS_DIR is None:
+        return
+    _state['dirty'] = True
+    if _state['flusher_pid'] != os.getpid():
+        _start_flusher()
+
+
+def _start_flusher():
+    _state['flusher_pid'] = os.getpid()
+
+    def run():
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            if _state['dirty']:
+                flush()
+
+    threading.Thread(target=run, name='metrics-flusher', daemon=True).start()
+
+
+# Counts of workers that have exited, summed with the live workers' shards
+_RETIRED_SHARD = 'metrics-retired.json'
+
+
+def _shard_path() -> Path:
+    # Start time in the name so a recycled pid never overwrites a dead worker's counts
+    return Path(METRICS_DIR) / f"metrics-{_state['pid']}-{_state['started']}.json"
+
+
+def snapshot() -> Dict:
+    """This process's metric values as a JSON-serializable dict."""
+    with _lock:
+        return {
+            name: dict(metric.describe(), values=[
+                [list(key), [list(v[0]), v[1]] if metric.kind == 'histogram' else v]
+                for key, v in metric.values.items()
+            ])
+            for name, metric in _registry.items()
+        }
+
+
+def flush():
+    """Write this process's values to its shard file (no-op without METRICS_DIR)."""
+    if METRICS_DIR is None:
+        return
+    _state['dirty'] = False
+    data = snapshot()
+    path = _shard_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def clear_shards():
+    """Remove every worker's shard; gunicorn's on_starting hook calls this."""
+    if METRICS_DIR is None:
+        return
+    for path in Path(METRICS_DIR).glob('metrics-*.json'):
+        path.unlink(missing_ok=True)
+
+
+def retire_shards(pid: int):
+    """
+    Fold a dead worker's shards into the retired shard and remove them.
+
+    Counters keep the dead worker's counts (they must not go down) while the
+    number of shard files stays bounded by the number of live workers.
+    Called from the gunicorn master only, so the retired shard has one writer.
+    """
+    if METRICS_DIR is None:
+        return
+    paths = list(Path(METRICS_DIR).glob(f'metrics-{pid}-*.json'))
+    if not paths:
+        return
+    retired_path = Path(METRICS_DIR) / _RETIRED_SHARD
+    merged = {}
+    for path in [retired_path] + paths:
+        try:
+            with open(path) as f:
+                _merge(merged, json.load(f))
+        except (OSError, ValueError):
+            continue
+    data = {
+        name: dict(metric, values=[[list(key), value] for key, value in metric['values'].items()])
+        for name, metric in merged.items()
+    }
+    tmp_path = retired_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, retired_path)
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _merge(target: Dict, shard: Dict):
+    for name, metric in shard.items():
+        merged = target.setdefault(name, dict(metric, values={}))
+        for key, value in metric['values']:
+            key = tuple(key)
+            if metric['kind'] == 'histogram':
+                current = merged['values'].get(key)
+                if current is None or len(current[0]) != len(value[0]):
+                    merged['values'][key] = [list(value[0]), value[1]]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+            else:
+                merged['values'][key] = merged['values'].get(key, 0.0) + value
+
+
+def collect() -> Dict:
+    """Metric values summed over every worker (or just this process)."""
+    merged = {}
+    if METRICS_DIR is None:
+        _merge(merged, snapshot())
+        return merged
+
+    flush()
+    for path in sorted(Path(METRICS_DIR).glob('metrics-*.json')):
+        try:
+            with open(path) as f:
+                _merge(merged, json.load(f))
+        except (OSError, ValueError):
+            continue  # Shard being replaced or removed right now
+    return merged
+
+
+# ============= EXPOSITION =============
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra: Optional[tuple] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def render(metrics: Optional[Dict] = None) -> str:
+    """Metrics in the Prometheus text exposition format (version 0.0.4)."""
+    metrics = collect() if metrics is None else metrics
+    lines = []
+    for name in sorted(metrics):
+        metric = metrics[name]
+        lines.append(f"# HELP {name} {metric['documentation']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        labelnames = metric['labelnames']
+
+        for key in sorted(metric['values']):
+            value = metric['values'][key]
+            if metric['kind'] == 'histogram':
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(list(metric['buckets']) + [float('inf')], counts):
+                    cumulative += count
+                    le = _format_value(bound)
+                    lines.append(f"{name}_bucket{_labels(labelnames, key, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labelnames, key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_labels(labelnames, key)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(labelnames, key)} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """Drop this process's values, e.g. after warming up the master before fork."""
+    with _lock:
+        for metric in _registry.values():
+            metric.values = {}
+        _state['dirty'] = False
+
+
+def _reset_after_fork():
+    """A forked worker starts from zero so the master's counts aren't duplicated."""
+    global _lock
+    _lock = threading.Lock()
+    reset()
+    _state.update(pid=os.getpid(), started=time.time_ns(), flusher_pid=None)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(lambda: _state['dirty'] and flush())
+
+
+# ============= JOBFLOW METRICS =============
+
+SCRAPER_REQUESTS = Counter(
+    'jobflow_scraper_requests_total', 'Job board scrape attempts by outcome', ['platform', 'outcome'])
+SCRAPER_SECONDS = Histogram(
+    'jobflow_scraper_request_seconds', 'Time to scrape one job board', ['platform'])
+SCRAPER_JOBS = Counter(
+    'jobflow_scraper_jobs_total', 'Valid jobs returned per job board', ['platform'])
+VALIDATOR_JOBS = Counter(
+    'jobflow_validator_jobs_total', 'Jobs checked by JobValidator', ['result'])
+VALIDATOR_REJECTIONS = Counter(
+    'jobflow_validator_rejections_total', 'Issues found on rejected jobs, by reason', ['reason'])
+MATCHER_SECONDS = Histogram(
+    'jobflow_matcher_seconds', 'Time to match a profile against a job list', ['matcher'])
+STAGE_SECONDS = Histogram(
+    'jobflow_request_stage_seconds', 'Time per traced request stage', ['stage'])
+DB_QUERY_SECONDS = Histogram(
+    'jobflow_db_query_seconds', 'Database operation latency', ['operation'])
+CACHE_REQUESTS = Counter(
+    'jobflow_cache_requests_total', 'Cache lookups by result (hit or miss)', ['cache', 'result'])
+HTTP_REQUESTS = Counter(
+    'jobflow_http_requests_total', 'API requests by endpoint and status', ['endpoint', 'method', 'status'])
+HTTP_SECONDS = Histogram(
+    'jobflow_http_request_seconds', 'API request latency', ['endpoint'])
+EMAILS_SENT = Counter(
+    'jobflow_emails_total', 'Outbox delivery attempts by email kind and result', ['kind', 'result'])
@@ -0,0 +1,147 @@
+"""
+Request Profiling
+Opt-in cProfile capture of single API requests, stored on disk for download
+by admins. Requests that are not selected for profiling only pay for one
+sampling check.
+
+Environment:
+    PROFILE_DIR: Where profiles are stored (default profiles)
+    PROFILE_SAMPLE_RATE: Share of recommendation requests profiled (default 0)
+    PROFILE_KEEP: Newest profiles kept on disk (default 50)
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILE_DIR = Path(os.getenv('PROFILE_DIR', 'profiles'))
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '50'))
+
+# Requests eligible for sampling: the scrape -> match -> save pipeline
+SAMPLED_PATH_PREFIX = '/api/recommend/'
+PROFILE_HEADER = 'X-Profile'
+
+_PROFILE_ID = re.compile(r'^[\w.-]+$')
+
+# cProfile allows only one active profiler per process
+_active = threading.Lock()
+
+
+def sampled(path: str) -> bool:
+    """Whether a request should be profiled by the sampling rate alone."""
+    return (
+        PROFILE_SAMPLE_RATE > 0
+        and path.startswith(SAMPLED_PATH_PREFIX)
+        and random.random() < PROFILE_SAMPLE_RATE
+    )
+
+
+class RequestProfiler:
+    """cProfile session for one request"""
+
+    def __init__(self, trigger: str):
+        self.trigger = trigger
+        self.profile = cProfile.Profile()
+        self.started = None
+
+    @classmethod
+    def start(cls, trigger: str) -> Optional['RequestProfiler']:
+        """Begin profiling, or return None if another request is being profiled."""
+        if not _active.acquire(blocking=False):
+            return None
+        profiler = cls(trigger)
+        profiler.started = time.perf_counter()
+        try:
+            profiler.profile.enable()
+        except ValueError:
+            # Another profiling tool is active in this process
+            _active.release()
+            return None
+        return profiler
+
+    def stop(self):
+        """Stop profiling; safe to call more than once."""
+        if self.started is None:
+            return
+        self.profile.disable()
+        self.duration = time.perf_counter() - self.started
+        self.started = None
+        _active.release()
+
+    def save(self, endpoint: str, method: str, path: str, status: int) -> str:
+        """Write the profile and its metadata to PROFILE_DIR; returns the profile ID."""
+        self.stop()
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+        slug = re.sub(r'[^\w.-]+', '_', endpoint or 'unknown')
+        profile_id = f"{int(time.time() * 1000)}-{os.getpid()}-{slug}"
+        self.profile.dump_stats(PROFILE_DIR / f"{profile_id}.prof")
+
+        metadata = {
+            'id': profile_id,
+            'endpoint': endpoint,
+            'method': method,
+            'path': path,
+            'status': status,
+            'trigger': self.trigger,
+            'duration_ms': round(self.duration * 1000, 1),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with open(PROFILE_DIR / f"{profile_id}.json", 'w') as f:
+            json.dump(metadata, f)
+
+        _prune()
+        return profile_id
+
+
+def _prune():
+    """Keep only the newest PROFILE_KEEP profiles."""
+    profiles = sorted(PROFILE_DIR.glob('*.prof'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in profiles[PROFILE_KEEP:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix('.json').unlink(missing_ok=True)
+
+
+def list_profiles() -> List[Dict]:
+    """Metadata of stored profiles, newest first."""
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = []
+    for meta_path in PROFILE_DIR.glob('*.json'):
+        try:
+            with open(meta_path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        prof_path = meta_path.with_suffix('.prof')
+        if prof_path.exists():
+            metadata['size_bytes'] = prof_path.stat().st_size
+            profiles.append(metadata)
+    return sorted(profiles, key=lambda m: m['id'], reverse=True)
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """Path of a stored profile, or None for unknown or malformed IDs."""
+    if not _PROFILE_ID.match(profile_id or ''):
+        return None
+    path = PROFILE_DIR / f"{profile_id}.prof"
+    return path if path.exists() else None
+
+
+def profile_report(profile_id: str, sort: str = 'cumulative', limit: int = 40) -> Optional[str]:
+    """Human-readable pstats summary of a stored profile."""
+    path = profile_path(profile_id)
+    if path is None:
+        return None
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,72 @@
+"""
+Query Matching
+Prepare a search's keywords once and check listings against them field by
+field, instead of building a lowercased concatenation of every listing's
+text per platform. Candidates are found with str.find (much faster here
+than an alternation regex) and then checked for word boundaries.
+
+Keywords match whole words: "java" matches "Java/Kotlin" but not
+"JavaScript", and "go" doesn't match "Google". Symbols count as part of a
+keyword, so "c++" and ".net" work too; boundaries are only checked next to
+a keyword's letters and digits, so ".net" also matches "ASP.NET".
+
+Fields are checked in the order given, so callers pass the short ones
+(title, tags) before the description, which is only scanned when nothing
+else matched.
+"""
+from typing import Iterable, Sequence, Union
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class QueryMatcher:
+    """A search's keywords, prepared once and reused across platforms."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(k.strip().lower() for k in keywords if k and k.strip()))
+        # (keyword, whether its start needs a boundary, whether its end does)
+        self._patterns = tuple(
+            (keyword, _is_word_char(keyword[0]), _is_word_char(keyword[-1])) for keyword in self.keywords
+        )
+
+    @classmethod
+    def of(cls, keywords: Union['QueryMatcher', Iterable[str]]) -> 'QueryMatcher':
+        """keywords as a matcher, building one unless it already is one."""
+        return keywords if isinstance(keywords, cls) else cls(keywords)
+
+    def matches_text(self, text: str) -> bool:
+        """Whether any keyword appears in text as a whole word."""
+        text = text.lower()
+        for keyword, bounded_start, bounded_end in self._patterns:
+            start = text.find(keyword)
+            while start != -1:
+                end = start + len(keyword)
+                if ((not bounded_start or start == 0 or not _is_word_char(text[start - 1]))
+                        and (not bounded_end or end == len(text) or not _is_word_char(text[end]))):
+                    return True
+                start = text.find(keyword, start + 1)
+        return False
+
+    def matches(self, fields: Sequence) -> bool:
+        """
+        Whether any keyword appears in the fields.
+
+        Args:
+            fields: Strings or lists of strings (tags), checked in order;
+                None and other values are skipped
+        """
+        matches_text = self.matches_text
+        for field in fields:
+            if field.__class__ is str:
+                if matches_text(field):
+                    return True
+            elif isinstance(field, (list, tuple)):
+                for item in field:
+                    if isinstance(item, str) and matches_text(item):
+                        return True
+        return False
+
+    def __repr__(self):
+        return f"QueryMatcher({list(self.keywords)!r})"
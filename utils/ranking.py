@@ -0,0 +1,34 @@
+"""
+Ranking Utilities
+Select the best-scoring items without sorting the whole candidate set.
+"""
+import numpy as np
+
+
+def top_k_indices(scores, k=None):
+    """
+    Return the indices of the k highest scores, best first.
+
+    Uses argpartition, so selecting K of N items costs O(N + K log K)
+    instead of the O(N log N) of a full sort. Ties keep input order.
+
+    Args:
+        scores: 1-D array-like of scores
+        k: Number of indices to return (None or >= N returns all, ranked)
+
+    Returns:
+        NumPy array of indices into scores
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = scores.shape[0]
+
+    if k is None or k >= n:
+        candidates = np.arange(n)
+    elif k <= 0:
+        return np.empty(0, dtype=np.int64)
+    else:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+
+    # Order the selected items by score, then by original position
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
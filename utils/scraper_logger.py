@@ -3,41 +3,20 @@ Scraper Logger
 Provides structured logging for job scraping operations.
 """
 import logging
-from datetime import datetime
+import time
 from pathlib import Path
+from utils.logging_config import configure_logging
+from utils.metrics import SCRAPER_JOBS, SCRAPER_REQUESTS, SCRAPER_SECONDS
 
 class ScraperLogger:
     """Structured logger for scraper operations"""
     
     def __init__(self, log_dir='logs'):
         self.log_dir = Path(log_dir)
-        self.log_dir.mkdir(exist_ok=True)
         
-        # Create logger
-        self.logger = logging.getLogger('JobScraper')
-        self.logger.setLevel(logging.INFO)
-        
-        # Prevent duplicate handlers
-        if not self.logger.handlers:
-            # File handler
-            log_file = self.log_dir / f'scraper_{datetime.now().strftime("%Y%m%d")}.log'
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(logging.INFO)
-            
-            # Console handler
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
-            
-            # Formatter
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            file_handler.setFormatter(formatter)
-            console_handler.setFormatter(formatter)
-            
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+        # Records go through the shared queue pipeline (JSON file + console)
+        configure_logging(self.log_dir)
+        self.logger = logging.getLogger('jobflow.scraper')
         
         self.stats = {
             'platforms_attempted': [],
@@ -47,46 +26,70 @@ class ScraperLogger:
             'valid_jobs': 0,
             'invalid_jobs': 0
         }
+        self._attempt_started = {}
     
     def log_platform_attempt(self, platform: str):
         """Log platform scraping attempt"""
         self.stats['platforms_attempted'].append(platform)
-        self.logger.info(f"Attempting to scrape {platform}")
+        self._attempt_started[platform] = time.perf_counter()
+        self.logger.debug(f"Attempting to scrape {platform}", extra={'platform': platform})
     
     def log_platform_success(self, platform: str, job_count: int):
         """Log successful platform scrape"""
         self.stats['platforms_succeeded'].append(platform)
         self.stats['total_jobs_scraped'] += job_count
-        self.logger.info(f"✓ {platform}: Found {job_count} jobs")
+        duration = self._record_metrics(platform, 'success')
+        SCRAPER_JOBS.inc(job_count, platform=platform)
+        self.logger.info(f"✓ {platform}: Found {job_count} jobs", extra={
+            'platform': platform, 'jobs': job_count, 'duration_ms': duration,
+        })
     
-    def log_platform_failure(self, platform: str, error: str):
-        """Log failed platform scrape"""
+    def log_platform_failure(self, platform: str, error):
+        """Log failed platform scrape (error may be the exception or its message)"""
         self.stats['platforms_failed'].append(platform)
-        self.logger.warning(f"✗ {platform}: {error}")
+        duration = self._record_metrics(platform, 'failure')
+        self.logger.warning(f"✗ {platform}: {error}", extra={
+            'platform': platform, 'duration_ms': duration,
+            'error_class': type(error).__name__ if isinstance(error, BaseException) else None,
+        })
+    
+    def _record_metrics(self, platform: str, outcome: str):
+        """Count the attempt and its duration in the shared metrics; returns the duration in ms"""
+        SCRAPER_REQUESTS.inc(platform=platform, outcome=outcome)
+        started = self._attempt_started.pop(platform, None)
+        if started is None:
+            return None
+        seconds = time.perf_counter() - started
+        SCRAPER_SECONDS.observe(seconds, platform=platform)
+        return round(seconds * 1000, 1)
     
     def log_validation_result(self, valid_count: int, invalid_count: int):
         """Log validation results"""
         self.stats['valid_jobs'] = valid_count
         self.stats['invalid_jobs'] = invalid_count
-        self.logger.info(f"Validation: {valid_count} valid, {invalid_count} invalid")
+        self.logger.info(f"Validation: {valid_count} valid, {invalid_count} invalid", extra={
+            'valid_jobs': valid_count, 'invalid_jobs': invalid_count,
+        })
     
     def log_search_summary(self, query: str, total_results: int):
         """Log search summary"""
-        self.logger.info(f"Search '{query}' completed: {total_results} jobs returned")
+        self.logger.info(f"Search '{query}' completed: {total_results} jobs returned", extra={
+            'query': query, 'jobs': total_results,
+        })
     
     def get_stats(self):
         """Get scraping statistics"""
         return self.stats.copy()
     
     def print_summary(self):
-        """Print summary of scraping session"""
-        print("\n" + "="*70)
-        print("SCRAPING SESSION SUMMARY")
-        print("="*70)
-        print(f"Platforms Attempted: {len(self.stats['platforms_attempted'])}")
-        print(f"Platforms Succeeded: {len(self.stats['platforms_succeeded'])}")
-        print(f"Platforms Failed: {len(self.stats['platforms_failed'])}")
-        print(f"Total Jobs Scraped: {self.stats['total_jobs_scraped']}")
-        print(f"Valid Jobs: {self.stats['valid_jobs']}")
-        print(f"Invalid Jobs: {self.stats['invalid_jobs']}")
-        print("="*70 + "\n")
+        """Log a summary of the scraping session"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug("Scraping session summary", extra={
+            'platforms_attempted': len(self.stats['platforms_attempted']),
+            'platforms_succeeded': len(self.stats['platforms_succeeded']),
+            'platforms_failed': len(self.stats['platforms_failed']),
+            'total_jobs_scraped': self.stats['total_jobs_scraped'],
+            'valid_jobs': self.stats['valid_jobs'],
+            'invalid_jobs': self.stats['invalid_jobs'],
+        })
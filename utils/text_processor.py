@@ -3,8 +3,44 @@ Text Processing Utilities
 Clean and process job descriptions and other text data.
 """
 import re
-from bs4 import BeautifulSoup
 from html import unescape
+from utils.tracing import traced
+
+# Comprehensive list of tech skills
+SKILL_KEYWORDS = [
+    # Programming Languages
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 
+    'Go', 'Rust', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'Perl',
+    
+    # Frontend
+    'React', 'Angular', 'Vue', 'Vue.js', 'Svelte', 'Next.js', 'Nuxt.js',
+    'HTML', 'CSS', 'SASS', 'SCSS', 'Tailwind', 'Bootstrap', 'jQuery',
+    
+    # Backend
+    'Node.js', 'Express', 'Django', 'Flask', 'FastAPI', 'Spring', 'Spring Boot',
+    'ASP.NET', '.NET', 'Rails', 'Laravel', 'Symfony',
+    
+    # Databases
+    'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Elasticsearch',
+    'Cassandra', 'DynamoDB', 'Oracle', 'SQLite', 'MariaDB',
+    
+    # Cloud & DevOps
+    'AWS', 'Azure', 'GCP', 'Google Cloud', 'Docker', 'Kubernetes', 'K8s',
+    'Jenkins', 'GitLab', 'CircleCI', 'Travis CI', 'Terraform', 'Ansible',
+    
+    # Data & AI
+    'Machine Learning', 'ML', 'Deep Learning', 'AI', 'TensorFlow', 'PyTorch',
+    'Keras', 'Scikit-learn', 'Pandas', 'NumPy', 'Data Science', 'Big Data',
+    'Spark', 'Hadoop', 'Airflow',
+    
+    # Mobile
+    'React Native', 'Flutter', 'iOS', 'Android', 'Swift', 'Kotlin',
+    
+    # Other
+    'Git', 'GitHub', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum',
+    'DevOps', 'CI/CD', 'Linux', 'Unix', 'Bash', 'PowerShell',
+    'Jira', 'Confluence', 'Figma', 'Adobe XD'
+]
 
 def clean_html(text: str) -> str:
     """
@@ -22,7 +58,8 @@ def clean_html(text: str) -> str:
     # Decode HTML entities
     text = unescape(text)
     
-    # Parse HTML and extract text
+    # Parse HTML and extract text (bs4 is imported on first use)
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(text, 'html.parser')
     
     # Remove script and style elements
@@ -43,6 +80,7 @@ def clean_html(text: str) -> str:
     
     return text
 
+@traced('clean')
 def clean_description(description: str, max_length: int = 1000) -> str:
     """
     Clean and format job description.
@@ -91,6 +129,7 @@ def clean_description(description: str, max_length: int = 1000) -> str:
     
     return clean_text.strip()
 
+@traced('extract_skills')
 def extract_skills_from_text(text: str, max_skills: int = 15) -> list:
     """
     Extract technical skills from job description.
@@ -102,46 +141,10 @@ def extract_skills_from_text(text: str, max_skills: int = 15) -> list:
     Returns:
         List of detected skills
     """
-    # Comprehensive list of tech skills
-    skill_keywords = [
-        # Programming Languages
-        'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 
-        'Go', 'Rust', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'Perl',
-        
-        # Frontend
-        'React', 'Angular', 'Vue', 'Vue.js', 'Svelte', 'Next.js', 'Nuxt.js',
-        'HTML', 'CSS', 'SASS', 'SCSS', 'Tailwind', 'Bootstrap', 'jQuery',
-        
-        # Backend
-        'Node.js', 'Express', 'Django', 'Flask', 'FastAPI', 'Spring', 'Spring Boot',
-        'ASP.NET', '.NET', 'Rails', 'Laravel', 'Symfony',
-        
-        # Databases
-        'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Elasticsearch',
-        'Cassandra', 'DynamoDB', 'Oracle', 'SQLite', 'MariaDB',
-        
-        # Cloud & DevOps
-        'AWS', 'Azure', 'GCP', 'Google Cloud', 'Docker', 'Kubernetes', 'K8s',
-        'Jenkins', 'GitLab', 'CircleCI', 'Travis CI', 'Terraform', 'Ansible',
-        
-        # Data & AI
-        'Machine Learning', 'ML', 'Deep Learning', 'AI', 'TensorFlow', 'PyTorch',
-        'Keras', 'Scikit-learn', 'Pandas', 'NumPy', 'Data Science', 'Big Data',
-        'Spark', 'Hadoop', 'Airflow',
-        
-        # Mobile
-        'React Native', 'Flutter', 'iOS', 'Android', 'Swift', 'Kotlin',
-        
-        # Other
-        'Git', 'GitHub', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum',
-        'DevOps', 'CI/CD', 'Linux', 'Unix', 'Bash', 'PowerShell',
-        'Jira', 'Confluence', 'Figma', 'Adobe XD'
-    ]
-    
     text_lower = text.lower()
     found_skills = []
     
-    for skill in skill_keywords:
+    for skill in SKILL_KEYWORDS:
         # Use word boundaries to avoid partial matches
         pattern = r'\b' + re.escape(skill.lower()) + r'\b'
         if re.search(pattern, text_lower):
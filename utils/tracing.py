@@ -0,0 +1,131 @@
+"""
+Request Tracing
+Lightweight timing spans collected per request, to show where a slow
+recommendation spent its time (scraping, cleaning, validation, matching, DB).
+"""
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+logger = logging.getLogger('jobflow.timing')
+
+_current_trace: ContextVar[Optional['Trace']] = ContextVar('jobflow_trace', default=None)
+
+
+class Trace:
+    """Span durations collected during one request, summed per span name"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.total = None
+        self.spans = {}  # span name -> [seconds, calls], in first-seen order
+
+    def add(self, name: str, seconds: float):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def finish(self):
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+        return self
+
+    def durations_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, (seconds, _) in self.spans.items()}
+
+    def as_dict(self) -> Dict:
+        return {
+            'trace': self.name,
+            'total_ms': round((self.total or 0.0) * 1000, 3),
+            'spans': {
+                name: {'ms': round(seconds * 1000, 3), 'calls': calls}
+                for name, (seconds, calls) in self.spans.items()
+            },
+        }
+
+    def server_timing(self) -> str:
+        """Value for a Server-Timing response header."""
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, (seconds, _) in self.spans.items()]
+        if self.total is not None:
+            entries.append(f"total;dur={self.total * 1000:.1f}")
+        return ', '.join(entries)
+
+
+class span:
+    """
+    Time a block into the current request's trace.
+
+    Does nothing (beyond one context lookup) when no trace is active, so
+    library code can be instrumented unconditionally.
+
+    Usage:
+        with span('scrape'):
+            jobs = scrape_jobs(query)
+    """
+
+    __slots__ = ('name', 'trace', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace = None
+
+    def __enter__(self):
+        self.trace = _current_trace.get()
+        if self.trace is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.trace is not None:
+            self.trace.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def traced(name: str):
+    """Decorator that times every call of a function as a span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                trace.add(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def start_trace(name: str) -> Trace:
+    """Begin collecting spans for the current request."""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def finish_trace() -> Optional[Trace]:
+    """Stop collecting and return the finished trace, if one was active."""
+    trace = _current_trace.get()
+    _current_trace.set(None)
+    return trace.finish() if trace is not None else None
+
+
+def log_trace(trace: Trace, **fields):
+    """Write a trace as one structured log record (spans and totals as fields)."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    record = trace.as_dict()
+    record.update(fields)
+    logger.info(f"{trace.name} took {record['total_ms']:.1f} ms", extra=record)
@@ -2,9 +2,22 @@
 Job Data Validator
 Validates scraped job data to prevent hallucinations and ensure data quality.
 """
+import logging
 import re
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
+from utils.metrics import VALIDATOR_JOBS, VALIDATOR_REJECTIONS
+
+logger = logging.getLogger('jobflow.validator')
+
+def record_validation_metrics(issues: List[str]):
+    """Count a validation outcome and each rejection reason in the shared metrics"""
+    if not issues:
+        VALIDATOR_JOBS.inc(result='valid')
+        return
+    VALIDATOR_JOBS.inc(result='invalid')
+    for issue in issues:
+        VALIDATOR_REJECTIONS.inc(reason=issue)
 
 class JobValidator:
     """Validates job data for accuracy and completeness"""
@@ -48,6 +61,7 @@ class JobValidator:
                 issues.append(f"Missing required field: {field}")
         
         if issues:
+            self._record_metrics(issues)
             return False, issues
         
         # Validate title
@@ -87,9 +101,13 @@ class JobValidator:
             self.validation_stats['valid'] += 1
         else:
             self.validation_stats['invalid'] += 1
+        self._record_metrics(issues)
         
         return is_valid, issues
     
+    def _record_metrics(self, issues: List[str]):
+        record_validation_metrics(issues)
+    
     def _validate_url(self, url: str) -> tuple[bool, Optional[str]]:
         """Validate job URL"""
         if not url or url == '#':
@@ -126,7 +144,7 @@ class JobValidator:
             if is_valid:
                 valid_jobs.append(job)
             else:
-                print(f"⚠ Rejected job: {job.get('title', 'Unknown')} - {', '.join(issues[:2])}")
+                logger.debug(f"⚠ Rejected job: {job.get('title', 'Unknown')} - {', '.join(issues[:2])}")
         
         return valid_jobs
     